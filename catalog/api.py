@@ -0,0 +1,127 @@
+# catalog/api.py
+"""
+Read-only JSON product feed for the mobile app and feed jobs.
+
+GET /shop/api/products/ takes the same q / cat / sort / direction (and
+facet) filters as the HTML list and streams newline-delimited JSON, one
+product per line. Rows come from .values() projections read through a
+server-side cursor in chunks, so memory stays flat from 10 rows to the
+whole catalog.
+
+    ?fields=sku,name,price   project a subset of FEED_FIELDS
+    ?limit=100               stop after N rows
+
+GET /shop/api/suggest/?q=<prefix> returns search-as-you-type suggestions
+from the in-process prefix index (catalog/suggest.py).
+
+GET /shop/api/result-cache/ (staff) reports this process's search result
+cache counters (catalog/results.py).
+"""
+from __future__ import annotations
+
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from .listing import listing_ordering, listing_params, listing_queryset
+from .registry import registry
+from .results import result_cache
+from .suggest import DEFAULT_LIMIT, MAX_LIMIT, suggestions
+
+CHUNK_SIZE = 500
+
+# public name -> model column (brand/category names come from the registry)
+FEED_FIELDS = {
+    "id": "id",
+    "sku": "sku",
+    "name": "name",
+    "slug": "slug",
+    "price": "price",
+    "stock": "stock",
+    "brand": "brand_id",
+    "category": "category_id",
+    "updated_at": "updated_at",
+}
+DEFAULT_FIELDS = ["id", "sku", "name", "slug", "price", "stock", "brand", "category"]
+
+
+def _requested_fields(raw: str | None) -> list[str] | None:
+    if not raw:
+        return DEFAULT_FIELDS
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    if not fields or any(f not in FEED_FIELDS for f in fields):
+        return None
+    return list(dict.fromkeys(fields))
+
+
+def _rows(qs, fields: list[str]):
+    columns = list(dict.fromkeys(FEED_FIELDS[f] for f in fields))
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for row in qs.values(*columns).iterator(chunk_size=CHUNK_SIZE):
+        out = {}
+        for f in fields:
+            value = row[FEED_FIELDS[f]]
+            if f == "brand":
+                value = registry.brand_name(value)
+            elif f == "category":
+                value = registry.category_name(value)
+            out[f] = value
+        yield encoder.encode(out) + "\n"
+
+
+@require_GET
+def product_feed(request):
+    fields = _requested_fields(request.GET.get("fields"))
+    if fields is None:
+        return JsonResponse(
+            {"error": "Unknown field.", "allowed": sorted(FEED_FIELDS)}, status=400
+        )
+
+    try:
+        limit = int(request.GET["limit"]) if request.GET.get("limit") else None
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer."}, status=400)
+
+    params = listing_params(request.GET)
+    qs = listing_queryset(params).order_by(*listing_ordering(params))
+    if limit is not None:
+        qs = qs[: max(0, limit)]
+
+    response = StreamingHttpResponse(_rows(qs, fields), content_type="application/x-ndjson")
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@require_GET
+def product_suggest(request):
+    q = (request.GET.get("q") or "").strip()
+    try:
+        limit = int(request.GET.get("limit") or DEFAULT_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer."}, status=400)
+    limit = min(max(1, limit), MAX_LIMIT)
+
+    list_url = reverse("catalog:product_list")
+    results = []
+    for s in suggestions.lookup(q, limit):
+        if s["type"] == "brand":
+            url = f"{list_url}?brand={s['slug']}"
+        else:
+            url = reverse("catalog:product_detail", args=[s["slug"]])
+        results.append({**s, "url": url})
+
+    response = JsonResponse({"q": q, "results": results})
+    patch_cache_control(response, public=True, max_age=60)
+    return response
+
+
+@require_GET
+def result_cache_stats(request):
+    if not (request.user.is_authenticated and request.user.is_staff):
+        raise PermissionDenied("Staff only.")
+    response = JsonResponse(result_cache.stats())
+    response["Cache-Control"] = "no-store"
+    return response
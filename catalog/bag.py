@@ -0,0 +1,121 @@
+# catalog/bag.py
+"""
+The shopping bag for one request.
+
+``get_bag(request)`` returns one lazily evaluated Bag per request over the
+cart store (catalog/carts.py), shared by the ``bag_summary`` context
+processor, ``bag_detail`` and orders' ``checkout_create``: the product rows
+are fetched at most once, and only by code that actually needs them.
+
+The header's item count and total are also kept in the session, stamped
+with the shared catalog version (catalog/cache.py) and a digest of the
+cart. Ordinary pages read the stamped summary and never touch the product
+table; any cart change or catalog write makes the stamp mismatch and the
+summary is recomputed and written to the session once. Nothing else
+writes it, so a stable cart on a stable catalog never re-saves the session.
+Signed-cookie carts have no session to write to, so their summary goes to
+the cache under the stamp itself (identical carts share one entry).
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+from .cache import catalog_version, params_digest
+from .carts import get_cart
+from .models import Product
+from .rows import as_rows
+
+SUMMARY_SESSION_KEY = "bag_summary"
+SUMMARY_CACHE_TIMEOUT = 60 * 60
+ZERO = Decimal("0.00")
+
+
+def get_bag(request) -> "Bag":
+    bag = getattr(request, "_bag", None)
+    if bag is None:
+        bag = request._bag = Bag(request)
+    return bag
+
+
+class Bag:
+    def __init__(self, request):
+        self.session = request.session
+        self.store = get_cart(request)
+
+    @property
+    def cart(self) -> dict:
+        return self.store.items()
+
+    def lines(self) -> list[dict]:
+        """[{"sku", "qty"}, ...] for every line with a positive integer quantity."""
+        out = []
+        for sku, qty in self.cart.items():
+            try:
+                n = int(qty)
+            except (TypeError, ValueError):
+                n = 0
+            if n > 0:
+                out.append({"sku": sku, "qty": n})
+        return out
+
+    # ---------- full contents (bag page, checkout) ----------
+    @cached_property
+    def rows(self) -> list[dict]:
+        """One dict per line whose product exists: product, sku, qty, unit, line."""
+        cart = self.cart
+        if not cart:
+            return []
+        products = {p.sku: p for p in as_rows(Product.objects.filter(sku__in=list(cart)))}
+        rows = []
+        for sku, qty in cart.items():
+            p = products.get(sku)
+            if not p:
+                continue
+            unit = Decimal(p.price)
+            q = int(qty)
+            rows.append({"product": p, "sku": sku, "qty": q, "unit": unit, "line": unit * q})
+        return rows
+
+    @property
+    def subtotal(self) -> Decimal:
+        return sum((r["line"] for r in self.rows), ZERO).quantize(Decimal("0.01"))
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.rows
+
+    # ---------- header summary (every page) ----------
+    @cached_property
+    def summary(self) -> dict:
+        """{"count": int, "total": Decimal}, from the session when the stamp still matches."""
+        cart = self.cart
+        if not cart:
+            return {"count": 0, "total": ZERO}
+
+        stamp = f"{catalog_version()}:{params_digest(cart)}"
+        if self.store.session_backed:
+            stored = self.session.get(SUMMARY_SESSION_KEY)
+        else:
+            stored = cache.get(f"catalog:bag:{stamp}")
+        if stored and stored.get("stamp") == stamp:
+            return {"count": stored["count"], "total": Decimal(stored["total"])}
+
+        count = sum(r["qty"] for r in self.rows)
+        total = self.subtotal
+        stored = {"stamp": stamp, "count": count, "total": str(total)}
+        if self.store.session_backed:
+            self.session[SUMMARY_SESSION_KEY] = stored
+        else:
+            cache.set(f"catalog:bag:{stamp}", stored, SUMMARY_CACHE_TIMEOUT)
+        return {"count": count, "total": total}
+
+    @property
+    def count(self) -> int:
+        return self.summary["count"]
+
+    @property
+    def total(self) -> Decimal:
+        return self.summary["total"]
@@ -0,0 +1,49 @@
+# catalog/cache.py
+"""
+Shared cache helpers for the catalog.
+
+Derived data (listing counts, search result pages, bag summaries, page
+ETags) is keyed by a catalog version stamp that catalog/signals.py bumps
+whenever a Product, Category or Brand row changes, so stale entries are
+simply never read again and expire on their own. The stamp lives in the
+default cache, which production should share between worker processes
+(REDIS_URL) for a bump in one worker to reach the others. With a
+process-local cache invalidation is per-process: other workers keep
+serving their entries until those time out (system check catalog.W001).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = "catalog:version"
+
+
+def _seed() -> int:
+    # A lost key (eviction, cache restart) must not bring back a version
+    # that entries were already cached under: start from the clock.
+    return time.time_ns() // 1000
+
+
+def catalog_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _seed(), None)
+        version = cache.get(VERSION_KEY) or _seed()
+    return version
+
+
+def bump_catalog_version() -> None:
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, _seed(), None)
+
+
+def params_digest(params: dict) -> str:
+    """Stable short digest of a normalized params dict, for cache keys."""
+    raw = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
@@ -0,0 +1,51 @@
+# catalog/cards.py
+"""
+Rendered product-card fragments for the listing grid.
+
+Each card's HTML is cached under the product's id and updated_at plus the
+two things it shows from elsewhere: the brand name (from the registry) and
+the image manifest version. Saving a product invalidates only that
+product's card; renaming a brand only its products' cards; rebuilding the
+image derivatives every card. A page fetches all of its cards with one
+get_many and renders only the misses.
+"""
+from __future__ import annotations
+
+import hashlib
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .images import manifest_version
+from .registry import registry
+
+CARD_TEMPLATE = "catalog/includes/product_card.html"
+CARD_TIMEOUT = 60 * 60 * 6
+
+
+def card_key(product, images: str) -> str:
+    updated = product.updated_at.timestamp() if product.updated_at else 0
+    brand = registry.brand_name(product.brand_id)
+    digest = hashlib.sha1(f"{updated:.6f}|{brand}|{images}".encode()).hexdigest()[:16]
+    return f"catalog:card:{product.pk}:{digest}"
+
+
+def render_cards(products) -> list[str]:
+    """HTML for each product's card, in order, rendering only cache misses."""
+    products = list(products)
+    images = manifest_version()
+    keys = [card_key(p, images) for p in products]
+    cached = cache.get_many(keys)
+
+    cards, misses = [], {}
+    for key, p in zip(keys, products):
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string(CARD_TEMPLATE, {"p": p})
+            misses[key] = str(html)
+        cards.append(mark_safe(html))
+
+    if misses:
+        cache.set_many(misses, CARD_TIMEOUT)
+    return cards
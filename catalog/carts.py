@@ -0,0 +1,499 @@
+# catalog/carts.py
+"""
+Cart storage backends.
+
+Every bag read and write goes through ``get_cart(request)``, which returns
+the store selected by settings.CART_STORE:
+
+    "session"  the cart dict in request.session["cart"] (default)
+    "db"       one CartLine row per line, changed with per-line upserts
+    "cache"    one cache counter per line, changed with atomic incr
+
+The "db" and "cache" stores never rewrite the whole cart: adding an item
+is a single atomic statement, so two tabs adding at the same time both
+count. They find the cart through a random id kept in the session, which
+survives login (Django keeps session data when it cycles the key).
+
+With settings.CART_ANONYMOUS_COOKIE on, anonymous visitors instead keep
+their cart in a signed cookie (SignedCookieCartStore), so browsing and
+adding to the bag never write a session row. The cookie cart moves into
+the server-side store at login, at checkout, or when it outgrows
+CART_COOKIE_MAX_BYTES; CartCookieMiddleware (catalog/middleware.py) writes
+the cookie.
+
+CartLine rows outlive the session that points at them;
+``python manage.py purge_cart_lines`` (after ``clearsessions``) deletes
+the lines of carts no live session refers to.
+"""
+from __future__ import annotations
+
+import uuid
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from importlib import import_module
+from urllib.parse import quote, unquote
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import CartLine
+
+CART_ID_SESSION_KEY = "cart_id"
+# Set once an anonymous cookie cart has moved server-side (e.g. at checkout).
+SERVER_CART_SESSION_KEY = "cart_server"
+COOKIE_SALT = "catalog.carts.cookie"
+COOKIE_VERSION = "v1"
+
+
+def get_cart(request) -> "CartStore":
+    cart = getattr(request, "_cart_store", None)
+    if cart is None:
+        if _uses_cookie(request):
+            cart = SignedCookieCartStore(request)
+        else:
+            cart = STORES[settings.CART_STORE](request)
+        request._cart_store = cart
+    return cart
+
+
+def _uses_cookie(request) -> bool:
+    if not settings.CART_ANONYMOUS_COOKIE:
+        return False
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return False
+    return not request.session.get(SERVER_CART_SESSION_KEY)
+
+
+def migrate_cookie_cart(request) -> bool:
+    """
+    Move an anonymous cookie cart into the server-side store (adding to any
+    lines already there) and have the middleware delete the cookie.
+    """
+    items = decode_cookie_cart(request.COOKIES.get(settings.CART_COOKIE_NAME))
+    request._cart_store = None
+    if items is None:
+        return False
+    request._delete_cart_cookie = True
+    if not items:
+        return False
+    if not request.user.is_authenticated:
+        request.session[SERVER_CART_SESSION_KEY] = True
+    server = STORES[settings.CART_STORE](request)
+    current = server.items()
+    server.set_many({sku: current.get(sku, 0) + qty for sku, qty in items.items()})
+    return True
+
+
+def _positive(qty) -> int:
+    try:
+        return max(0, int(qty))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CartStore(ABC):
+    """{sku: qty} for one visitor. Subclasses implement the storage."""
+
+    # Bag keeps its header summary in the session only for stores that
+    # already live there (see catalog/bag.py); the others use the cache, so
+    # a page view never rewrites the session.
+    session_backed = False
+
+    def __init__(self, request):
+        self.request = request
+        self.session = request.session
+        self._items = None
+
+    def items(self) -> dict[str, int]:
+        """The cart contents; read from storage once per request."""
+        if self._items is None:
+            self._items = self._load()
+        return dict(self._items)
+
+    @abstractmethod
+    def _load(self) -> dict[str, int]:
+        """Read the cart from storage."""
+
+    @abstractmethod
+    def add(self, sku: str, qty: int = 1) -> int:
+        """Increase a line by ``qty``; returns the new quantity."""
+
+    @abstractmethod
+    def set(self, sku: str, qty: int) -> None:
+        """Set a line's quantity; ``qty <= 0`` removes it."""
+
+    @abstractmethod
+    def remove(self, sku: str) -> bool:
+        """Drop a line; False if it was not in the cart."""
+
+    @abstractmethod
+    def set_many(self, quantities: dict[str, int]) -> None:
+        """``set`` for several lines in one write."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Empty the cart."""
+
+    def _cart_id(self, create: bool) -> str | None:
+        cart_id = self.session.get(CART_ID_SESSION_KEY)
+        if cart_id is None and create:
+            cart_id = self.session[CART_ID_SESSION_KEY] = uuid.uuid4().hex
+        return cart_id
+
+
+class SessionCartStore(CartStore):
+    session_backed = True
+
+    def _load(self):
+        return {sku: _positive(qty) for sku, qty in (self.session.get("cart") or {}).items()}
+
+    def _cart(self) -> dict:
+        self._items = None
+        self.session.modified = True
+        return self.session.setdefault("cart", {})
+
+    def add(self, sku, qty=1):
+        cart = self._cart()
+        cart[sku] = _positive(cart.get(sku, 0)) + qty
+        return cart[sku]
+
+    def set(self, sku, qty):
+        if qty <= 0:
+            self.remove(sku)
+        else:
+            self._cart()[sku] = qty
+
+    def remove(self, sku):
+        return self._cart().pop(sku, None) is not None
+
+    def set_many(self, quantities):
+        cart = self._cart()
+        for sku, qty in quantities.items():
+            if qty <= 0:
+                cart.pop(sku, None)
+            else:
+                cart[sku] = qty
+
+    def clear(self):
+        self._items = None
+        self.session["cart"] = {}
+
+
+class DatabaseCartStore(CartStore):
+    UPSERT_SQL = """
+        INSERT INTO cart_line (cart_key, sku, qty, updated_at)
+        VALUES {values}
+        ON CONFLICT (cart_key, sku) DO UPDATE
+            SET qty = {qty}, updated_at = EXCLUDED.updated_at
+        RETURNING qty;
+    """
+
+    def _load(self):
+        cart_id = self._cart_id(create=False)
+        if cart_id is None:
+            return {}
+        rows = CartLine.objects.filter(cart_key=cart_id).order_by("id").values_list("sku", "qty")
+        return dict(rows)
+
+    def _upsert(self, sku, qty, qty_sql) -> int:
+        self._items = None
+        with connection.cursor() as cur:
+            cur.execute(
+                self.UPSERT_SQL.format(values="(%s, %s, %s, %s)", qty=qty_sql),
+                [self._cart_id(create=True), sku, qty, timezone.now()],
+            )
+            return cur.fetchone()[0]
+
+    def add(self, sku, qty=1):
+        return self._upsert(sku, qty, "cart_line.qty + EXCLUDED.qty")
+
+    def set(self, sku, qty):
+        if qty <= 0:
+            self.remove(sku)
+        else:
+            self._upsert(sku, qty, "EXCLUDED.qty")
+
+    def remove(self, sku):
+        cart_id = self._cart_id(create=False)
+        if cart_id is None:
+            return False
+        self._items = None
+        deleted, _ = CartLine.objects.filter(cart_key=cart_id, sku=sku).delete()
+        return bool(deleted)
+
+    def set_many(self, quantities):
+        self._items = None
+        cart_id = self._cart_id(create=True)
+        upserts = [(sku, qty) for sku, qty in quantities.items() if qty > 0]
+        removals = [sku for sku, qty in quantities.items() if qty <= 0]
+        now = timezone.now()
+        with transaction.atomic():
+            if upserts:
+                with connection.cursor() as cur:
+                    cur.execute(
+                        self.UPSERT_SQL.format(
+                            values=", ".join(["(%s, %s, %s, %s)"] * len(upserts)), qty="EXCLUDED.qty"
+                        ),
+                        [v for sku, qty in upserts for v in (cart_id, sku, qty, now)],
+                    )
+            if removals:
+                CartLine.objects.filter(cart_key=cart_id, sku__in=removals).delete()
+
+    def clear(self):
+        cart_id = self._cart_id(create=False)
+        self._items = None
+        if cart_id is not None:
+            CartLine.objects.filter(cart_key=cart_id).delete()
+
+
+class CacheCartStore(CartStore):
+    """
+    Keys per cart: ``n`` (slot counter), ``slot:<i>`` (sku added i-th),
+    ``slot_of:<sku>`` (its slot number) and ``qty:<sku>`` (counter). A line
+    is "in the cart" while its qty key exists; ``cache.add`` on that key
+    decides atomically who (re)opens the line. A SKU keeps its slot when it
+    is removed and added back, so a cart holds at most one slot per SKU it
+    has ever contained; ``clear`` drops them all.
+    """
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.cache = caches[settings.CART_CACHE_ALIAS]
+        self.timeout = settings.SESSION_COOKIE_AGE
+
+    def _key(self, cart_id, suffix) -> str:
+        return f"cart:{cart_id}:{suffix}"
+
+    def _load(self):
+        cart_id = self._cart_id(create=False)
+        if cart_id is None:
+            return {}
+        n = self.cache.get(self._key(cart_id, "n")) or 0
+        slot_keys = [self._key(cart_id, f"slot:{i}") for i in range(1, n + 1)]
+        slots = self.cache.get_many(slot_keys)
+        skus = list(dict.fromkeys(slots[k] for k in slot_keys if k in slots))
+        qtys = self.cache.get_many([self._key(cart_id, f"qty:{sku}") for sku in skus])
+        out = {}
+        for sku in skus:
+            qty = qtys.get(self._key(cart_id, f"qty:{sku}"))
+            if qty:
+                out[sku] = qty
+        return out
+
+    def _ensure_line(self, cart_id, sku):
+        self._items = None
+        if not self.cache.add(self._key(cart_id, f"qty:{sku}"), 0, self.timeout):
+            return
+        slot_of_key = self._key(cart_id, f"slot_of:{sku}")
+        slot = self.cache.get(slot_of_key)
+        if slot is not None and self.cache.get(self._key(cart_id, f"slot:{slot}")) == sku:
+            return  # back in the cart: reuse its slot
+        n_key = self._key(cart_id, "n")
+        self.cache.add(n_key, 0, self.timeout)
+        slot = self.cache.incr(n_key)
+        self.cache.set_many(
+            {self._key(cart_id, f"slot:{slot}"): sku, slot_of_key: slot}, self.timeout
+        )
+
+    def add(self, sku, qty=1):
+        cart_id = self._cart_id(create=True)
+        self._ensure_line(cart_id, sku)
+        try:
+            return self.cache.incr(self._key(cart_id, f"qty:{sku}"), qty)
+        except ValueError:  # evicted between add and incr
+            self.cache.set(self._key(cart_id, f"qty:{sku}"), qty, self.timeout)
+            return qty
+
+    def set(self, sku, qty):
+        if qty <= 0:
+            self.remove(sku)
+            return
+        cart_id = self._cart_id(create=True)
+        self._ensure_line(cart_id, sku)
+        self.cache.set(self._key(cart_id, f"qty:{sku}"), qty, self.timeout)
+
+    def remove(self, sku):
+        cart_id = self._cart_id(create=False)
+        if cart_id is None:
+            return False
+        self._items = None
+        return self.cache.delete(self._key(cart_id, f"qty:{sku}"))
+
+    def set_many(self, quantities):
+        cart_id = self._cart_id(create=True)
+        upserts = {sku: qty for sku, qty in quantities.items() if qty > 0}
+        for sku in upserts:
+            self._ensure_line(cart_id, sku)
+        self.cache.set_many(
+            {self._key(cart_id, f"qty:{sku}"): qty for sku, qty in upserts.items()}, self.timeout
+        )
+        self.cache.delete_many(
+            [self._key(cart_id, f"qty:{sku}") for sku, qty in quantities.items() if qty <= 0]
+        )
+        self._items = None
+
+    def clear(self):
+        cart_id = self._cart_id(create=False)
+        if cart_id is None:
+            return
+        n = self.cache.get(self._key(cart_id, "n")) or 0
+        slot_keys = [self._key(cart_id, f"slot:{i}") for i in range(1, n + 1)]
+        skus = set(self.cache.get_many(slot_keys).values())
+        self.cache.delete_many(
+            [self._key(cart_id, "n"), *slot_keys]
+            + [self._key(cart_id, f"{kind}:{sku}") for sku in skus for kind in ("qty", "slot_of")]
+        )
+        self._items = None
+
+
+# ---------- signed cookie (anonymous visitors) ----------
+
+def encode_cookie_cart(items: dict[str, int]) -> str:
+    """"v1!<sku>*<qty>!..." with SKUs percent-encoded, signed and timestamped."""
+    lines = "!".join(f"{quote(sku, safe='')}*{qty}" for sku, qty in items.items())
+    return signing.TimestampSigner(salt=COOKIE_SALT).sign(f"{COOKIE_VERSION}!{lines}")
+
+
+def decode_cookie_cart(value: str | None) -> dict[str, int] | None:
+    """The cart in a cookie value; None if absent, tampered with, expired or unknown."""
+    if not value:
+        return None
+    try:
+        raw = signing.TimestampSigner(salt=COOKIE_SALT).unsign(
+            value, max_age=settings.CART_COOKIE_AGE
+        )
+    except signing.BadSignature:
+        return None
+    version, _, lines = raw.partition("!")
+    if version != COOKIE_VERSION:
+        return None
+    items = {}
+    for line in filter(None, lines.split("!")):
+        sku, _, qty = line.partition("*")
+        qty = _positive(qty)
+        if sku and qty:
+            items[unquote(sku)] = qty
+    return items
+
+
+class SignedCookieCartStore(CartStore):
+    """
+    The cart in a signed cookie. Mutations only mark the store dirty;
+    CartCookieMiddleware writes the cookie on the way out. A cart that
+    would not fit in CART_COOKIE_MAX_BYTES moves to the server-side store.
+    """
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.dirty = False
+
+    def _load(self):
+        return decode_cookie_cart(self.request.COOKIES.get(settings.CART_COOKIE_NAME)) or {}
+
+    def _write(self, items: dict[str, int]):
+        if len(encode_cookie_cart(items)) > settings.CART_COOKIE_MAX_BYTES:
+            self._overflow(items)
+            return
+        self._items = items
+        self.dirty = True
+
+    def _overflow(self, items):
+        self.request.session[SERVER_CART_SESSION_KEY] = True
+        self.request._delete_cart_cookie = True
+        self.dirty = False
+        server = self.request._cart_store = STORES[settings.CART_STORE](self.request)
+        server.set_many(items)
+
+    def add(self, sku, qty=1):
+        items = self.items()
+        items[sku] = items.get(sku, 0) + qty
+        self._write(items)
+        return items[sku]
+
+    def set(self, sku, qty):
+        self.set_many({sku: qty})
+
+    def set_many(self, quantities):
+        items = self.items()
+        for sku, qty in quantities.items():
+            if qty <= 0:
+                items.pop(sku, None)
+            else:
+                items[sku] = qty
+        self._write(items)
+
+    def remove(self, sku):
+        items = self.items()
+        if items.pop(sku, None) is None:
+            return False
+        self._write(items)
+        return True
+
+    def clear(self):
+        self._write({})
+
+    def apply(self, response):
+        """Write (or drop) the cookie if this request changed the cart."""
+        if not self.dirty:
+            return
+        if self._items:
+            response.set_cookie(
+                settings.CART_COOKIE_NAME,
+                encode_cookie_cart(self._items),
+                max_age=settings.CART_COOKIE_AGE,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        else:
+            response.delete_cookie(settings.CART_COOKIE_NAME, samesite="Lax")
+
+
+# ---------- housekeeping ----------
+
+def purge_abandoned_cart_lines(grace: timedelta = timedelta(days=1)) -> int:
+    """
+    Delete the CartLine rows of carts that no unexpired session points at
+    and that have not changed for ``grace`` (a brand-new cart's session may
+    not be saved yet). With a non-database session engine the sessions
+    cannot be listed, so carts idle for SESSION_COOKIE_AGE go instead.
+    Returns the number of rows deleted.
+    """
+    now = timezone.now()
+    if settings.SESSION_ENGINE == "django.contrib.sessions.backends.db":
+        from django.contrib.sessions.models import Session
+
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        live = set()
+        for data in Session.objects.filter(expire_date__gt=now).values_list("session_data", flat=True).iterator():
+            cart_id = store.decode(data).get(CART_ID_SESSION_KEY)
+            if cart_id:
+                live.add(cart_id)
+        cutoff = now - grace
+    else:
+        live = set()
+        cutoff = now - timedelta(seconds=settings.SESSION_COOKIE_AGE)
+
+    idle = (
+        CartLine.objects.values("cart_key")
+        .annotate(last=Max("updated_at"))
+        .filter(last__lt=cutoff)
+        .values_list("cart_key", flat=True)
+    )
+    abandoned = [key for key in idle if key not in live]
+    deleted = 0
+    for i in range(0, len(abandoned), 500):
+        deleted += CartLine.objects.filter(cart_key__in=abandoned[i:i + 500]).delete()[0]
+    return deleted
+
+
+STORES = {
+    "session": SessionCartStore,
+    "db": DatabaseCartStore,
+    "cache": CacheCartStore,
+}
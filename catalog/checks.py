@@ -0,0 +1,31 @@
+# catalog/checks.py
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The catalog version should be seen by every worker. With a per-process
+    cache each worker invalidates only its own copies, so warn (the site
+    still works, other workers just serve stale data until their keys expire).
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is local to each process.",
+            hint=(
+                "Set REDIS_URL. The catalog version (catalog/cache.py) lives in the default "
+                "cache; a per-process cache leaves other workers serving stale counts, "
+                "search results and bag summaries until they expire."
+            ),
+            id="catalog.W001",
+        )
+    ]
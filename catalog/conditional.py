@@ -0,0 +1,83 @@
+# catalog/conditional.py
+"""
+Conditional GET (ETag / Last-Modified) for catalog pages.
+
+The HTML also carries per-visitor bits (bag count, login/staff links, CSRF
+token, flash messages). Those are folded into the ETag only as an HMAC
+digest, and Last-Modified is only sent when the page has no per-visitor
+state at all, so a 304 can never replay another visitor's (or a stale)
+bag. Only pages whose whole content has one ``updated_at`` (product
+detail) send Last-Modified; listings rely on the ETag. Responses are ``Cache-Control: private, no-cache`` whenever they
+depend on the visitor.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import salted_hmac
+from django.utils.http import http_date
+
+from .cache import catalog_version
+from .carts import get_cart
+
+SALT = "catalog.conditional"
+
+
+def _visitor_state(request) -> str:
+    """Stable description of everything per-visitor on the page ('' for none)."""
+    user = getattr(request, "user", None)
+    cart = get_cart(request).items()
+    parts = []
+    if user is not None and user.is_authenticated:
+        parts.append(f"u{user.pk}:{int(user.is_staff)}")
+    if cart:
+        parts.append("b" + ",".join(f"{k}={v}" for k, v in sorted(cart.items())))
+    if parts:
+        parts.append("c" + request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""))
+    return "|".join(parts)
+
+
+def _has_pending_messages(request) -> bool:
+    storage = getattr(request, "_messages", None)
+    # len() does not mark messages as read (iteration does).
+    return bool(storage is not None and len(storage))
+
+
+def page_validators(request, *parts, updated_at=None):
+    """
+    Build (etag, last_modified) for a catalog page from the content ``parts``
+    (ids, timestamps, ...). Returns (None, None) when the page must not be
+    revalidated, e.g. a flash message is waiting to be shown.
+    """
+    if request.method not in ("GET", "HEAD") or _has_pending_messages(request):
+        return None, None
+
+    visitor = _visitor_state(request)
+    content = "|".join(str(p) for p in (catalog_version(), *parts))
+    digest = salted_hmac(SALT, f"{content}#{visitor}").hexdigest()[:32]
+    etag = f'W/"{digest}"'
+
+    last_modified = None
+    if updated_at is not None and not visitor:
+        last_modified = int(updated_at.timestamp())
+    return etag, last_modified
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response if the client's validators still match, else None."""
+    if etag is None:
+        return None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(request, response, etag, last_modified):
+    if etag is None:
+        return response
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    if _visitor_state(request):
+        patch_cache_control(response, no_cache=True, private=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
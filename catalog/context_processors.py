@@ -1,23 +1,16 @@
-from decimal import Decimal
-from catalog.models import Product
+from catalog.bag import get_bag
+from catalog.registry import registry
 
 def bag_summary(request):
-    cart = request.session.get("cart", {})
-    if not cart:
-        return {"bag_items_count": 0, "grand_total": Decimal("0.00")}
-
-    products = {p.sku: p for p in Product.objects.filter(sku__in=cart.keys())}
-    items = 0
-    total = Decimal("0.00")
-    for sku, qty in cart.items():
-        p = products.get(sku)
-        if not p:
-            continue
-        q = int(qty)
-        items += q
-        total += Decimal(p.price) * q
-
+    """Header bag count/total; served from the session-stamped summary (catalog/bag.py)."""
+    bag = get_bag(request)
     return {
-        "bag_items_count": items,
-        "grand_total": total.quantize(Decimal("0.01")),
+        "bag": bag,
+        "bag_items_count": bag.count,
+        "grand_total": bag.total,
     }
+
+
+def catalog_nav(request):
+    """Categories for the main nav, from the in-process registry (no query)."""
+    return {"nav_categories": registry.categories()}
@@ -0,0 +1,56 @@
+# catalog/counts.py
+"""
+Result counts for catalog listings without a COUNT(*) on the hot path.
+
+Counts are cached per (catalog version, normalized filters). On PostgreSQL,
+unfiltered and category-only listings use the planner's row estimate for
+the listing query itself (so inactive products are estimated out, unlike
+pg_class.reltuples) once it is above CATALOG_COUNT_ESTIMATE_THRESHOLD.
+"""
+from __future__ import annotations
+
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .cache import catalog_version, params_digest
+
+COUNT_TIMEOUT = 60 * 10
+
+
+def listing_count(qs, params: dict) -> tuple[int, bool]:
+    """Return (count, is_estimate) for a listing queryset built from ``params``."""
+    key = f"catalog:count:{catalog_version()}:{params_digest(params)}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    estimate = _planner_estimate(qs, params)
+    result = (estimate, True) if estimate is not None else (qs.count(), False)
+    cache.set(key, result, COUNT_TIMEOUT)
+    return result
+
+
+def _planner_estimate(qs, params: dict) -> int | None:
+    conn = connections[qs.db]
+    if conn.vendor != "postgresql":
+        return None
+    if any(v for k, v in params.items() if k not in ("cat", "sort", "direction")):
+        return None
+    if qs.query.is_empty():  # unknown category
+        return None
+
+    with conn.cursor() as cur:
+        sql, sql_params = qs.order_by().query.sql_with_params()
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", sql_params)
+        plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    rows = int(plan[0]["Plan"]["Plan Rows"])
+
+    # Small listings get an exact count.
+    if rows < settings.CATALOG_COUNT_ESTIMATE_THRESHOLD:
+        return None
+    return rows
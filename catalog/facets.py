@@ -0,0 +1,177 @@
+# catalog/facets.py
+"""
+Facet navigation for the product list: brand, price band and availability.
+
+Counts of *active* products live in FacetCount, one row per
+(category, facet, value). Product save/delete signals apply +1/-1 deltas,
+so reading facets is a single small query on the summary table.
+``python manage.py rebuild_facets`` recomputes everything from scratch.
+
+Counts are per category and do not narrow as other facets are selected.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import FacetCount, Product
+from .registry import registry
+
+BRAND, PRICE, STOCK = "brand", "price", "stock"
+
+# (key, label, lower bound inclusive, upper bound exclusive)
+PRICE_BANDS = [
+    ("0-25", "Under £25", Decimal("0"), Decimal("25")),
+    ("25-50", "£25 – £50", Decimal("25"), Decimal("50")),
+    ("50-100", "£50 – £100", Decimal("50"), Decimal("100")),
+    ("100-200", "£100 – £200", Decimal("100"), Decimal("200")),
+    ("200+", "£200 and over", Decimal("200"), None),
+]
+PRICE_BAND_KEYS = [b[0] for b in PRICE_BANDS]
+STOCK_LABELS = {"in": "In stock", "out": "Out of stock"}
+
+# Product columns that feed the facets (see facet_values)
+TRACKED_FIELDS = ("category_id", "brand_id", "price", "stock", "is_active")
+
+
+def price_band(price) -> str:
+    price = Decimal(price)
+    for key, _label, low, high in PRICE_BANDS:
+        if price >= low and (high is None or price < high):
+            return key
+    return PRICE_BANDS[0][0]
+
+
+def facet_values(snapshot: dict | None) -> tuple[int | None, list[tuple[str, str]]]:
+    """(category_id, [(facet, value), ...]) a product contributes to; [] if inactive."""
+    if not snapshot or not snapshot.get("is_active"):
+        return None, []
+    return snapshot["category_id"], [
+        (BRAND, str(snapshot["brand_id"])),
+        (PRICE, price_band(snapshot["price"])),
+        (STOCK, "in" if snapshot["stock"] > 0 else "out"),
+    ]
+
+
+def snapshot_of(product) -> dict:
+    return {f: getattr(product, f) for f in TRACKED_FIELDS}
+
+
+def apply_change(before: dict | None, after: dict | None, using: str = "default") -> None:
+    """Move a product's contribution from ``before`` to ``after`` (either may be None)."""
+    old_cat, old_vals = facet_values(before)
+    new_cat, new_vals = facet_values(after)
+    if old_cat == new_cat and old_vals == new_vals:
+        return
+
+    with transaction.atomic(using=using):
+        for facet, value in old_vals:
+            _bump(old_cat, facet, value, -1, using)
+        for facet, value in new_vals:
+            _bump(new_cat, facet, value, 1, using)
+
+
+def _bump(category_id, facet, value, delta, using):
+    rows = FacetCount.objects.using(using).filter(category_id=category_id, facet=facet, value=value)
+    if rows.update(count=F("count") + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic(using=using):
+            FacetCount.objects.using(using).create(
+                category_id=category_id, facet=facet, value=value, count=delta
+            )
+    except IntegrityError:
+        # Lost an insert race: the row exists now.
+        rows.update(count=F("count") + delta)
+
+
+# ---------- Reading ----------
+
+def facet_counts(category_id: int | None = None) -> dict[str, list[dict]]:
+    """
+    Facet options with counts for a category (or the whole catalog),
+    as {"brand": [{"value", "label", "count"}, ...], "price": [...], "stock": [...]}.
+    """
+    qs = FacetCount.objects.filter(count__gt=0)
+    if category_id is not None:
+        qs = qs.filter(category_id=category_id)
+    totals: dict[tuple[str, str], int] = {}
+    for row in qs.values("facet", "value").annotate(n=Sum("count")):
+        totals[(row["facet"], row["value"])] = row["n"]
+
+    brand_opts = []
+    for (f, v), n in totals.items():
+        brand = registry.brand(int(v)) if f == BRAND else None
+        if brand:
+            brand_opts.append({"value": brand["slug"], "label": brand["name"], "count": n})
+    brand_opts.sort(key=lambda o: o["label"].lower())
+
+    return {
+        BRAND: brand_opts,
+        PRICE: [
+            {"value": key, "label": label, "count": totals[(PRICE, key)]}
+            for key, label, _low, _high in PRICE_BANDS
+            if (PRICE, key) in totals
+        ],
+        STOCK: [
+            {"value": key, "label": label, "count": totals[(STOCK, key)]}
+            for key, label in STOCK_LABELS.items()
+            if (STOCK, key) in totals
+        ],
+    }
+
+
+# ---------- Filtering ----------
+
+def apply_facet_filters(qs, params: dict):
+    """Narrow a product queryset by the brand / price / stock params (ANDed across facets)."""
+    if params.get("brand"):
+        qs = qs.filter(brand_id__in=registry.brand_ids(params["brand"]))
+
+    if params.get("price"):
+        bands = Q()
+        for key, _label, low, high in PRICE_BANDS:
+            if key in params["price"]:
+                band = Q(price__gte=low)
+                if high is not None:
+                    band &= Q(price__lt=high)
+                bands |= band
+        qs = qs.filter(bands)
+
+    if params.get("stock") == "in":
+        qs = qs.filter(stock__gt=0)
+    elif params.get("stock") == "out":
+        qs = qs.filter(stock__lte=0)
+
+    return qs
+
+
+# ---------- Rebuild ----------
+
+@transaction.atomic
+def rebuild_facet_counts() -> int:
+    """Recompute every FacetCount row from the product table. Returns rows written."""
+    counts: dict[tuple[int, str, str], int] = {}
+    active = Product.objects.filter(is_active=True)
+
+    for row in active.values("category_id", "brand_id").annotate(n=Count("id")):
+        counts[(row["category_id"], BRAND, str(row["brand_id"]))] = row["n"]
+    for row in active.values("category_id", "price").annotate(n=Count("id")):
+        key = (row["category_id"], PRICE, price_band(row["price"]))
+        counts[key] = counts.get(key, 0) + row["n"]
+    in_stock = Count("id", filter=Q(stock__gt=0))
+    out_stock = Count("id", filter=Q(stock__lte=0))
+    for row in active.values("category_id").annotate(i=in_stock, o=out_stock):
+        if row["i"]:
+            counts[(row["category_id"], STOCK, "in")] = row["i"]
+        if row["o"]:
+            counts[(row["category_id"], STOCK, "out")] = row["o"]
+
+    FacetCount.objects.all().delete()
+    FacetCount.objects.bulk_create(
+        [FacetCount(category_id=c, facet=f, value=v, count=n) for (c, f, v), n in counts.items()],
+        batch_size=1000,
+    )
+    return len(counts)
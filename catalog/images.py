@@ -0,0 +1,111 @@
+# catalog/images.py
+"""
+Resized JPEG/WebP derivatives of product images and their manifest.
+
+``python manage.py build_image_derivatives`` writes
+static/catalog/img/derived/<name>-<width>.{jpg,webp} for each original in
+static/catalog/img/products/ (never upscaling) plus manifest.json:
+
+    {"1163": {"hash": "<sha256>", "width": 60, "height": 80,
+              "jpeg": {"60": "catalog/img/derived/1163-60.jpg"},
+              "webp": {"60": "catalog/img/derived/1163-60.webp"}}}
+
+Templates render images through ``{% product_image %}`` (catalog_tags),
+which emits a <picture> with srcsets from the manifest and falls back to
+the original file when an image has no derivatives yet.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+SOURCE_PREFIX = "catalog/img/products"
+DERIVED_PREFIX = "catalog/img/derived"
+WIDTHS = (160, 320, 640, 1024)
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+
+_manifest_cache: dict = {"mtime": None, "data": {}}
+
+
+def static_root() -> Path:
+    return Path(settings.BASE_DIR) / "static"
+
+
+def manifest_path() -> Path:
+    return static_root() / DERIVED_PREFIX / "manifest.json"
+
+
+def load_manifest() -> dict:
+    """The manifest as a dict ({} if missing); re-read only when the file changes."""
+    path = manifest_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return {}
+    if _manifest_cache["mtime"] != mtime:
+        with open(path, encoding="utf-8") as fh:
+            _manifest_cache["data"] = json.load(fh)
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["data"]
+
+
+def manifest_version() -> str:
+    """Changes whenever manifest.json is rewritten ("0" while there is none)."""
+    try:
+        return str(manifest_path().stat().st_mtime_ns)
+    except OSError:
+        return "0"
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def target_widths(original_width: int) -> list[int]:
+    """Configured widths up to the original's; the original width if it is smaller."""
+    widths = [w for w in WIDTHS if w < original_width]
+    return widths + [original_width] if original_width <= WIDTHS[-1] else widths
+
+
+def build_derivatives(source: str, derived_dir: str) -> dict:
+    """
+    Write every derivative of one original; returns its manifest entry.
+    Runs in worker processes, so it only takes and returns plain data.
+    """
+    from PIL import Image, ImageOps
+
+    name = Path(source).stem.lower()
+    entry = {"hash": file_hash(source), "jpeg": {}, "webp": {}}
+    with Image.open(source) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        entry["width"], entry["height"] = im.size
+        for width in target_widths(im.width):
+            height = max(1, round(im.height * width / im.width))
+            resized = im if width == im.width else im.resize((width, height), Image.LANCZOS)
+            for fmt, ext, opts in (
+                ("jpeg", "jpg", {"quality": JPEG_QUALITY, "optimize": True, "progressive": True}),
+                ("webp", "webp", {"quality": WEBP_QUALITY, "method": 4}),
+            ):
+                filename = f"{name}-{width}.{ext}"
+                resized.save(os.path.join(derived_dir, filename), fmt.upper(), **opts)
+                entry[fmt][str(width)] = f"{DERIVED_PREFIX}/{filename}"
+    return entry
+
+
+def is_current(entry: dict | None, digest: str) -> bool:
+    """True if ``entry`` was built from a file with ``digest`` and its outputs still exist."""
+    if not entry or entry.get("hash") != digest:
+        return False
+    root = static_root()
+    return all((root / p).exists() for fmt in ("jpeg", "webp") for p in entry[fmt].values())
@@ -0,0 +1,70 @@
+# catalog/listing.py
+"""
+Product-list query building shared by the HTML list (and later the API).
+
+``listing_params`` normalizes the GET filters into a plain dict so that the
+same filter combination always produces the same queryset (and cache keys).
+"""
+from __future__ import annotations
+
+from urllib.parse import urlencode
+
+from .facets import PRICE_BAND_KEYS, STOCK_LABELS, apply_facet_filters
+from .models import Product
+from .registry import registry
+from .search import search_products
+
+PAGE_SIZE = 12
+SORT_FIELDS = {"price": "price", "name": "name"}
+
+
+def listing_params(GET) -> dict:
+    sort = GET.get("sort") or ""
+    if sort not in SORT_FIELDS:
+        sort = ""
+    direction = "desc" if sort and GET.get("direction") == "desc" else ""
+    stock = GET.get("stock") or ""
+    return {
+        "q": " ".join((GET.get("q") or "").split()),
+        "cat": (GET.get("cat") or "").strip(),
+        "sort": sort,
+        "direction": direction,
+        "brand": sorted({b.strip() for b in GET.getlist("brand") if b.strip()}),
+        "price": [k for k in PRICE_BAND_KEYS if k in GET.getlist("price")],
+        "stock": stock if stock in STOCK_LABELS else "",
+    }
+
+
+def listing_queryset(params: dict, queryset=None):
+    qs = queryset if queryset is not None else Product.objects.all()
+    qs = qs.filter(is_active=True)
+
+    if params["q"]:
+        qs = search_products(qs, params["q"])
+
+    if params["cat"]:
+        # Resolve the slug in memory and filter on category_id: no JOIN, so
+        # the planner can walk (category_id, is_active, <sort>, id) in order.
+        category_id = registry.category_id(params["cat"])
+        if category_id is None:
+            return qs.none()
+        qs = qs.filter(category_id=category_id)
+
+    return apply_facet_filters(qs, params)
+
+
+def listing_ordering(params: dict) -> list[str]:
+    """ORDER BY for the params; always ends with the unique id tiebreaker."""
+    field = SORT_FIELDS.get(params["sort"])
+    if field:
+        prefix = "-" if params["direction"] == "desc" else ""
+        return [f"{prefix}{field}", f"{prefix}id"]
+    if params["q"]:
+        return ["-search_rank", "id"]
+    return ["id"]
+
+
+def listing_querystring(params: dict) -> str:
+    """Filters as a query-string prefix for pagination links ("" or "a=b&")."""
+    pairs = [(k, v) for k, v in params.items() if v]
+    return urlencode(pairs, doseq=True) + "&" if pairs else ""
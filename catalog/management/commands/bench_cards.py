@@ -0,0 +1,59 @@
+# catalog/management/commands/bench_cards.py
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from catalog.cards import CARD_TEMPLATE, render_cards
+from catalog.listing import PAGE_SIZE
+from catalog.models import Product
+
+
+class Command(BaseCommand):
+    help = "Time listing-grid card rendering: uncached per-card templates vs the card fragment cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=10, help="Listing pages to render per run.")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        pages = []
+        qs = Product.objects.select_related("brand", "category").filter(is_active=True).order_by("id")
+        for n in range(options["pages"]):
+            page = list(qs[n * PAGE_SIZE:(n + 1) * PAGE_SIZE])
+            if not page:
+                break
+            pages.append(page)
+        if not pages:
+            self.stdout.write(self.style.ERROR("No products found. Load fixtures first."))
+            return
+
+        def uncached():
+            for page in pages:
+                [render_to_string(CARD_TEMPLATE, {"p": p}) for p in page]
+
+        def cached():
+            for page in pages:
+                render_cards(page)
+
+        cache.clear()
+        render_cards([p for page in pages for p in page])  # warm
+
+        before = self._time(uncached, options["repeat"]) / len(pages)
+        after = self._time(cached, options["repeat"]) / len(pages)
+        self.stdout.write(f"pages: {len(pages)} x {PAGE_SIZE} cards")
+        self.stdout.write(f"render every card : {before:8.3f} ms/page")
+        self.stdout.write(f"card cache (warm) : {after:8.3f} ms/page")
+        self.stdout.write(self.style.SUCCESS(f"speedup           : {before / after:8.1f}x"))
+
+    def _time(self, fn, repeat: int) -> float:
+        samples = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,63 @@
+# catalog/management/commands/bench_rows.py
+from __future__ import annotations
+
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from catalog.listing import PAGE_SIZE
+from catalog.models import Product
+from catalog.rows import ROW_FIELDS, as_rows
+
+
+class Command(BaseCommand):
+    help = "Compare listing pages loaded as full Product instances vs slim ProductRow objects."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=20, help="Listing pages per run.")
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        base = Product.objects.filter(is_active=True).order_by("id")
+        ids = list(base.values_list("id", flat=True)[: options["pages"] * PAGE_SIZE])
+        if not ids:
+            self.stdout.write(self.style.ERROR("No products found. Load fixtures first."))
+            return
+        pages = [ids[i:i + PAGE_SIZE] for i in range(0, len(ids), PAGE_SIZE)]
+
+        def full():
+            return [list(base.filter(id__in=page)) for page in pages]
+
+        def slim():
+            return [list(as_rows(base.filter(id__in=page))) for page in pages]
+
+        self.stdout.write(f"pages: {len(pages)} x {PAGE_SIZE} products")
+        for label, fn in (("full Product", full), ("ProductRow  ", slim)):
+            ms = self._time(fn, options["repeat"])
+            peak = self._peak_kib(fn)
+            self.stdout.write(f"{label}: {ms:8.2f} ms  peak {peak:8.1f} KiB")
+
+        described = base.exclude(description="").exclude(description__isnull=True)
+        full_bytes = sum(len(d or "") for d in described.values_list("description", flat=True)[: len(ids)])
+        self.stdout.write(
+            f"description text skipped per {len(ids)} rows: {full_bytes / 1024:8.1f} KiB "
+            f"(row columns: {', '.join(ROW_FIELDS)})"
+        )
+
+    def _time(self, fn, repeat: int) -> float:
+        samples = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    def _peak_kib(self, fn) -> float:
+        tracemalloc.start()
+        result = fn()
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return peak / 1024
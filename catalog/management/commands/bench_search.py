@@ -0,0 +1,62 @@
+# catalog/management/commands/bench_search.py
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from catalog.models import Product
+from catalog.search import search_products
+
+DEFAULT_TERMS = ["nike", "jersey", "blue shirt", "jersy", "116"]
+
+
+class Command(BaseCommand):
+    help = "Compare ?q= search: legacy icontains OR-query vs the indexed search backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument("terms", nargs="*", help="Search terms (default: a small built-in set).")
+        parser.add_argument("--repeat", type=int, default=20, help="Runs per term and path.")
+        parser.add_argument("--page-size", type=int, default=12)
+
+    def handle(self, *args, **options):
+        terms = options["terms"] or DEFAULT_TERMS
+        repeat = max(1, options["repeat"])
+        size = options["page_size"]
+
+        self.stdout.write(self.style.NOTICE(
+            f"{Product.objects.count()} products, {repeat} runs per term (count + first page of {size})"
+        ))
+        self.stdout.write(f"{'term':<16}{'icontains ms':>14}{'rows':>8}{'search ms':>12}{'rows':>8}{'speedup':>10}")
+
+        for term in terms:
+            old_ms, old_rows = self._time(lambda: self._legacy(term), repeat, size)
+            new_ms, new_rows = self._time(lambda: self._indexed(term), repeat, size)
+            speedup = old_ms / new_ms if new_ms else float("inf")
+            self.stdout.write(
+                f"{term:<16}{old_ms:>14.2f}{old_rows:>8}{new_ms:>12.2f}{new_rows:>8}{speedup:>9.1f}x"
+            )
+
+    # ----------------- helpers -------------------------------------------------------------
+
+    def _legacy(self, q):
+        return Product.objects.select_related("brand", "category").filter(
+            Q(name__icontains=q) | Q(sku__icontains=q) | Q(brand__name__icontains=q)
+        )
+
+    def _indexed(self, q):
+        qs = Product.objects.select_related("brand", "category")
+        return search_products(qs, q).order_by("-search_rank", "id")
+
+    def _time(self, make_qs, repeat: int, size: int) -> tuple[float, int]:
+        """Median wall time in ms for COUNT(*) + first page, plus the row count."""
+        samples, rows = [], 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            qs = make_qs()
+            rows = qs.count()
+            list(qs[:size])
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), rows
@@ -0,0 +1,72 @@
+# catalog/management/commands/bench_suggest.py
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.suggest import DEFAULT_LIMIT, PrefixIndex, product_keys
+
+WORDS = (
+    "classic slim regular relaxed oversized cotton linen wool denim leather suede "
+    "jersey knit crew neck polo shirt tee hoodie jacket coat blazer trouser chino "
+    "jean short skirt dress boot sneaker loafer sandal bag tote backpack belt scarf "
+    "black white navy olive grey beige red blue green stripe check print"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Time suggestion lookups against a synthetic in-memory prefix index (no database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=100_000)
+        parser.add_argument("--brands", type=int, default=500)
+        parser.add_argument("--queries", type=int, default=20_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options["seed"])
+        products = [
+            {
+                "id": i,
+                "name": " ".join(rnd.sample(WORDS, rnd.randint(2, 5))) + f" {i}",
+                "sku": f"SKU-{i:07d}",
+                "slug": f"product-{i}",
+            }
+            for i in range(1, options["products"] + 1)
+        ]
+        brands = [
+            {"id": i, "name": f"{rnd.choice(WORDS).title()} Label {i}", "slug": f"brand-{i}"}
+            for i in range(1, options["brands"] + 1)
+        ]
+
+        index = PrefixIndex()
+        start = time.perf_counter()
+        index.load(products, brands)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        prefixes = []
+        for _ in range(options["queries"]):
+            source = rnd.choice((rnd.choice(WORDS), rnd.choice(products)["sku"].lower(), "label"))
+            prefixes.append(source[: rnd.randint(1, min(6, len(source)))])
+
+        samples = []
+        for prefix in prefixes:
+            start = time.perf_counter()
+            index.lookup(prefix, DEFAULT_LIMIT)
+            samples.append((time.perf_counter() - start) * 1_000_000)
+        samples.sort()
+
+        start = time.perf_counter()
+        for p in products[:1000]:
+            index.put(("p", p["id"]), {"type": "product", **p}, product_keys(p["name"], p["sku"]))
+        update_us = (time.perf_counter() - start) * 1000
+
+        self.stdout.write(f"index: {len(products):,} products, {len(brands):,} brands, {len(index):,} keys")
+        self.stdout.write(f"build            : {build_ms:10.1f} ms")
+        self.stdout.write(f"lookup p50       : {statistics.median(samples):10.1f} µs")
+        self.stdout.write(f"lookup p99       : {samples[int(len(samples) * 0.99)]:10.1f} µs")
+        self.stdout.write(f"lookup max       : {samples[-1]:10.1f} µs")
+        self.stdout.write(f"incremental put  : {update_us:10.1f} µs/product")
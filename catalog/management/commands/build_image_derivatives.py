@@ -0,0 +1,87 @@
+# catalog/management/commands/build_image_derivatives.py
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from catalog.cache import bump_catalog_version
+from catalog.images import (
+    DERIVED_PREFIX,
+    SOURCE_PREFIX,
+    build_derivatives,
+    file_hash,
+    is_current,
+    load_manifest,
+    manifest_path,
+    static_root,
+)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate resized JPEG/WebP derivatives and manifest.json for product images. "
+        "Run before collectstatic; unchanged originals are skipped by content hash."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--force", action="store_true", help="Rebuild even unchanged images.")
+
+    def handle(self, *args, **options):
+        source_dir = static_root() / SOURCE_PREFIX
+        derived_dir = static_root() / DERIVED_PREFIX
+        derived_dir.mkdir(parents=True, exist_ok=True)
+
+        old = dict(load_manifest())
+        manifest, todo = {}, []
+        for filename in sorted(os.listdir(source_dir)):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = source_dir / filename
+            name = path.stem.lower()
+            if not options["force"] and is_current(old.get(name), file_hash(path)):
+                manifest[name] = old[name]
+            else:
+                todo.append((name, str(path)))
+
+        start = time.perf_counter()
+        failed = 0
+        if todo:
+            with ProcessPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+                futures = {
+                    pool.submit(build_derivatives, path, str(derived_dir)): name for name, path in todo
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        manifest[name] = future.result()
+                    except Exception as exc:  # a corrupt original must not stop the run
+                        failed += 1
+                        self.stderr.write(f"{name}: {exc}")
+
+        self._remove_orphans(derived_dir, manifest)
+        tmp = manifest_path().with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(dict(sorted(manifest.items())), indent=1), encoding="utf-8")
+        os.replace(tmp, manifest_path())
+        if todo:
+            bump_catalog_version()  # page ETags must change with the srcsets
+
+        self.stdout.write(
+            f"{len(todo) - failed} built, {len(manifest) - len(todo) + failed} unchanged, "
+            f"{failed} failed in {time.perf_counter() - start:.1f}s"
+        )
+
+    def _remove_orphans(self, derived_dir, manifest):
+        keep = {
+            os.path.basename(p) for entry in manifest.values() for fmt in ("jpeg", "webp")
+            for p in entry[fmt].values()
+        }
+        for filename in os.listdir(derived_dir):
+            if filename != "manifest.json" and filename not in keep:
+                os.remove(derived_dir / filename)
@@ -0,0 +1,23 @@
+# catalog/management/commands/purge_cart_lines.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from catalog.carts import purge_abandoned_cart_lines
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete "db" cart store lines (cart_line) whose session has expired. '
+        "Run after clearsessions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours", type=int, default=24,
+            help="Keep carts changed more recently than this, whatever their session.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_abandoned_cart_lines(timedelta(hours=options["grace_hours"]))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} abandoned cart lines."))
@@ -0,0 +1,12 @@
+# catalog/management/commands/rebuild_facets.py
+from django.core.management.base import BaseCommand
+
+from catalog.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed brand / price band / stock facet counts from the product table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f"Facet counts rebuilt ({rows} rows)."))
@@ -0,0 +1,28 @@
+# catalog/middleware.py
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .carts import SignedCookieCartStore
+
+
+class CartCookieMiddleware:
+    """
+    Writes the anonymous signed-cookie cart (catalog/carts.py) after the
+    view ran, and deletes it once the cart has moved server-side.
+    Must come after the session and authentication middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        store = getattr(request, "_cart_store", None)
+        if getattr(request, "_delete_cart_cookie", False):
+            response.delete_cookie(settings.CART_COOKIE_NAME, samesite="Lax")
+        elif isinstance(store, SignedCookieCartStore):
+            store.apply(response)
+        if isinstance(store, SignedCookieCartStore):
+            patch_vary_headers(response, ["Cookie"])
+        return response
@@ -0,0 +1,72 @@
+# catalog/migrations/0004_product_search_document.py
+from django.db import migrations, models
+
+ADD_COLUMN_SQL = "ALTER TABLE product ADD COLUMN search_document TEXT NOT NULL DEFAULT '';"
+DROP_COLUMN_SQL = "ALTER TABLE product DROP COLUMN search_document;"
+
+BACKFILL_SQL = r"""
+UPDATE product
+   SET search_document = lower(
+         name || ' ' || sku || ' ' ||
+         COALESCE((SELECT b.name FROM brand b WHERE b.id = product.brand_id), '')
+       );
+"""
+
+PG_INDEX_SQL = r"""
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS product_search_tsv_idx
+    ON product USING GIN (to_tsvector('simple', search_document));
+CREATE INDEX IF NOT EXISTS product_search_trgm_idx
+    ON product USING GIN (search_document gin_trgm_ops);
+"""
+
+PG_DROP_INDEX_SQL = r"""
+DROP INDEX IF EXISTS product_search_trgm_idx;
+DROP INDEX IF EXISTS product_search_tsv_idx;
+"""
+
+SQLITE_FTS_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5("
+    "document, tokenize = 'unicode61 remove_diacritics 2');",
+    "INSERT INTO product_search(rowid, document) SELECT id, search_document FROM product;",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    conn = schema_editor.connection
+    schema_editor.execute(BACKFILL_SQL)
+    if conn.vendor == "postgresql":
+        schema_editor.execute(PG_INDEX_SQL)
+    elif conn.vendor == "sqlite":
+        for sql in SQLITE_FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == "postgresql":
+        schema_editor.execute(PG_DROP_INDEX_SQL)
+    elif conn.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS product_search;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0003_create_core_tables"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=ADD_COLUMN_SQL,
+            reverse_sql=DROP_COLUMN_SQL,
+            state_operations=[
+                migrations.AddField(
+                    model_name="product",
+                    name="search_document",
+                    field=models.TextField(blank=True, default="", editable=False),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
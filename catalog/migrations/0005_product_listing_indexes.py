@@ -0,0 +1,60 @@
+# catalog/migrations/0005_product_listing_indexes.py
+from django.db import migrations, models
+
+# Built CONCURRENTLY (outside a transaction, hence atomic = False) so the
+# product table stays writable during the build; a failed build leaves an
+# INVALID index that must be dropped before re-running.
+# (name, columns) – mirrors Product.Meta.indexes
+INDEXES = [
+    ("product_cat_act_price_idx", "category_id, is_active, price, id"),
+    ("product_cat_act_name_idx", "category_id, is_active, name, id"),
+    ("product_cat_act_id_idx", "category_id, is_active, id"),
+    ("product_act_price_idx", "is_active, price, id"),
+    ("product_act_name_idx", "is_active, name, id"),
+    ("product_act_id_idx", "is_active, id"),
+]
+
+CREATE_SQL = [f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON product ({cols});" for name, cols in INDEXES]
+DROP_SQL = [f"DROP INDEX CONCURRENTLY IF EXISTS {name};" for name, _ in INDEXES]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0004_product_search_document"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_SQL + ["ANALYZE product;"],
+            reverse_sql=DROP_SQL,
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="product",
+                    index=models.Index(fields=["category", "is_active", "price", "id"], name="product_cat_act_price_idx"),
+                ),
+                migrations.AddIndex(
+                    model_name="product",
+                    index=models.Index(fields=["category", "is_active", "name", "id"], name="product_cat_act_name_idx"),
+                ),
+                migrations.AddIndex(
+                    model_name="product",
+                    index=models.Index(fields=["category", "is_active", "id"], name="product_cat_act_id_idx"),
+                ),
+                migrations.AddIndex(
+                    model_name="product",
+                    index=models.Index(fields=["is_active", "price", "id"], name="product_act_price_idx"),
+                ),
+                migrations.AddIndex(
+                    model_name="product",
+                    index=models.Index(fields=["is_active", "name", "id"], name="product_act_name_idx"),
+                ),
+                migrations.AddIndex(
+                    model_name="product",
+                    index=models.Index(fields=["is_active", "id"], name="product_act_id_idx"),
+                ),
+            ],
+        ),
+    ]
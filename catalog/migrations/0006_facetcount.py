@@ -0,0 +1,31 @@
+# Generated by Django 4.2.23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_product_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("facet", models.CharField(max_length=20)),
+                ("value", models.CharField(max_length=40)),
+                ("count", models.IntegerField(default=0)),
+                ("category", models.ForeignKey(db_column="category_id", on_delete=django.db.models.deletion.CASCADE, related_name="facet_counts", to="catalog.category")),
+            ],
+            options={
+                "db_table": "product_facet_count",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="facetcount",
+            constraint=models.UniqueConstraint(fields=("category", "facet", "value"), name="facet_count_uniq"),
+        ),
+    ]
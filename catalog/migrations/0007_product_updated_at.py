@@ -0,0 +1,44 @@
+# catalog/migrations/0007_product_updated_at.py
+from django.db import migrations, models
+
+
+def add_updated_at(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE product ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE;"
+        )
+    else:
+        schema_editor.execute("ALTER TABLE product ADD COLUMN updated_at datetime NULL;")
+    schema_editor.execute("UPDATE product SET updated_at = created_at WHERE updated_at IS NULL;")
+    if conn.vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE product ALTER COLUMN updated_at SET DEFAULT now(), "
+            "ALTER COLUMN updated_at SET NOT NULL;"
+        )
+
+
+def drop_updated_at(apps, schema_editor):
+    schema_editor.execute("ALTER TABLE product DROP COLUMN updated_at;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0006_facetcount"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_updated_at, drop_updated_at),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name="product",
+                    name="updated_at",
+                    field=models.DateTimeField(auto_now=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,46 @@
+# catalog/migrations/0008_product_short_description.py
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+ADD_COLUMN_SQL = "ALTER TABLE product ADD COLUMN short_description VARCHAR(255) NOT NULL DEFAULT '';"
+DROP_COLUMN_SQL = "ALTER TABLE product DROP COLUMN short_description;"
+
+
+def backfill_short_description(apps, schema_editor):
+    # Same teaser as catalog.rows.build_short_description at the time of writing.
+    Product = apps.get_model("catalog", "Product")
+    db = schema_editor.connection.alias
+    batch = []
+    for p in Product.objects.using(db).only("id", "description").exclude(description="").exclude(
+        description__isnull=True
+    ).iterator(chunk_size=1000):
+        p.short_description = Truncator(strip_tags(p.description)).words(10, truncate=" …")[:255]
+        batch.append(p)
+        if len(batch) >= 1000:
+            Product.objects.using(db).bulk_update(batch, ["short_description"])
+            batch = []
+    if batch:
+        Product.objects.using(db).bulk_update(batch, ["short_description"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0007_product_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=ADD_COLUMN_SQL,
+            reverse_sql=DROP_COLUMN_SQL,
+            state_operations=[
+                migrations.AddField(
+                    model_name="product",
+                    name="short_description",
+                    field=models.CharField(blank=True, default="", editable=False, max_length=255),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_short_description, migrations.RunPython.noop),
+    ]
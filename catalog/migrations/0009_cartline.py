@@ -0,0 +1,30 @@
+# Generated by Django 4.2.23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0008_product_short_description"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CartLine",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("cart_key", models.CharField(max_length=40)),
+                ("sku", models.CharField(max_length=120)),
+                ("qty", models.PositiveIntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "cart_line",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="cartline",
+            constraint=models.UniqueConstraint(fields=("cart_key", "sku"), name="cart_line_uniq"),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 
+from .rows import SHORT_DESCRIPTION_MAX_LENGTH, build_short_description
+from .search import build_search_document
+
 
 class Category(models.Model):
     name = models.CharField(max_length=120)
@@ -37,6 +40,14 @@ class Product(models.Model):
     stock = models.IntegerField()
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Lower-cased "name sku brand" text behind ?q= search (see catalog/search.py).
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # Plain-text card teaser derived from description (see catalog/rows.py).
+    short_description = models.CharField(
+        max_length=SHORT_DESCRIPTION_MAX_LENGTH, blank=True, default="", editable=False
+    )
 
     # IMPORTANT: real FKs mapped to existing DB columns
     category = models.ForeignKey(
@@ -51,6 +62,67 @@ class Product(models.Model):
     class Meta:
         db_table = "product"
         managed = True
+        # Listing access paths: is_active (+ category) filter, ORDER BY <sort>, id.
+        indexes = [
+            models.Index(fields=["category", "is_active", "price", "id"], name="product_cat_act_price_idx"),
+            models.Index(fields=["category", "is_active", "name", "id"], name="product_cat_act_name_idx"),
+            models.Index(fields=["category", "is_active", "id"], name="product_cat_act_id_idx"),
+            models.Index(fields=["is_active", "price", "id"], name="product_act_price_idx"),
+            models.Index(fields=["is_active", "name", "id"], name="product_act_name_idx"),
+            models.Index(fields=["is_active", "id"], name="product_act_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.sku})"
+
+    def save(self, *args, **kwargs):
+        self.search_document = build_search_document(self)
+        self.short_description = build_short_description(self.description)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            derived = [f for f in ("search_document", "short_description") if f not in update_fields]
+            kwargs["update_fields"] = [*update_fields, *derived]
+        super().save(*args, **kwargs)
+
+
+class FacetCount(models.Model):
+    """
+    Precomputed facet counts of active products per category
+    (brand / price band / availability). Maintained by catalog/facets.py.
+    """
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE,
+        db_column="category_id", related_name="facet_counts"
+    )
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=40)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "product_facet_count"
+        constraints = [
+            models.UniqueConstraint(fields=["category", "facet", "value"], name="facet_count_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.category_id}:{self.facet}={self.value} ({self.count})"
+
+
+class CartLine(models.Model):
+    """
+    One bag line for the "db" cart store (catalog/carts.py). ``cart_key`` is
+    the random cart id kept in the visitor's session.
+    """
+    cart_key = models.CharField(max_length=40)
+    sku = models.CharField(max_length=120)
+    qty = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "cart_line"
+        constraints = [
+            models.UniqueConstraint(fields=["cart_key", "sku"], name="cart_line_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.cart_key}:{self.sku} x{self.qty}"
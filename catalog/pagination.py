@@ -0,0 +1,176 @@
+# catalog/pagination.py
+"""
+Keyset ("seek") pagination.
+
+Pages are addressed by an opaque cursor holding the ordering values of the
+row at the page edge, so every page is ``WHERE (price, id) > (...) LIMIT n``
+on an index instead of ``COUNT(*)`` + ``OFFSET``. The last ordering field
+must be unique (we always end with ``id``).
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+NEXT, PREV = "n", "p"
+
+
+def encode_cursor(values: list, direction: str, number: int) -> str:
+    raw = json.dumps({"v": values, "d": direction, "n": number}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> dict | None:
+    """Return the cursor payload, or None for a missing/garbled token."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("d") not in (NEXT, PREV) or not isinstance(data.get("v"), list):
+        return None
+    return data
+
+
+class CountedPaginator(Paginator):
+    """
+    Offset paginator that takes a precomputed (cached) count. The count must
+    be exact: page numbers are validated against it.
+    """
+
+    def __init__(self, object_list, per_page, count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class KeysetPage:
+    """Quacks like django.core.paginator.Page where the templates need it."""
+
+    def __init__(self, object_list, paginator, number, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f"<KeysetPage {self.number}>"
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not (self._has_next and self.object_list):
+            return ""
+        return self.paginator.cursor_for(self.object_list[-1], NEXT, self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        if not (self._has_previous and self.object_list):
+            return ""
+        return self.paginator.cursor_for(self.object_list[0], PREV, self.number - 1)
+
+
+class KeysetPaginator:
+    """
+    ``ordering`` is a list like ["-price", "-id"]. ``count`` is optional:
+    pass an exact/cached/estimated total to get ``num_pages``, or leave it
+    None and the page cost stays independent of the result size.
+    """
+
+    def __init__(self, queryset, ordering: list[str], per_page: int, count: int | None = None):
+        if not ordering or ordering[-1].lstrip("-") != "id":
+            raise ValueError("Keyset ordering must end with the unique 'id' tiebreaker.")
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.count = count
+        self._fields = [o.lstrip("-") for o in self.ordering]
+        self._desc = [o.startswith("-") for o in self.ordering]
+
+    @property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(1, -(-self.count // self.per_page))
+
+    def cursor_for(self, row, direction: str, number: int) -> str:
+        return encode_cursor([getattr(row, f) for f in self._fields], direction, max(1, number))
+
+    def get_page(self, cursor: str | None) -> KeysetPage:
+        data = decode_cursor(cursor)
+        values = self._to_python(data["v"]) if data else None
+        if values is None:
+            rows = list(self.queryset.order_by(*self.ordering)[: self.per_page + 1])
+            return KeysetPage(rows[: self.per_page], self, 1, len(rows) > self.per_page, False)
+
+        number = data.get("n") if isinstance(data.get("n"), int) else 1
+        number = max(1, number)
+        if data["d"] == NEXT:
+            qs = self.queryset.filter(self._seek(values, forward=True)).order_by(*self.ordering)
+            rows = list(qs[: self.per_page + 1])
+            return KeysetPage(rows[: self.per_page], self, number, len(rows) > self.per_page, True)
+
+        reverse = [o[1:] if o.startswith("-") else f"-{o}" for o in self.ordering]
+        qs = self.queryset.filter(self._seek(values, forward=False)).order_by(*reverse)
+        rows = list(qs[: self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[: self.per_page][::-1]
+        return KeysetPage(rows, self, number if has_previous else 1, True, has_previous)
+
+    # ---------- helpers ----------
+    def _to_python(self, raw: list):
+        if len(raw) != len(self._fields):
+            return None
+        model = self.queryset.model
+        try:
+            return [model._meta.get_field(f).to_python(v) for f, v in zip(self._fields, raw)]
+        except (ValidationError, TypeError):
+            return None
+
+    def _seek(self, values: list, *, forward: bool):
+        """Lexicographic "after" (or "before") condition for the ordering tuple."""
+        if len(set(self._desc)) == 1:
+            # Same direction throughout: a row-value comparison, which the
+            # database can turn into a single index range scan.
+            op = "<" if self._desc[0] == forward else ">"
+            opts = self.queryset.model._meta
+            connection = connections[self.queryset.db]
+            qn = connection.ops.quote_name
+            fields = [opts.get_field(f) for f in self._fields]
+            cols = ", ".join(f"{qn(opts.db_table)}.{qn(f.column)}" for f in fields)
+            marks = ", ".join(["%s"] * len(values))
+            # Raw params skip field adaptation (e.g. aware datetimes on SQLite).
+            params = [f.get_db_prep_value(v, connection) for f, v in zip(fields, values)]
+            return RawSQL(f"({cols}) {op} ({marks})", params, output_field=BooleanField())
+
+        clauses = []
+        for i, (field, desc) in enumerate(zip(self._fields, self._desc)):
+            op = "lt" if desc == forward else "gt"
+            eq = {f: v for f, v in zip(self._fields[:i], values[:i])}
+            clauses.append(Q(**eq, **{f"{field}__{op}": values[i]}))
+        return reduce(or_, clauses)
@@ -0,0 +1,102 @@
+# catalog/registry.py
+"""
+Process-local registry of categories and brands.
+
+Both tables are tiny and rarely change, so each process keeps slug → id and
+id → display data in memory. It loads lazily on first use, is dropped by
+Category/Brand save/delete signals (catalog/signals.py), and reloads after
+REGISTRY_TTL seconds so other worker processes pick up changes too.
+Rows written without signals (bulk_create, QuerySet.update) or by another
+process are found on a miss: one existence query, and a reload if the row
+is there.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+from .models import Brand, Category
+
+REGISTRY_TTL = 300
+
+
+class CatalogRegistry:
+    def __init__(self, ttl: int = REGISTRY_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = None
+
+    def invalidate(self):
+        self._data = None
+
+    def _get(self) -> dict:
+        data = self._data
+        if data is None or time.monotonic() - data["loaded_at"] > self.ttl:
+            with self._lock:
+                data = self._data
+                if data is None or time.monotonic() - data["loaded_at"] > self.ttl:
+                    data = self._data = self._load()
+        return data
+
+    def _reload_if_exists(self, model, **lookup) -> dict:
+        """Data after a lookup miss: reloaded if a matching row exists after all."""
+        if model.objects.filter(**lookup).exists():
+            with self._lock:
+                self._data = self._load()
+        return self._get()
+
+    def _load(self) -> dict:
+        categories = [
+            {"id": c["id"], "slug": c["slug"], "name": c["display_name"] or c["name"]}
+            for c in Category.objects.values("id", "slug", "name", "display_name")
+        ]
+        brands = [
+            {"id": b["id"], "slug": b["slug"], "name": b["name"]}
+            for b in Brand.objects.values("id", "slug", "name")
+        ]
+        return {
+            "loaded_at": time.monotonic(),
+            "categories": categories,
+            "category_by_id": {c["id"]: c for c in categories},
+            "category_by_slug": {c["slug"]: c for c in categories},
+            "brand_by_id": {b["id"]: b for b in brands},
+            "brand_by_slug": {b["slug"]: b for b in brands},
+        }
+
+    # ---------- categories ----------
+    def categories(self) -> list[dict]:
+        """All categories as {"id", "slug", "name"}, in Category.Meta.ordering."""
+        return self._get()["categories"]
+
+    def category_id(self, slug: str) -> int | None:
+        c = self._get()["category_by_slug"].get(slug)
+        if c is None and slug:
+            c = self._reload_if_exists(Category, slug=slug)["category_by_slug"].get(slug)
+        return c["id"] if c else None
+
+    def category_name(self, category_id) -> str:
+        c = self._get()["category_by_id"].get(category_id)
+        if c is None and category_id is not None:
+            c = self._reload_if_exists(Category, pk=category_id)["category_by_id"].get(category_id)
+        return c["name"] if c else ""
+
+    # ---------- brands ----------
+    def brand(self, brand_id) -> dict | None:
+        b = self._get()["brand_by_id"].get(brand_id)
+        if b is None and brand_id is not None:
+            b = self._reload_if_exists(Brand, pk=brand_id)["brand_by_id"].get(brand_id)
+        return b
+
+    def brand_ids(self, slugs) -> list[int]:
+        by_slug = self._get()["brand_by_slug"]
+        missing = [s for s in slugs if s not in by_slug]
+        if missing:
+            by_slug = self._reload_if_exists(Brand, slug__in=missing)["brand_by_slug"]
+        return [by_slug[s]["id"] for s in slugs if s in by_slug]
+
+    def brand_name(self, brand_id) -> str:
+        b = self.brand(brand_id)
+        return b["name"] if b else ""
+
+
+registry = CatalogRegistry()
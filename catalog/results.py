@@ -0,0 +1,129 @@
+# catalog/results.py
+"""
+Hot-query result cache for catalog search.
+
+A few search terms account for most ``?q=`` traffic, so each process keeps
+the product ids of recently served search pages in a small LRU with a TTL,
+keyed by (catalog version, normalized filters, page/cursor). A hit swaps
+the ranked full-text query for a primary-key lookup of one page of rows.
+
+Product/Brand/Category signals clear this process's cache
+(catalog/signals.py); writes made in other processes bump the shared
+catalog version in the key (catalog/cache.py), so entries cached before
+them are never read again.
+Hit/miss counters are served to staff at /shop/api/result-cache/.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import Page
+
+from .cache import catalog_version, params_digest
+from .pagination import KeysetPage, KeysetPaginator
+from .rows import as_rows
+
+
+class ResultCache:
+    """Thread-safe LRU mapping with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+result_cache = ResultCache(settings.CATALOG_RESULT_CACHE_SIZE, settings.CATALOG_RESULT_CACHE_TTL)
+
+
+def page_key(params: dict, token: str) -> str:
+    return f"{catalog_version()}:{params_digest(params)}:{token}"
+
+
+def search_page(paginator, params: dict, token: str | None):
+    """
+    ``paginator.get_page(token)`` for a search listing, served from the
+    result cache when the same page was computed recently.
+    """
+    key = page_key(params, token or "")
+    entry = result_cache.get(key)
+    if entry is not None:
+        page_obj = _page_from_ids(paginator, entry)
+        if page_obj is not None:
+            return page_obj
+
+    page_obj = paginator.get_page(token)
+    rows = list(page_obj.object_list)
+    page_obj.object_list = rows
+    result_cache.set(key, {
+        "ids": [p.pk for p in rows],
+        "number": page_obj.number,
+        "has_next": page_obj.has_next(),
+        "has_previous": page_obj.has_previous(),
+    })
+    return page_obj
+
+
+def _page_from_ids(paginator, entry: dict):
+    keyset = isinstance(paginator, KeysetPaginator)
+    qs = paginator.queryset if keyset else paginator.object_list
+    by_id = {
+        row.pk: row
+        for row in as_rows(qs.model._default_manager.using(qs.db).filter(pk__in=entry["ids"]))
+    }
+    if len(by_id) != len(entry["ids"]):
+        return None  # a product went away since the page was cached
+    rows = [by_id[pk] for pk in entry["ids"]]
+    if keyset:
+        return KeysetPage(rows, paginator, entry["number"], entry["has_next"], entry["has_previous"])
+    return Page(rows, entry["number"], paginator)
@@ -0,0 +1,59 @@
+# catalog/rows.py
+"""
+Slim product rows for list-style pages.
+
+The listing grid and the bag only show a handful of columns, so they read
+``values_list`` tuples wrapped in ProductRow (``__slots__``, no model
+state) instead of full Product instances. The unbounded ``description``
+never leaves the database there: cards use the precomputed
+``short_description`` teaser maintained by Product.save().
+"""
+from __future__ import annotations
+
+from django.db.models.query import ValuesListIterable
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+SHORT_DESCRIPTION_WORDS = 10
+SHORT_DESCRIPTION_MAX_LENGTH = 255
+
+ROW_FIELDS = (
+    "id", "name", "slug", "sku", "price", "stock",
+    "brand_id", "category_id", "short_description", "updated_at",
+)
+
+
+def build_short_description(description: str | None) -> str:
+    """Plain-text teaser; same output as ``|striptags|truncatewords:10``."""
+    if not description:
+        return ""
+    teaser = Truncator(strip_tags(description)).words(SHORT_DESCRIPTION_WORDS, truncate=" …")
+    return teaser[:SHORT_DESCRIPTION_MAX_LENGTH]
+
+
+class ProductRow:
+    __slots__ = ROW_FIELDS
+
+    def __init__(self, *values):
+        for name, value in zip(ROW_FIELDS, values):
+            setattr(self, name, value)
+
+    @property
+    def pk(self):
+        return self.id
+
+    def __repr__(self):
+        return f"<ProductRow {self.id} {self.sku}>"
+
+
+class ProductRowIterable(ValuesListIterable):
+    def __iter__(self):
+        for values in super().__iter__():
+            yield ProductRow(*values)
+
+
+def as_rows(queryset):
+    """``queryset`` yielding ProductRow objects; still filterable, orderable and sliceable."""
+    qs = queryset.values_list(*ROW_FIELDS)
+    qs._iterable_class = ProductRowIterable
+    return qs
@@ -0,0 +1,135 @@
+# catalog/search.py
+"""
+Product search behind ?q= on the product list.
+
+Every Product carries a lower-cased ``search_document`` ("name sku brand"),
+rebuilt in Product.save() and when a Brand is renamed (catalog/signals.py).
+
+- PostgreSQL: prefix full-text match (GIN on to_tsvector('simple', ...))
+  OR trigram word similarity (GIN gin_trgm_ops) for typos,
+  ranked by ts_rank + word_similarity.
+- SQLite: FTS5 table ``product_search`` (rowid = product.id), ranked by bm25.
+- Anything else: icontains on the single search_document column (no JOIN).
+"""
+from __future__ import annotations
+
+import re
+
+from django.db import connections, OperationalError
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+MAX_TOKENS = 8
+FTS_TABLE = "product_search"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_fts5_ready: dict[str, bool] = {}
+
+
+def build_search_document(product) -> str:
+    """Text indexed for a product: name, SKU and brand name, lower-cased."""
+    brand_name = ""
+    if product.brand_id:
+        brand_name = product.brand.name
+    parts = [product.name or "", product.sku or "", brand_name or ""]
+    return " ".join(p.strip() for p in parts if p).lower()
+
+
+def tokenize(q: str) -> list[str]:
+    return _TOKEN_RE.findall((q or "").lower())[:MAX_TOKENS]
+
+
+def search_products(qs, q: str):
+    """
+    Filter ``qs`` (a Product queryset) by ``q`` and annotate ``search_rank``
+    (higher is better). Returns ``qs.none()`` when q has no usable tokens.
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return qs.none()
+
+    vendor = connections[qs.db].vendor
+    if vendor == "postgresql":
+        return _search_postgres(qs, tokens)
+    if vendor == "sqlite" and fts5_available(qs.db):
+        return _search_sqlite(qs, tokens)
+    return _search_fallback(qs, tokens)
+
+
+def _search_postgres(qs, tokens: list[str]):
+    # Expressions must match the indexes created in 0004_product_search_document.
+    tsquery = " & ".join(f"{t}:*" for t in tokens)
+    text = " ".join(tokens)
+    matches = RawSQL(
+        """(to_tsvector('simple', "product"."search_document") @@ to_tsquery('simple', %s)
+            OR %s <%% "product"."search_document")""",
+        (tsquery, text),
+        output_field=BooleanField(),
+    )
+    rank = RawSQL(
+        """ts_rank(to_tsvector('simple', "product"."search_document"), to_tsquery('simple', %s))
+           + word_similarity(%s, "product"."search_document")""",
+        (tsquery, text),
+        output_field=FloatField(),
+    )
+    return qs.filter(matches).annotate(search_rank=rank)
+
+
+def _search_sqlite(qs, tokens: list[str]):
+    match = " ".join(f'"{t}"*' for t in tokens)
+    matches = RawSQL(
+        f'"product"."id" IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+        (match,),
+        output_field=BooleanField(),
+    )
+    # bm25() is "lower is better"; negate so search_rank sorts the same on every backend.
+    rank = RawSQL(
+        f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = "product"."id")',
+        (match,),
+        output_field=FloatField(),
+    )
+    return qs.filter(matches).annotate(search_rank=rank)
+
+
+def _search_fallback(qs, tokens: list[str]):
+    for t in tokens:
+        qs = qs.filter(search_document__icontains=t)
+    return qs.annotate(search_rank=RawSQL("0", (), output_field=FloatField()))
+
+
+# ---------- SQLite FTS5 maintenance ----------
+
+def fts5_available(using: str = "default") -> bool:
+    """True when the product_search FTS5 table exists on this SQLite DB."""
+    if using not in _fts5_ready:
+        conn = connections[using]
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [FTS_TABLE],
+                )
+                _fts5_ready[using] = cur.fetchone() is not None
+        except OperationalError:
+            _fts5_ready[using] = False
+    return _fts5_ready[using]
+
+
+def index_product(product, using: str = "default") -> None:
+    """Upsert one product into the FTS5 table (no-op off SQLite)."""
+    if connections[using].vendor != "sqlite" or not fts5_available(using):
+        return
+    with connections[using].cursor() as cur:
+        cur.execute(
+            f"INSERT OR REPLACE INTO {FTS_TABLE}(rowid, document) VALUES (%s, %s)",
+            [product.pk, product.search_document],
+        )
+
+
+def unindex_product(pk, using: str = "default") -> None:
+    """Remove one product from the FTS5 table (no-op off SQLite)."""
+    if connections[using].vendor != "sqlite" or not fts5_available(using):
+        return
+    with connections[using].cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
@@ -0,0 +1,119 @@
+# catalog/signals.py
+from django.contrib.auth.signals import user_logged_in
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import facets
+from .cache import bump_catalog_version
+from .carts import migrate_cookie_cart
+from .models import Brand, Category, Product
+from .registry import registry
+from .results import result_cache
+from .rows import build_short_description
+from .search import build_search_document, index_product, unindex_product
+from .suggest import suggestions
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        # loaddata bypasses Product.save(), so build the derived columns here.
+        instance.search_document = build_search_document(instance)
+        instance.short_description = build_short_description(instance.description)
+        Product.objects.using(using).filter(pk=instance.pk).update(
+            search_document=instance.search_document,
+            short_description=instance.short_description,
+        )
+    index_product(instance, using=using)
+    # The suggest index is in memory: a rolled-back save must not reach it.
+    transaction.on_commit(lambda: suggestions.product_changed(instance), using=using)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, using, **kwargs):
+    unindex_product(instance.pk, using=using)
+    pk = instance.pk
+    transaction.on_commit(lambda: suggestions.product_deleted(pk), using=using)
+
+
+@receiver(pre_save, sender=Product)
+def product_fixture_updated_at(sender, instance, raw=False, **kwargs):
+    # loaddata (raw) skips auto_now; fixtures predate the column.
+    if raw and instance.updated_at is None:
+        instance.updated_at = instance.created_at or timezone.now()
+
+
+@receiver(pre_save, sender=Product)
+def product_facets_before(sender, instance, using, **kwargs):
+    instance._facets_before = None
+    if instance.pk:
+        instance._facets_before = (
+            Product.objects.using(using)
+            .filter(pk=instance.pk)
+            .values(*facets.TRACKED_FIELDS)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Product)
+def product_facets_after(sender, instance, using, **kwargs):
+    before = getattr(instance, "_facets_before", None)
+    facets.apply_change(before, facets.snapshot_of(instance), using=using)
+
+
+@receiver(post_delete, sender=Product)
+def product_facets_deleted(sender, instance, using, **kwargs):
+    facets.apply_change(facets.snapshot_of(instance), None, using=using)
+
+
+@receiver(post_save, sender=Brand)
+def brand_saved(sender, instance, using, created=False, raw=False, **kwargs):
+    """Brand names are part of each product's search document."""
+    if created or raw:
+        return
+    products = list(Product.objects.using(using).filter(brand=instance))
+    for p in products:
+        p.brand = instance
+        p.search_document = build_search_document(p)
+        index_product(p, using=using)
+    Product.objects.using(using).bulk_update(products, ["search_document"], batch_size=500)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def catalog_changed(sender, **kwargs):
+    """Invalidate everything keyed by the catalog version (counts, ...)."""
+    bump_catalog_version()
+    result_cache.clear()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def taxonomy_changed(sender, **kwargs):
+    registry.invalidate()
+
+
+@receiver(post_save, sender=Brand)
+def brand_suggest_changed(sender, instance, using, **kwargs):
+    transaction.on_commit(lambda: suggestions.brand_changed(instance), using=using)
+
+
+@receiver(post_delete, sender=Brand)
+def brand_suggest_deleted(sender, instance, using, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: suggestions.brand_deleted(pk), using=using)
+
+
+@receiver(user_logged_in)
+def cart_cookie_to_server(sender, request, user, **kwargs):
+    """Fold an anonymous signed-cookie cart into the user's server-side cart."""
+    if request is not None:
+        migrate_cookie_cart(request)
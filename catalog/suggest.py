@@ -0,0 +1,207 @@
+# catalog/suggest.py
+"""
+Search-as-you-type suggestions from an in-process prefix index.
+
+Every active product contributes its full name, each word of its name and
+its SKU as lower-cased keys; every brand contributes its name. The keys sit
+in one sorted list of (key, ref) pairs, so a lookup is a ``bisect`` to the
+first key >= the prefix followed by a short forward walk: O(log n + k) with
+no database round trip.
+
+The index loads lazily on the first lookup in each process and is kept
+current by Product/Brand save/delete signals (catalog/signals.py), applied
+once the writing transaction commits. Writes made by other worker processes
+show up through the catalog version: a process whose index was loaded under
+an older version reloads it, at most every SUGGEST_RECHECK seconds (the
+endpoint's responses are cacheable for that long anyway), and in any case
+after SUGGEST_TTL seconds.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+
+from .cache import catalog_version
+from .models import Brand, Product
+
+SUGGEST_TTL = 900
+SUGGEST_RECHECK = 60
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+MIN_WORD_LENGTH = 2
+
+PRODUCT, BRAND = "p", "b"
+
+
+def normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def product_keys(name: str, sku: str) -> set[str]:
+    name = normalize(name)
+    keys = {name, normalize(sku)}
+    keys.update(w for w in name.split() if len(w) >= MIN_WORD_LENGTH)
+    keys.discard("")
+    return keys
+
+
+class PrefixIndex:
+    """Sorted (key, ref) pairs answering prefix queries with bisect."""
+
+    def __init__(self):
+        self._entries: list[tuple[str, tuple[str, int]]] = []
+        self._labels: dict[tuple[str, int], dict] = {}
+        self._key_sets: dict[tuple[str, int], set[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------- building ----------
+    def load(self, products, brands):
+        """
+        Replace the contents from iterables of product dicts (id, name, sku,
+        slug) and brand dicts (id, name, slug).
+        """
+        pairs, labels, key_sets = [], {}, {}
+        for p in products:
+            ref = (PRODUCT, p["id"])
+            labels[ref] = {"type": "product", "name": p["name"], "sku": p["sku"], "slug": p["slug"]}
+            key_sets[ref] = product_keys(p["name"], p["sku"])
+            pairs.extend((k, ref) for k in key_sets[ref])
+        for b in brands:
+            ref = (BRAND, b["id"])
+            labels[ref] = {"type": "brand", "name": b["name"], "slug": b["slug"]}
+            key_sets[ref] = {normalize(b["name"])} - {""}
+            pairs.extend((k, ref) for k in key_sets[ref])
+        pairs.sort()
+
+        with self._lock:
+            self._entries = pairs
+            self._labels = labels
+            self._key_sets = key_sets
+
+    # ---------- incremental updates ----------
+    def put(self, ref: tuple[str, int], label: dict, keys: set[str]):
+        with self._lock:
+            self._remove(ref)
+            self._labels[ref] = label
+            self._key_sets[ref] = keys
+            for key in keys:
+                insort(self._entries, (key, ref))
+
+    def remove(self, ref: tuple[str, int]):
+        with self._lock:
+            self._remove(ref)
+
+    def _remove(self, ref):
+        self._labels.pop(ref, None)
+        for key in self._key_sets.pop(ref, ()):
+            i = bisect_left(self._entries, (key, ref))
+            if i < len(self._entries) and self._entries[i] == (key, ref):
+                del self._entries[i]
+
+    # ---------- lookups ----------
+    def lookup(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+        """Up to ``limit`` distinct suggestions whose keys start with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        results, seen = [], set()
+        with self._lock:
+            entries = self._entries
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and len(results) < limit:
+                key, ref = entries[i]
+                if not key.startswith(prefix):
+                    break
+                if ref not in seen:
+                    seen.add(ref)
+                    results.append(self._labels[ref])
+                i += 1
+        return results
+
+
+class SuggestIndex:
+    """The process-wide PrefixIndex, loaded from the database on first use."""
+
+    def __init__(self, ttl: int = SUGGEST_TTL, recheck: int = SUGGEST_RECHECK):
+        self.ttl = ttl
+        self.recheck = recheck
+        self._lock = threading.Lock()
+        self._index: PrefixIndex | None = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._version = None
+
+    def invalidate(self):
+        self._index = None
+
+    def _stale(self) -> bool:
+        if self._index is None:
+            return True
+        now = time.monotonic()
+        if now - self._loaded_at > self.ttl:
+            return True
+        if now - self._checked_at > self.recheck:
+            self._checked_at = now
+            return catalog_version() != self._version
+        return False
+
+    def _get(self) -> PrefixIndex:
+        index = self._index
+        if not self._stale():
+            return index
+        with self._lock:
+            if self._index is not None and self._index is not index:
+                return self._index  # another thread reloaded it meanwhile
+            version = catalog_version()
+            index = PrefixIndex()
+            index.load(
+                Product.objects.filter(is_active=True)
+                .values("id", "name", "sku", "slug")
+                .iterator(chunk_size=2000),
+                Brand.objects.values("id", "name", "slug"),
+            )
+            self._index, self._version = index, version
+            self._loaded_at = self._checked_at = time.monotonic()
+        return index
+
+    def lookup(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+        return self._get().lookup(prefix, limit)
+
+    # Signal hooks (run on commit): only touch an index this process has
+    # already loaded.
+    def product_changed(self, product):
+        index = self._index
+        if index is None:
+            return
+        ref = (PRODUCT, product.pk)
+        if not product.is_active:
+            index.remove(ref)
+            return
+        index.put(
+            ref,
+            {"type": "product", "name": product.name, "sku": product.sku, "slug": product.slug},
+            product_keys(product.name, product.sku),
+        )
+
+    def product_deleted(self, product_id):
+        if self._index is not None:
+            self._index.remove((PRODUCT, product_id))
+
+    def brand_changed(self, brand):
+        if self._index is not None:
+            self._index.put(
+                (BRAND, brand.pk),
+                {"type": "brand", "name": brand.name, "slug": brand.slug},
+                {normalize(brand.name)} - {""},
+            )
+
+    def brand_deleted(self, brand_id):
+        if self._index is not None:
+            self._index.remove((BRAND, brand_id))
+
+
+suggestions = SuggestIndex()
@@ -0,0 +1,52 @@
+# catalog/templatetags/catalog_tags.py
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from catalog.images import SOURCE_PREFIX, load_manifest
+from catalog.registry import registry
+
+register = template.Library()
+
+
+@register.filter
+def brand_name(brand_id):
+    """Brand name from the in-process registry (no select_related needed)."""
+    return registry.brand_name(brand_id)
+
+
+@register.filter
+def category_name(category_id):
+    return registry.category_name(category_id)
+
+
+@register.simple_tag
+def product_image(sku, alt="", sizes="100vw", css_class="img-fluid", loading="lazy", style=""):
+    """
+    <picture> for a product image with WebP/JPEG srcsets from the derivative
+    manifest (catalog/images.py); a plain <img> of the original if none.
+    """
+    name = str(sku).lower()
+    attrs = format_html(
+        'alt="{}"{}{}{}',
+        alt,
+        format_html(' class="{}"', css_class) if css_class else "",
+        format_html(' loading="{}"', loading) if loading else "",
+        format_html(' style="{}"', style) if style else "",
+    )
+    entry = load_manifest().get(name)
+    if not entry:
+        return format_html('<img {} src="{}">', attrs, static(f"{SOURCE_PREFIX}/{name}.jpg"))
+
+    def srcset(fmt):
+        return ", ".join(f"{static(path)} {width}w" for width, path in entry[fmt].items())
+
+    widths = sorted(entry["jpeg"], key=int)
+    fallback = next((w for w in widths if int(w) >= 320), widths[-1])
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img {} src="{}" srcset="{}" sizes="{}" width="{}" height="{}"></picture>',
+        srcset("webp"), sizes,
+        attrs, static(entry["jpeg"][fallback]), srcset("jpeg"), sizes,
+        entry["width"], entry["height"],
+    )
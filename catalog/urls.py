@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = "catalog"
 
@@ -14,5 +14,11 @@ urlpatterns = [
     path("bag/", views.bag_detail, name="bag_detail"),
     path("bag/add/<str:sku>/", views.add_to_bag, name="add_to_bag"),
     path("bag/update/<str:sku>/", views.update_bag_qty, name="update_bag_qty"),
+    path("bag/batch/", views.update_bag_batch, name="update_bag_batch"),
     path("bag/remove/<str:sku>/", views.remove_from_bag, name="remove_from_bag"),
+
+    # JSON API
+    path("api/products/", api.product_feed, name="product_feed"),
+    path("api/suggest/", api.product_suggest, name="product_suggest"),
+    path("api/result-cache/", api.result_cache_stats, name="result_cache_stats"),
 ]
@@ -1,51 +1,97 @@
 # catalog/views.py
-from decimal import Decimal
+import json
 
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_http_methods
 
+from .bag import get_bag
+from .carts import get_cart
 from .forms import ProductForm
+from .cards import render_cards
+from .conditional import not_modified, page_validators, set_validators
+from .counts import listing_count
+from .facets import facet_counts
+from .listing import (
+    PAGE_SIZE,
+    listing_ordering,
+    listing_params,
+    listing_querystring,
+    listing_queryset,
+)
 from .models import Product
+from .pagination import CountedPaginator, KeysetPage, KeysetPaginator
+from .registry import registry
+from .results import search_page
+from .rows import as_rows
+
+BAG_BATCH_LIMIT = 100
 
 
 # ---------- Public: list & detail ----------
 def product_list(request):
-    qs = Product.objects.select_related("brand", "category").all()
-
-    q = request.GET.get("q")
-    if q:
-        qs = qs.filter(
-            Q(name__icontains=q)
-            | Q(sku__icontains=q)
-            | Q(brand__name__icontains=q)
-        )
-
-    cat = request.GET.get("cat")
-    if cat:
-        qs = qs.filter(category__slug=cat)
-
-    sort = request.GET.get("sort")
-    direction = request.GET.get("direction")
-    allowed = {"price": "price", "name": "name"}
-    field = allowed.get(sort)
-    if field:
-        qs = qs.order_by(f"-{field}" if direction == "desc" else field)
-
-    paginator = Paginator(qs, 12)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    params = listing_params(request.GET)
+    qs = listing_queryset(params)
+    ordering = listing_ordering(params)
+    count, count_is_estimate = listing_count(qs, params)
+    qs = as_rows(qs)  # slim __slots__ rows: no description, no model state
+
+    # Keyset mode: constant cost per page, no COUNT(*). Relevance-ranked
+    # search results stay on offset paging (the rank is not a stable key).
+    # An estimated count only labels the page ("about N"): offset paging
+    # would clamp to it or show empty pages, so those listings always page
+    # by keyset (they are never ranked searches).
+    keyset = settings.CATALOG_PAGINATION == "keyset" or count_is_estimate
+    if keyset and "-search_rank" not in ordering:
+        paginator = KeysetPaginator(qs, ordering, PAGE_SIZE, count=count)
+        token = request.GET.get("cursor")
+    else:
+        paginator = CountedPaginator(qs.order_by(*ordering), PAGE_SIZE, count=count)
+        token = request.GET.get("page")
+    # Hot search terms come back to the same pages: reuse their result ids.
+    page_obj = search_page(paginator, params, token) if params["q"] else paginator.get_page(token)
+
+    # Validate before rendering: a matching ETag skips cards, facets and the template.
+    # No Last-Modified: deletions, new rows shifting onto the page and facet
+    # changes never show in the rows' updated_at, only in the catalog
+    # version the ETag is built on.
+    rows = list(page_obj.object_list)
+    etag, last_modified = page_validators(
+        request,
+        listing_querystring(params),
+        request.GET.get("cursor") or request.GET.get("page") or "",
+        count,
+        *(f"{p.pk}:{p.updated_at.timestamp()}" for p in rows),
+    )
+    response = not_modified(request, etag, last_modified)
+    if response is not None:
+        return set_validators(request, response, etag, last_modified)
 
     ctx = {
         "page_obj": page_obj,
+        "cards": render_cards(rows),
         "is_paginated": page_obj.has_other_pages(),
-        "active_cat": cat,
-        "sort": sort or "",
-        "direction": direction or "",
+        "is_keyset": isinstance(page_obj, KeysetPage),
+        "querystring": listing_querystring(params),
+        "count_is_estimate": count_is_estimate,
+        "facets": facet_counts(_facet_category(params)),
+        "params": params,
+        "active_cat": params["cat"],
+        "sort": params["sort"],
+        "direction": params["direction"],
     }
-    return render(request, "catalog/product_list.html", ctx)
+    response = render(request, "catalog/product_list.html", ctx)
+    return set_validators(request, response, etag, last_modified)
+
+
+def _facet_category(params):
+    """Category id for the facet counts: None = whole catalog, 0 = unknown slug."""
+    if not params["cat"]:
+        return None
+    return registry.category_id(params["cat"]) or 0
 
 
 def product_detail(request, slug):
@@ -53,7 +99,13 @@ def product_detail(request, slug):
         Product.objects.select_related("brand", "category"),
         slug=slug,
     )
-    return render(request, "catalog/product_detail.html", {"p": p})
+    etag, last_modified = page_validators(
+        request, p.pk, p.updated_at.timestamp(), p.stock, updated_at=p.updated_at
+    )
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = render(request, "catalog/product_detail.html", {"p": p})
+    return set_validators(request, response, etag, last_modified)
 
 
 # ---------- Staff guard ----------
@@ -116,44 +168,17 @@ def product_delete(request, slug):
 
 
 # ================================
-# Bag (session cart)
+# Bag (cart store, see catalog/carts.py)
 # ================================
-def _cart(request):
-    """Return (and create if missing) the session cart dict."""
-    return request.session.setdefault("cart", {})
-
-
 def bag_detail(request):
     """
-    Show current session bag with rows and subtotal.
+    Show current bag with rows and subtotal.
     """
-    cart = _cart(request)
-    skus = list(cart.keys())
-    products = {p.sku: p for p in Product.objects.filter(sku__in=skus)}
-    rows, subtotal = [], Decimal("0.00")
-
-    for sku, qty in cart.items():
-        p = products.get(sku)
-        if not p:
-            continue
-        unit = Decimal(p.price)
-        q = int(qty)
-        line = unit * q
-        rows.append(
-            {
-                "product": p,
-                "sku": sku,
-                "qty": q,
-                "unit": unit,
-                "line": line,
-            }
-        )
-        subtotal += line
-
+    bag = get_bag(request)
     ctx = {
-        "rows": rows,
-        "subtotal": subtotal.quantize(Decimal("0.01")),
-        "is_empty": len(rows) == 0,
+        "rows": bag.rows,
+        "subtotal": bag.subtotal,
+        "is_empty": bag.is_empty,
     }
     return render(request, "catalog/bag.html", ctx)
 
@@ -170,9 +195,7 @@ def add_to_bag(request, sku):
         messages.warning(request, "That item is currently out of stock.")
         return redirect("catalog:product_detail", slug=p.slug)
 
-    cart = _cart(request)
-    cart[sku] = int(cart.get(sku, 0)) + 1
-    request.session.modified = True
+    get_cart(request).add(sku, 1)
 
     messages.success(request, f'Added “{p.name}” to your bag.')
     return redirect("catalog:bag_detail")
@@ -183,28 +206,72 @@ def update_bag_qty(request, sku):
     """
     Set exact quantity (remove if <= 0).
     """
-    cart = _cart(request)
     try:
         qty = int(request.POST.get("qty", "1"))
     except ValueError:
         qty = 1
 
+    get_cart(request).set(sku, qty)
     if qty <= 0:
-        cart.pop(sku, None)
         messages.info(request, "Item removed.")
     else:
-        cart[sku] = qty
         messages.success(request, "Quantity updated.")
 
-    request.session.modified = True
     return redirect("catalog:bag_detail")
 
 
+@require_http_methods(["POST"])
+def update_bag_batch(request):
+    """
+    Apply a JSON object of {sku: qty} changes (qty <= 0 removes) in one cart
+    write and return the updated bag as JSON. Every SKU being set is checked
+    in one query; if any change is rejected, nothing is applied.
+    """
+    try:
+        changes = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Body must be a JSON object of {sku: qty}."}, status=400)
+    if not isinstance(changes, dict) or not changes or len(changes) > BAG_BATCH_LIMIT:
+        return JsonResponse(
+            {"error": f"Send between 1 and {BAG_BATCH_LIMIT} {{sku: qty}} changes."}, status=400
+        )
+
+    quantities, errors = {}, {}
+    for sku, qty in changes.items():
+        if isinstance(qty, bool) or not isinstance(qty, (int, str)):
+            errors[sku] = "Quantity must be a whole number."
+            continue
+        try:
+            quantities[sku] = int(qty)
+        except ValueError:
+            errors[sku] = "Quantity must be a whole number."
+
+    wanted = [sku for sku, qty in quantities.items() if qty > 0]
+    stock = dict(
+        Product.objects.filter(sku__in=wanted, is_active=True).values_list("sku", "stock")
+    )
+    for sku in wanted:
+        if sku not in stock:
+            errors[sku] = "Unknown or unavailable product."
+        elif stock[sku] <= 0:
+            errors[sku] = "Out of stock."
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+
+    get_cart(request).set_many(quantities)
+    bag = get_bag(request)
+    return JsonResponse({
+        "count": bag.count,
+        "total": bag.total,
+        "lines": [
+            {"sku": r["sku"], "qty": r["qty"], "unit": r["unit"], "line": r["line"]}
+            for r in bag.rows
+        ],
+    })
+
+
 @require_http_methods(["POST"])
 def remove_from_bag(request, sku):
-    cart = _cart(request)
-    if sku in cart:
-        cart.pop(sku)
-        request.session.modified = True
+    if get_cart(request).remove(sku):
         messages.info(request, "Item removed.")
     return redirect("catalog:bag_detail")
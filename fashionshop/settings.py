@@ -74,6 +74,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "catalog.middleware.CartCookieMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
@@ -97,6 +98,7 @@ TEMPLATES = [
                 "django.template.context_processors.media",
                 # custom
                 "catalog.context_processors.bag_summary",
+                "catalog.context_processors.catalog_nav",
             ],
         },
     },
@@ -177,6 +179,60 @@ STORAGES = {
     }
 }
 
+# -----------------------------------------------------
+# Cache
+# -----------------------------------------------------
+# The catalog version stamp (catalog/cache.py) and everything keyed by it
+# should be shared by all worker processes, so production wants REDIS_URL.
+# Without it the cache is per-process: a catalog change only invalidates
+# the worker that made it, and the others catch up as their entries expire
+# (system check catalog.W001 warns when DEBUG is off).
+REDIS_URL = os.getenv("REDIS_URL", "").strip()
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# -----------------------------------------------------
+# Catalog
+# -----------------------------------------------------
+# "keyset" (cursor links, no COUNT/OFFSET) or "offset" (?page=N)
+CATALOG_PAGINATION = os.getenv("CATALOG_PAGINATION", "keyset").lower()
+# Above this many rows, unfiltered/category listings on Postgres use planner estimates
+# (shown as "about N"; such listings page by keyset even in "offset" mode)
+CATALOG_COUNT_ESTIMATE_THRESHOLD = int(os.getenv("CATALOG_COUNT_ESTIMATE_THRESHOLD", "10000"))
+# Per-process LRU of recent search result pages (0 disables it)
+CATALOG_RESULT_CACHE_SIZE = int(os.getenv("CATALOG_RESULT_CACHE_SIZE", "500"))
+CATALOG_RESULT_CACHE_TTL = int(os.getenv("CATALOG_RESULT_CACHE_TTL", "300"))
+# Where bags live: "session" (default), "db" (cart_line rows) or "cache" (atomic counters)
+CART_STORE = os.getenv("CART_STORE", "session").lower()
+CART_CACHE_ALIAS = os.getenv("CART_CACHE_ALIAS", "default")
+# Keep anonymous carts in a signed cookie (no session writes) until login/checkout
+CART_ANONYMOUS_COOKIE = os.getenv("CART_ANONYMOUS_COOKIE", "false").lower() in {"1", "true", "yes"}
+CART_COOKIE_NAME = "fs_cart"
+CART_COOKIE_AGE = 60 * 60 * 24 * 30
+CART_COOKIE_MAX_BYTES = 3000
+
+# -----------------------------------------------------
+# Orders
+# -----------------------------------------------------
+# Re-submitting the same cart within this many seconds returns the pending order
+CHECKOUT_IDEMPOTENCY_WINDOW = int(os.getenv("CHECKOUT_IDEMPOTENCY_WINDOW", "600"))
+# cancel_stale_orders cancels pending orders older than this many seconds, releasing
+# their reserved stock; Stripe Checkout sessions expire after STRIPE_CHECKOUT_TTL
+# (Stripe's minimum is 30 minutes), so keep it at least that long
+PENDING_ORDER_TTL = int(os.getenv("PENDING_ORDER_TTL", str(60 * 60)))
+STRIPE_CHECKOUT_TTL = 60 * 30
+
 # -----------------------------------------------------
 # i18n / tz
 # -----------------------------------------------------
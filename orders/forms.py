@@ -1,8 +1,10 @@
 # orders/forms.py
+import re
+
 from django import forms
 from django.forms import ModelForm
 from .models import Order
-from .services import allowed_next_statuses
+from .services import ALLOWED_TRANSITIONS, BULK_STATUS_LIMIT, allowed_next_statuses
 
 class CheckoutDetailsForm(ModelForm):
     class Meta:
@@ -49,4 +51,29 @@ class OrderStatusForm(forms.Form):
         choices = [(s, s.title()) for s in allowed_next_statuses(order.status)]
         self.fields["to_status"].choices = choices
         if not choices:
-            self.fields["to_status"].widget.attrs["disabled"] = True
\ No newline at end of file
+            self.fields["to_status"].widget.attrs["disabled"] = True
+
+
+class BulkOrderStatusForm(forms.Form):
+    order_ids = forms.CharField(
+        label="Order numbers",
+        help_text="Separated by spaces, commas or new lines.",
+        widget=forms.Textarea(attrs={"class": "form-control form-control-sm", "rows": 4}),
+    )
+    to_status = forms.ChoiceField(
+        label="New status",
+        choices=[(s, s.title()) for s in sorted(set().union(*ALLOWED_TRANSITIONS.values()))],
+        widget=forms.Select(attrs={"class": "form-control form-control-sm"}),
+    )
+
+    def clean_order_ids(self):
+        tokens = [t.lstrip("#") for t in re.split(r"[\s,;]+", self.cleaned_data["order_ids"]) if t]
+        bad = [t for t in tokens if not t.isdigit()]
+        if bad:
+            raise forms.ValidationError(f"Not order numbers: {', '.join(bad[:10])}")
+        ids = list(dict.fromkeys(int(t) for t in tokens))
+        if not ids:
+            raise forms.ValidationError("Enter at least one order number.")
+        if len(ids) > BULK_STATUS_LIMIT:
+            raise forms.ValidationError(f"At most {BULK_STATUS_LIMIT} orders per batch.")
+        return ids
@@ -0,0 +1,20 @@
+# orders/management/commands/cancel_stale_orders.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.services import cancel_stale_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Cancel pending orders older than PENDING_ORDER_TTL, putting their reserved stock back. "
+        "Run it periodically (e.g. hourly)."
+    )
+
+    def handle(self, *args, **options):
+        result = cancel_stale_orders(timedelta(seconds=settings.PENDING_ORDER_TTL))
+        for pk, reason in sorted(result["failed"].items()):
+            self.stderr.write(f"Order #{pk}: {reason}")
+        self.stdout.write(self.style.SUCCESS(f"Cancelled {result['cancelled']} stale pending orders."))
@@ -0,0 +1,17 @@
+# orders/management/commands/purge_checkout_claims.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from orders.models import CheckoutClaim
+
+
+class Command(BaseCommand):
+    help = "Delete checkout claims older than CHECKOUT_IDEMPOTENCY_WINDOW (they can no longer be reused)."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=settings.CHECKOUT_IDEMPOTENCY_WINDOW)
+        deleted, _ = CheckoutClaim.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} checkout claims."))
@@ -0,0 +1,14 @@
+# orders/management/commands/rebuild_sales_summary.py
+from django.core.management.base import BaseCommand
+
+from orders.sales import rebuild_sales_summary
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily sales, order status counts and product sales summary tables from the order tables."
+
+    def handle(self, *args, **options):
+        days, statuses, products = rebuild_sales_summary()
+        self.stdout.write(self.style.SUCCESS(
+            f"Sales summary rebuilt ({days} days, {statuses} statuses, {products} products)."
+        ))
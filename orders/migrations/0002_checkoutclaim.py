@@ -0,0 +1,52 @@
+# Generated by Django 4.2.23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+# The fashionshop schema (and its order table) is managed outside this
+# app's migration state, so the table is created with SQL.
+CREATE_SQL = r"""
+CREATE TABLE IF NOT EXISTS "fashionshop"."checkout_claim" (
+    id bigserial PRIMARY KEY,
+    fingerprint varchar(64) NOT NULL,
+    order_id bigint NULL REFERENCES "fashionshop"."order"(id) ON DELETE CASCADE,
+    created_at timestamptz NOT NULL,
+    CONSTRAINT checkout_claim_fingerprint_uniq UNIQUE (fingerprint)
+);
+CREATE INDEX IF NOT EXISTS checkout_claim_created_at_idx
+    ON "fashionshop"."checkout_claim" (created_at);
+"""
+
+DROP_SQL = r"""
+DROP TABLE IF EXISTS "fashionshop"."checkout_claim";
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_SQL,
+            reverse_sql=DROP_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name="CheckoutClaim",
+                    fields=[
+                        ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                        ("fingerprint", models.CharField(db_column="fingerprint", max_length=64, unique=True)),
+                        ("created_at", models.DateTimeField(db_column="created_at", default=django.utils.timezone.now)),
+                        ("order", models.ForeignKey(blank=True, db_column="order_id", null=True, on_delete=django.db.models.deletion.CASCADE, related_name="+", to="orders.order")),
+                    ],
+                    options={
+                        "db_table": '"fashionshop"."checkout_claim"',
+                        "managed": True,
+                    },
+                ),
+            ],
+        ),
+    ]
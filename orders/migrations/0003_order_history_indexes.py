@@ -0,0 +1,30 @@
+# orders/migrations/0003_order_history_indexes.py
+from django.db import migrations
+
+# The fashionshop tables are unmanaged, so the indexes behind "My orders"
+# (orders.services.order_history_queryset) are plain SQL. They are built
+# CONCURRENTLY (outside a transaction, hence atomic = False) so checkout
+# keeps writing to these live tables meanwhile. A build that fails leaves
+# an INVALID index behind: drop it before re-running the migration.
+# (name, table, columns)
+INDEXES = [
+    ("order_user_created_idx", '"fashionshop"."order"', "user_id, created_at DESC, id DESC"),
+    ("order_item_order_idx", '"fashionshop"."order_item"', "order_id"),
+    ("payment_order_created_idx", '"fashionshop"."payment"', "order_id, created_at DESC, id DESC"),
+]
+
+CREATE_SQL = [f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({cols});" for name, table, cols in INDEXES]
+DROP_SQL = [f'DROP INDEX CONCURRENTLY IF EXISTS "fashionshop".{name};' for name, _, _ in INDEXES]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("orders", "0002_checkoutclaim"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_SQL, reverse_sql=DROP_SQL),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Like checkout_claim, these live in the fashionshop schema, which is
+# managed outside this app's migration state.
+CREATE_SQL = r"""
+CREATE TABLE IF NOT EXISTS "fashionshop"."sales_daily" (
+    id bigserial PRIMARY KEY,
+    day date NOT NULL,
+    orders integer NOT NULL DEFAULT 0,
+    paid_orders integer NOT NULL DEFAULT 0,
+    revenue numeric(12, 2) NOT NULL DEFAULT 0,
+    CONSTRAINT sales_daily_day_uniq UNIQUE (day)
+);
+CREATE TABLE IF NOT EXISTS "fashionshop"."order_status_count" (
+    id bigserial PRIMARY KEY,
+    status varchar(20) NOT NULL,
+    count integer NOT NULL DEFAULT 0,
+    CONSTRAINT order_status_count_status_uniq UNIQUE (status)
+);
+CREATE TABLE IF NOT EXISTS "fashionshop"."product_sales" (
+    id bigserial PRIMARY KEY,
+    product_id bigint NOT NULL REFERENCES product(id) ON DELETE CASCADE,
+    units integer NOT NULL DEFAULT 0,
+    revenue numeric(12, 2) NOT NULL DEFAULT 0,
+    CONSTRAINT product_sales_product_uniq UNIQUE (product_id)
+);
+CREATE INDEX IF NOT EXISTS product_sales_units_idx
+    ON "fashionshop"."product_sales" (units DESC, revenue DESC);
+"""
+
+DROP_SQL = r"""
+DROP TABLE IF EXISTS "fashionshop"."product_sales";
+DROP TABLE IF EXISTS "fashionshop"."order_status_count";
+DROP TABLE IF EXISTS "fashionshop"."sales_daily";
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0009_cartline"),
+        ("orders", "0003_order_history_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_SQL,
+            reverse_sql=DROP_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name="SalesDaily",
+                    fields=[
+                        ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                        ("day", models.DateField(db_column="day", unique=True)),
+                        ("orders", models.IntegerField(db_column="orders", default=0)),
+                        ("paid_orders", models.IntegerField(db_column="paid_orders", default=0)),
+                        ("revenue", models.DecimalField(db_column="revenue", decimal_places=2, default=0, max_digits=12)),
+                    ],
+                    options={
+                        "db_table": '"fashionshop"."sales_daily"',
+                        "ordering": ["-day"],
+                        "managed": True,
+                    },
+                ),
+                migrations.CreateModel(
+                    name="OrderStatusCount",
+                    fields=[
+                        ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                        ("status", models.CharField(db_column="status", max_length=20, unique=True)),
+                        ("count", models.IntegerField(db_column="count", default=0)),
+                    ],
+                    options={
+                        "db_table": '"fashionshop"."order_status_count"',
+                        "managed": True,
+                    },
+                ),
+                migrations.CreateModel(
+                    name="ProductSales",
+                    fields=[
+                        ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                        ("units", models.IntegerField(db_column="units", default=0)),
+                        ("revenue", models.DecimalField(db_column="revenue", decimal_places=2, default=0, max_digits=12)),
+                        ("product", models.OneToOneField(db_column="product_id", on_delete=django.db.models.deletion.CASCADE, related_name="+", to="catalog.product")),
+                    ],
+                    options={
+                        "db_table": '"fashionshop"."product_sales"',
+                        "managed": True,
+                    },
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# orders/migrations/0005_order_stock_reserved.py
+from django.db import migrations, models
+
+# Orders placed before checkout reserved stock never took units out, so
+# existing rows default to false and cancelling them releases nothing.
+# The partial index serves the cancel_stale_orders sweep; like 0003 it is
+# built CONCURRENTLY (atomic = False) so checkout is not blocked meanwhile.
+CREATE_SQL = [
+    'ALTER TABLE "fashionshop"."order" ADD COLUMN IF NOT EXISTS stock_reserved boolean NOT NULL DEFAULT false;',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS order_pending_created_idx ON "fashionshop"."order" (created_at) '
+    "WHERE status = 'pending';",
+]
+DROP_SQL = [
+    'DROP INDEX CONCURRENTLY IF EXISTS "fashionshop".order_pending_created_idx;',
+    'ALTER TABLE "fashionshop"."order" DROP COLUMN IF EXISTS stock_reserved;',
+]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("orders", "0004_sales_summary"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_SQL,
+            reverse_sql=DROP_SQL,
+            state_operations=[
+                migrations.AddField(
+                    model_name="order",
+                    name="stock_reserved",
+                    field=models.BooleanField(db_column="stock_reserved", default=False),
+                ),
+            ],
+        ),
+    ]
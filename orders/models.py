@@ -40,6 +40,8 @@ class Order(models.Model):
     status = models.CharField(max_length=20, db_column="status", default="pending")
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, db_column="total_amount")
     created_at = models.DateTimeField(db_column="created_at", default=timezone.now, editable=False)
+    # True once checkout took the ordered units out of stock (see orders.services)
+    stock_reserved = models.BooleanField(db_column="stock_reserved", default=False)
 
     # Buyer & shipping (nullable in DB)
     buyer_name = models.TextField(db_column="buyer_name", blank=True, null=True)
@@ -150,3 +152,75 @@ class OrderStatusHistory(models.Model):
 
     def __str__(self):
         return f"Order #{self.order_id}: {self.from_status} → {self.to_status}"
+
+
+class CheckoutClaim(models.Model):
+    """
+    Managed by Django (our own table) – one row per cart fingerprint,
+    pointing at the order its latest checkout created. The unique
+    fingerprint serializes concurrent identical checkouts.
+    """
+    fingerprint = models.CharField(max_length=64, unique=True, db_column="fingerprint")
+    order = models.ForeignKey(
+        "Order", null=True, blank=True, on_delete=models.CASCADE,
+        related_name="+", db_column="order_id"
+    )
+    created_at = models.DateTimeField(default=timezone.now, db_column="created_at")
+
+    class Meta:
+        db_table = f'"{SCHEMA}"."checkout_claim"'
+        managed = True
+
+    def __str__(self):
+        return f"{self.fingerprint[:12]} → order #{self.order_id}"
+
+
+# ----- Sales summary (orders/sales.py) ----------------------------------
+
+class SalesDaily(models.Model):
+    """
+    Managed by Django (our own table) – orders placed and orders paid (with
+    their revenue) per local day, maintained incrementally by orders.sales.
+    """
+    day = models.DateField(unique=True, db_column="day")
+    orders = models.IntegerField(default=0, db_column="orders")
+    paid_orders = models.IntegerField(default=0, db_column="paid_orders")
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0, db_column="revenue")
+
+    class Meta:
+        db_table = f'"{SCHEMA}"."sales_daily"'
+        managed = True
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.day}: {self.orders} orders, £{self.revenue}"
+
+
+class OrderStatusCount(models.Model):
+    """Managed by Django (our own table) – number of orders currently in each status."""
+    status = models.CharField(max_length=20, unique=True, db_column="status")
+    count = models.IntegerField(default=0, db_column="count")
+
+    class Meta:
+        db_table = f'"{SCHEMA}"."order_status_count"'
+        managed = True
+
+    def __str__(self):
+        return f"{self.status}: {self.count}"
+
+
+class ProductSales(models.Model):
+    """Managed by Django (our own table) – units and revenue per product over paid orders."""
+    product = models.OneToOneField(
+        "catalog.Product", on_delete=models.CASCADE,
+        related_name="+", db_column="product_id"
+    )
+    units = models.IntegerField(default=0, db_column="units")
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0, db_column="revenue")
+
+    class Meta:
+        db_table = f'"{SCHEMA}"."product_sales"'
+        managed = True
+
+    def __str__(self):
+        return f"{self.product_id}: {self.units} units, £{self.revenue}"
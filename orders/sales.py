@@ -0,0 +1,186 @@
+# orders/sales.py
+"""
+Sales summary for the staff dashboard.
+
+Three small tables answer "revenue today / orders by status / top
+products" without scanning order, order_item or payment:
+
+    SalesDaily        orders placed, orders paid and paid revenue per local day
+    OrderStatusCount  orders currently in each status
+    ProductSales      units and revenue per product over paid orders
+
+The order services apply deltas inside their own transactions
+(``order_placed`` from create_order_from_cart, ``status_changed`` from
+set_order_status, which record_payment goes through, and
+``statuses_changed`` from bulk_set_order_status), each as one
+INSERT ... ON CONFLICT DO UPDATE. ``python manage.py rebuild_sales_summary``
+recomputes everything from scratch (run it once after deploying).
+
+A paid order counts on the local day of its "paid" history row, which is
+also the day the rebuild reads. On PostgreSQL the writers hold a shared
+advisory lock and the rebuild holds it exclusively. A rebuild therefore
+waits for in-flight orders and they wait for it, and no delta is counted
+twice or lost.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    Order,
+    OrderItem,
+    OrderStatusCount,
+    OrderStatusHistory,
+    ProductSales,
+    SalesDaily,
+)
+
+# Statuses whose items count as sold (orders only get there through "paid").
+SOLD_STATUSES = ("paid", "shipped", "delivered")
+DASHBOARD_DAYS = 30
+TOP_PRODUCTS = 10
+# pg_advisory_xact_lock key shared by the incremental writers and the rebuild
+SUMMARY_LOCK_KEY = 0x5A1E5
+
+
+def _lock_summary(exclusive: bool = False) -> None:
+    """Take the summary lock until the transaction ends (PostgreSQL only)."""
+    if connection.vendor != "postgresql":
+        return
+    fn = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT {fn}(%s)", [SUMMARY_LOCK_KEY])
+
+
+def _add(model, key_col: str, rows: list[dict]) -> None:
+    """
+    Add each row's values onto the matching summary row (created if
+    missing) in one statement. ``key_col`` is the unique column; every
+    other column in the rows is an additive counter.
+    """
+    if not rows:
+        return
+    table = model._meta.db_table
+    cols = list(rows[0])
+    counters = [c for c in cols if c != key_col]
+    values = ", ".join(["(" + ", ".join(["%s"] * len(cols)) + ")"] * len(rows))
+    sets = ", ".join(f"{c} = t.{c} + EXCLUDED.{c}" for c in counters)
+    with connection.cursor() as cur:
+        cur.execute(
+            f"INSERT INTO {table} AS t ({', '.join(cols)}) VALUES {values} "
+            f"ON CONFLICT ({key_col}) DO UPDATE SET {sets}",
+            [row[c] for row in rows for c in cols],
+        )
+
+
+# ---------- Incremental updates ----------
+
+def order_placed(order: Order) -> None:
+    _lock_summary()
+    _add(SalesDaily, "day", [
+        {"day": timezone.localdate(order.created_at), "orders": 1, "paid_orders": 0, "revenue": Decimal("0")}
+    ])
+    _add(OrderStatusCount, "status", [{"status": order.status, "count": 1}])
+
+
+def status_changed(order: Order, from_status: str, to_status: str, at: datetime) -> None:
+    statuses_changed([(order, from_status, at)], to_status)
+
+
+def statuses_changed(moves: list[tuple[Order, str, datetime]], to_status: str) -> None:
+    """
+    Apply a batch of (order, from_status, at) → to_status moves in a fixed
+    number of statements; ``at`` is the move's history row ``created_at``.
+    """
+    if not moves:
+        return
+    _lock_summary()
+    counts: dict[str, int] = {to_status: len(moves)}
+    for _order, from_status, _at in moves:
+        counts[from_status] = counts.get(from_status, 0) - 1
+    _add(OrderStatusCount, "status", [{"status": k, "count": n} for k, n in counts.items() if n])
+    if to_status != "paid":
+        return
+
+    days: dict = {}
+    for order, _from_status, at in moves:
+        row = days.setdefault(
+            timezone.localdate(at), {"orders": 0, "paid_orders": 0, "revenue": Decimal("0.00")}
+        )
+        row["paid_orders"] += 1
+        row["revenue"] += Order.q2(order.total_amount)
+    _add(SalesDaily, "day", [{"day": day, **row} for day, row in days.items()])
+    per_product: dict[int, dict] = {}
+    for product_id, qty, price in OrderItem.objects.filter(
+        order_id__in=[order.pk for order, _, _ in moves]
+    ).values_list("product_id", "quantity", "price_each"):
+        row = per_product.setdefault(product_id, {"product_id": product_id, "units": 0, "revenue": Decimal("0")})
+        row["units"] += qty
+        row["revenue"] += Order.q2(Decimal(price) * qty)
+    _add(ProductSales, "product_id", list(per_product.values()))
+
+
+# ---------- Rebuild ----------
+
+@transaction.atomic
+def rebuild_sales_summary() -> tuple[int, int, int]:
+    """Recompute all three tables from the order tables; returns their row counts."""
+    _lock_summary(exclusive=True)
+    days: dict = {}
+    placed = (
+        Order.objects.annotate(d=TruncDate("created_at"))
+        .values("d").annotate(n=Count("id")).order_by()
+    )
+    for row in placed:
+        days.setdefault(row["d"], SalesDaily(day=row["d"])).orders = row["n"]
+    paid = (
+        OrderStatusHistory.objects.filter(to_status="paid")
+        .annotate(d=TruncDate("created_at"))
+        .values("d").annotate(n=Count("id"), revenue=Sum("order__total_amount")).order_by()
+    )
+    for row in paid:
+        day = days.setdefault(row["d"], SalesDaily(day=row["d"]))
+        day.paid_orders, day.revenue = row["n"], row["revenue"] or 0
+
+    statuses = [
+        OrderStatusCount(status=row["status"], count=row["n"])
+        for row in Order.objects.values("status").annotate(n=Count("id")).order_by()
+    ]
+    line_total = ExpressionWrapper(F("quantity") * F("price_each"), output_field=DecimalField())
+    products = [
+        ProductSales(product_id=row["product_id"], units=row["units"], revenue=row["revenue"])
+        for row in OrderItem.objects.filter(order__status__in=SOLD_STATUSES)
+        .values("product_id")
+        .annotate(units=Sum("quantity"), revenue=Sum(line_total))
+        .order_by()
+    ]
+
+    for model, objs in ((SalesDaily, days.values()), (OrderStatusCount, statuses), (ProductSales, products)):
+        model.objects.all().delete()
+        model.objects.bulk_create(objs, batch_size=1000)
+    return len(days), len(statuses), len(products)
+
+
+# ---------- Reading ----------
+
+def dashboard_data(days: int = DASHBOARD_DAYS, top: int = TOP_PRODUCTS) -> dict:
+    """Everything the dashboard shows, as three small summary-table queries."""
+    today = timezone.localdate()
+    daily = list(SalesDaily.objects.filter(day__gt=today - timedelta(days=days)).order_by("-day"))
+    return {
+        "days": days,
+        "today": next((d for d in daily if d.day == today), SalesDaily(day=today)),
+        "daily": daily,
+        "period_revenue": sum((d.revenue for d in daily), Decimal("0.00")),
+        "period_orders": sum(d.orders for d in daily),
+        "statuses": list(OrderStatusCount.objects.filter(count__gt=0).order_by("status")),
+        "top_products": list(
+            ProductSales.objects.select_related("product").order_by("-units", "-revenue")[:top]
+        ),
+    }
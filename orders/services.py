@@ -1,22 +1,47 @@
 # orders/services.py
 from __future__ import annotations
 
+import hashlib
+from datetime import timedelta
 from decimal import Decimal
 from typing import Iterable, Mapping, Optional
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction, connection
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Sum, When
+from django.db.models.functions import Coalesce, Now
 from django.utils import timezone
 
+from catalog import facets
+from catalog.cache import bump_catalog_version
 from catalog.models import Product
-from .models import AppUser, Order, OrderItem, Payment, OrderStatusHistory
+from catalog.results import result_cache
+from . import sales
+from .models import AppUser, CheckoutClaim, Order, OrderItem, Payment, OrderStatusHistory
 
 # ----- AppUser helpers -------------------------------------------------
+#
+# Checkout resolves the Django user to an app_user id on every order. The
+# mapping is kept in the session and the cache (keyed by Django user id,
+# together with the email/full name it was written with), so the upsert
+# only runs when those change. The guest id is cached the same way, under
+# one key for all workers. Both are only stored once the writing
+# transaction commits, so a rolled-back upsert cannot leave a dangling id
+# behind; the timeout bounds how long a deleted row's id can linger.
 
-def ensure_app_user_for_django_user(dj_user) -> Optional[AppUser]:
-    """
-    Upsert a row in fashionshop.app_user for the given Django user (by email)
-    and return an AppUser(id=...). Returns None if user is not authenticated or has no email.
-    """
+APP_USER_SESSION_KEY = "app_user"
+APP_USER_CACHE_TIMEOUT = 60 * 60 * 24
+GUEST_EMAIL = "guest@fashionshop.local"
+GUEST_CACHE_KEY = "orders:app_user:guest"
+
+
+def _app_user_cache_key(dj_user) -> str:
+    return f"orders:app_user:{dj_user.pk}"
+
+
+def _app_user_profile(dj_user) -> Optional[dict]:
+    """{"user", "email", "full_name"} for an authenticated user with an email, else None."""
     if not getattr(dj_user, "is_authenticated", False):
         return None
 
@@ -29,7 +54,41 @@ def ensure_app_user_for_django_user(dj_user) -> Optional[AppUser]:
         full_name = dj_user.get_full_name() or ""
     if not full_name and hasattr(dj_user, "get_username"):
         full_name = dj_user.get_username() or ""
-    full_name = full_name.strip()
+    return {"user": dj_user.pk, "email": email, "full_name": full_name.strip()}
+
+
+def _stored_app_user(dj_user, profile: dict, session) -> Optional[AppUser]:
+    """The app_user the session or cache maps this email/name to, if any."""
+    stored = session.get(APP_USER_SESSION_KEY) if session is not None else None
+    if not _same_profile(stored, profile):
+        stored = cache.get(_app_user_cache_key(dj_user))
+        if _same_profile(stored, profile) and session is not None:
+            session[APP_USER_SESSION_KEY] = stored
+    return AppUser(id=stored["id"]) if _same_profile(stored, profile) else None
+
+
+def _remember_app_user(dj_user, entry: dict, session) -> None:
+    """Store the mapping in the cache and session once the current transaction commits."""
+    def remember():
+        cache.set(_app_user_cache_key(dj_user), entry, APP_USER_CACHE_TIMEOUT)
+        if session is not None:
+            session[APP_USER_SESSION_KEY] = entry
+
+    transaction.on_commit(remember)
+
+
+def ensure_app_user_for_django_user(dj_user, session=None) -> Optional[AppUser]:
+    """
+    Upsert a row in fashionshop.app_user for the given Django user (by email)
+    and return an AppUser(id=...). Returns None if user is not authenticated or has no email.
+    Skips the upsert when the session or cache already maps this email/name to an id.
+    """
+    profile = _app_user_profile(dj_user)
+    if profile is None:
+        return None
+    app_user = _stored_app_user(dj_user, profile, session)
+    if app_user is not None:
+        return app_user
 
     with connection.cursor() as cur:
         cur.execute(
@@ -40,19 +99,48 @@ def ensure_app_user_for_django_user(dj_user) -> Optional[AppUser]:
                 SET full_name = EXCLUDED.full_name
             RETURNING id;
             """,
-            [email, full_name],
+            [profile["email"], profile["full_name"]],
         )
         app_user_id = cur.fetchone()[0]
 
+    _remember_app_user(dj_user, {**profile, "id": app_user_id}, session)
     return AppUser(id=app_user_id)
 
 
+def find_app_user_for_django_user(dj_user, session=None) -> Optional[AppUser]:
+    """
+    Like ensure_app_user_for_django_user, but only reads: returns None when
+    no app_user row has the user's email yet (they never checked out), so
+    read-only pages never write.
+    """
+    profile = _app_user_profile(dj_user)
+    if profile is None:
+        return None
+    app_user = _stored_app_user(dj_user, profile, session)
+    if app_user is not None:
+        return app_user
+
+    row = AppUser.objects.filter(email=profile["email"]).values_list("id", "full_name").first()
+    if row is None:
+        return None
+    # Remember the stored name, so a changed name still gets upserted at checkout.
+    _remember_app_user(dj_user, {**profile, "full_name": row[1], "id": row[0]}, session)
+    return AppUser(id=row[0])
+
+
+def _same_profile(stored, profile) -> bool:
+    return bool(stored) and all(stored.get(k) == v for k, v in profile.items())
+
+
 def get_guest_app_user() -> AppUser:
     """
     Ensure a single reusable 'Guest' app_user exists for anonymous orders.
     Uses a stable email so ON CONFLICT can re-use it.
     """
-    guest_email = "guest@fashionshop.local"
+    guest_id = cache.get(GUEST_CACHE_KEY)
+    if guest_id is not None:
+        return AppUser(id=guest_id)
+
     with connection.cursor() as cur:
         cur.execute(
             """
@@ -60,70 +148,298 @@ def get_guest_app_user() -> AppUser:
             VALUES (%s, %s, NOW())
             ON CONFLICT (email) DO NOTHING;
             """,
-            [guest_email, "Guest"],
+            [GUEST_EMAIL, "Guest"],
         )
         # Fetch its id (exists now for sure).
         cur.execute(
             'SELECT id FROM "fashionshop"."app_user" WHERE email = %s LIMIT 1;',
-            [guest_email],
+            [GUEST_EMAIL],
         )
         row = cur.fetchone()
         if not row:
             raise RuntimeError("Could not create or find guest AppUser.")
-        return AppUser(id=row[0])
+    guest_id = row[0]
+    transaction.on_commit(lambda: cache.set(GUEST_CACHE_KEY, guest_id, APP_USER_CACHE_TIMEOUT))
+    return AppUser(id=guest_id)
 
 
-def _resolve_app_user(dj_user) -> AppUser:
+def _resolve_app_user(dj_user, session=None) -> AppUser:
     """
     Resolve to an AppUser row:
     - logged-in user → upsert by email (ensure_app_user_for_django_user)
     - anonymous → reusable guest AppUser
     """
-    app_user = ensure_app_user_for_django_user(dj_user)
+    app_user = ensure_app_user_for_django_user(dj_user, session)
     return app_user or get_guest_app_user()
 
+# ----- Stock reservation ------------------------------------------------
+
+class OutOfStockError(ValueError):
+    """Raised by create_order_from_cart; ``shortages`` maps each short SKU to the units left."""
+
+    def __init__(self, shortages):
+        self.shortages = dict(sorted(shortages.items()))
+        super().__init__(
+            "Not enough stock for: "
+            + ", ".join(f"{sku} ({left} left)" for sku, left in self.shortages.items())
+        )
+
+
+def _lock_products(**filters) -> list[dict]:
+    """
+    SELECT ... FOR UPDATE the matching products, always in id order so
+    concurrent checkouts of overlapping carts queue instead of deadlocking.
+    """
+    return list(
+        Product.objects.select_for_update()
+        .filter(**filters)
+        .order_by("id")
+        .values("id", "sku", *facets.TRACKED_FIELDS)
+    )
+
+
+def _apply_stock_deltas(locked: list[dict], deltas: dict[int, int]) -> None:
+    """
+    Add deltas[product_id] to the stock of already locked products in one
+    UPDATE. Decrements are conditional on enough stock remaining, so stock
+    never goes negative even if a caller skipped the check.
+    """
+    rows = [r for r in locked if deltas.get(r["id"])]
+    if not rows:
+        return
+    cond = Q()
+    for r in rows:
+        n = deltas[r["id"]]
+        cond |= Q(pk=r["id"], stock__gte=-n) if n < 0 else Q(pk=r["id"])
+    updated = Product.objects.filter(cond).update(
+        stock=Case(
+            *(When(pk=r["id"], then=F("stock") + deltas[r["id"]]) for r in rows),
+            default=F("stock"),
+            output_field=IntegerField(),
+        ),
+        updated_at=Now(),  # feeds the catalog pages' ETag / Last-Modified
+    )
+    if updated != len(rows):
+        raise OutOfStockError({r["sku"]: r["stock"] for r in rows})
+
+    # update() skips the product signals: keep the in/out-of-stock facet in step.
+    crossed = False
+    for r in rows:
+        after = {**r, "stock": r["stock"] + deltas[r["id"]]}
+        if (r["stock"] > 0) != (after["stock"] > 0):
+            facets.apply_change(r, after)
+            crossed = True
+    if crossed:
+        transaction.on_commit(_stock_availability_changed)
+
+
+def _stock_availability_changed() -> None:
+    bump_catalog_version()
+    result_cache.clear()
+
+
+def release_stock(order: Order) -> None:
+    """Return an order's units to stock (call inside the transaction that cancels it)."""
+    release_stock_for_orders([order.pk])
+
+
+def release_stock_for_orders(order_ids: list[int]) -> None:
+    """
+    release_stock for many orders at once: one items query, one lock, one
+    UPDATE. Orders that never reserved stock (``stock_reserved`` false:
+    placed before checkout reserved units) release nothing.
+    """
+    deltas: dict[int, int] = {}
+    for product_id, qty in OrderItem.objects.filter(
+        order_id__in=order_ids, order__stock_reserved=True
+    ).values_list("product_id", "quantity"):
+        deltas[product_id] = deltas.get(product_id, 0) + qty
+    if deltas:
+        _apply_stock_deltas(_lock_products(pk__in=list(deltas)), deltas)
+
 # ----- Order creation ---------------------------------------------------
 
+class UnknownSkuError(ValueError):
+    """Raised by create_order_from_cart with every cart SKU that has no product."""
+
+    def __init__(self, skus):
+        self.skus = sorted(skus)
+        super().__init__(f"Unknown SKU(s): {', '.join(self.skus)}")
+
+
 @transaction.atomic
 def create_order_from_cart(
     dj_user,
     cart_items: Iterable[Mapping[str, object]],
+    session=None,
 ) -> Order:
     """
     Create Order + OrderItem rows from [{'sku': 'ABC', 'qty': 2}, ...].
     Stores money rounded to 2dp using Order.q2.
+
+    The ordered units are reserved: the products are locked and their stock
+    decremented in the same transaction, and the order is flagged
+    ``stock_reserved`` (released again on cancellation, by hand or by
+    cancel_stale_orders).
+    A fixed number of queries whatever the cart size: one locking product
+    lookup, one stock UPDATE, one INSERT for the order (with its final
+    total) and one bulk INSERT for the items. Raises UnknownSkuError or
+    OutOfStockError listing every offending SKU at once.
     """
-    app_user = _resolve_app_user(dj_user)
+    lines = []
+    needed: dict[str, int] = {}
+    for item in cart_items:
+        sku = str(item["sku"]).strip()
+        qty = int(item.get("qty", 0) or 0)
+        if qty > 0:
+            lines.append((sku, qty))
+            needed[sku] = needed.get(sku, 0) + qty
+
+    locked = _lock_products(sku__in=list(needed))
+    products = {r["sku"]: r for r in locked}
+    missing = {sku for sku in needed if sku not in products}
+    if missing:
+        raise UnknownSkuError(missing)
+    shortages = {
+        sku: products[sku]["stock"] for sku, n in needed.items() if products[sku]["stock"] < n
+    }
+    if shortages:
+        raise OutOfStockError(shortages)
+    _apply_stock_deltas(locked, {products[sku]["id"]: -n for sku, n in needed.items()})
+
+    items, running = [], Decimal("0.00")
+    for sku, qty in lines:
+        product = products[sku]
+        unit = Order.q2(Decimal(product["price"]))
+        items.append(OrderItem(product_id=product["id"], quantity=qty, price_each=unit))
+        running += Order.q2(unit * qty)
 
     order = Order.objects.create(
-        user=app_user,
+        user=_resolve_app_user(dj_user, session),
         status="pending",
-        total_amount=Decimal("0.00"),
+        total_amount=Order.q2(running),
         created_at=timezone.now(),
+        stock_reserved=True,
     )
+    for oi in items:
+        oi.order = order
+    OrderItem.objects.bulk_create(items)
+    sales.order_placed(order)
+    return order
+
+# ----- Idempotent checkout ----------------------------------------------
+
+CHECKOUT_SESSION_KEY = "checkout"
 
-    running = Decimal("0.00")
+
+def cart_fingerprint(owner: str, cart_items: Iterable[Mapping[str, object]]) -> str:
+    """sha256 of the buyer (``owner``) and the normalized cart, whatever the line order."""
+    lines: dict[str, int] = {}
     for item in cart_items:
         sku = str(item["sku"]).strip()
         qty = int(item.get("qty", 0) or 0)
-        if qty <= 0:
-            continue
+        if qty > 0:
+            lines[sku] = lines.get(sku, 0) + qty
+    payload = owner + "|" + ",".join(f"{sku}*{qty}" for sku, qty in sorted(lines.items()))
+    return hashlib.sha256(payload.encode()).hexdigest()
 
-        product = Product.objects.get(sku=sku)
-        unit = Order.q2(Decimal(product.price))
-        line = Order.q2(unit * qty)
 
-        OrderItem.objects.create(
-            order=order,
-            product=product,
-            quantity=qty,
-            price_each=unit,
-        )
-        running += line
+def _reusable_order(order_id, now) -> Optional[Order]:
+    """The order if it is still pending and inside the idempotency window."""
+    if not order_id:
+        return None
+    cutoff = now - timedelta(seconds=settings.CHECKOUT_IDEMPOTENCY_WINDOW)
+    return Order.objects.filter(pk=order_id, status="pending", created_at__gte=cutoff).first()
 
-    order.total_amount = Order.q2(running)
-    order.save(update_fields=["total_amount"])
-    return order
+
+def checkout_once(
+    dj_user,
+    cart_items: Iterable[Mapping[str, object]],
+    owner: str,
+    session=None,
+) -> tuple[Order, bool]:
+    """
+    create_order_from_cart at most once per cart fingerprint: resubmitting
+    the same cart (double clicks, retries) within the window returns the
+    pending order of the first submission. Returns (order, created).
+
+    The session remembers the last fingerprint, so a plain retry costs one
+    query; otherwise the CheckoutClaim row for the fingerprint is locked,
+    which makes concurrent identical requests create exactly one order.
+
+    A new order replaces the session's previous one: if that is still
+    pending it is cancelled, so one visitor holds one stock reservation.
+    """
+    cart_items = list(cart_items)
+    fingerprint = cart_fingerprint(owner, cart_items)
+    now = timezone.now()
+
+    stored = session.get(CHECKOUT_SESSION_KEY) if session is not None else None
+    if stored and stored.get("fingerprint") == fingerprint:
+        order = _reusable_order(stored.get("order"), now)
+        if order is not None:
+            return order, False
+
+    with transaction.atomic():
+        # A concurrent first submission makes this wait on the unique index.
+        CheckoutClaim.objects.get_or_create(fingerprint=fingerprint, defaults={"created_at": now})
+        claim = CheckoutClaim.objects.select_for_update().get(fingerprint=fingerprint)
+        order = _reusable_order(claim.order_id, now)
+        created = order is None
+        if created:
+            order = create_order_from_cart(dj_user, cart_items, session=session)
+            claim.order = order
+            claim.created_at = now
+            claim.save(update_fields=["order", "created_at"])
+            if stored:
+                _cancel_superseded(stored.get("order"), order)
+
+    if session is not None:
+        session[CHECKOUT_SESSION_KEY] = {"fingerprint": fingerprint, "order": order.pk}
+    return order, created
+
+def _cancel_superseded(order_id, replacement: Order) -> None:
+    """Cancel the pending order ``replacement`` supersedes, releasing its stock."""
+    if not order_id or order_id == replacement.pk:
+        return
+    previous = Order.objects.filter(pk=order_id, status="pending").first()
+    if previous is None:
+        return
+    try:
+        set_order_status(previous, "cancelled")
+    except StatusConflict:
+        pass  # paid or cancelled meanwhile: leave it alone
+
+# ----- Order history ----------------------------------------------------
+
+def order_history_queryset(app_user: AppUser):
+    """
+    A customer's orders with ``item_count`` (units) and ``payment_status``
+    (latest payment, None if unpaid) as correlated subqueries, so a page of
+    history is one query however many items or payments each order has.
+    Page it with KeysetPaginator on ["-created_at", "-id"]
+    (index order_user_created_idx).
+    """
+    item_count = (
+        OrderItem.objects.filter(order=OuterRef("pk"))
+        .order_by()
+        .values("order")
+        .annotate(n=Sum("quantity"))
+        .values("n")
+    )
+    payment_status = (
+        Payment.objects.filter(order=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+        .values("status")[:1]
+    )
+    return (
+        Order.objects.filter(user=app_user)
+        .only("id", "status", "total_amount", "created_at")
+        .annotate(
+            item_count=Coalesce(Subquery(item_count), 0),
+            payment_status=Subquery(payment_status),
+        )
+    )
 
 # ----- Payments & Status ------------------------------------------------
 
@@ -139,24 +455,46 @@ def record_payment(
 ) -> Payment:
     """
     Persist a payment and, if successful, set order.status='paid'.
+
+    A success notification for an order that something else already paid
+    (the Stripe webhook racing the payment_return redirect) returns the
+    existing successful payment instead of recording a second one.
     """
     if method not in Payment.Method.values:
         raise ValueError(f"Invalid payment method: {method!r}. Allowed: {list(Payment.Method.values)}")
     if status not in Payment.Status.values:
         raise ValueError(f"Invalid payment status: {status!r}. Allowed: {list(Payment.Status.values)}")
 
-    payment = Payment.objects.create(
-        order=order,
-        provider=provider,
-        method=method,
-        status=status,
-        amount=Order.q2(Decimal(amount)),
-        provider_ref=provider_ref,
-    )
-
-    if status == Payment.Status.SUCCESS:
-        set_order_status(order, "paid")
+    error = None
+    with transaction.atomic():
+        if status == Payment.Status.SUCCESS:
+            # Claim the transition first: of two concurrent calls exactly one
+            # gets the conditional UPDATE, the other sees its payment here.
+            try:
+                set_order_status(order, "paid")
+            except ValueError as exc:
+                existing = (
+                    Payment.objects.filter(order=order, status=Payment.Status.SUCCESS)
+                    .order_by("id")
+                    .first()
+                )
+                if existing is not None:
+                    return existing
+                error = exc
+
+        payment = Payment.objects.create(
+            order=order,
+            provider=provider,
+            method=method,
+            status=status,
+            amount=Order.q2(Decimal(amount)),
+            provider_ref=provider_ref,
+        )
 
+    if error is not None:
+        # Money was taken for an order that cannot become paid: keep the
+        # payment row, but let the caller know.
+        raise error
     return payment
 
 
@@ -170,13 +508,27 @@ ALLOWED_TRANSITIONS = {
 CANON = set(ALLOWED_TRANSITIONS.keys())
 
 
+class StatusConflict(ValueError):
+    """The order's status changed after it was read; nothing was written."""
+
+
 def allowed_next_statuses(current: str) -> list[str]:
     cur = (current or "").lower()
     return sorted(ALLOWED_TRANSITIONS.get(cur, set()))
 
 
+@transaction.atomic
 def set_order_status(order: Order, to_status: str, by_user=None) -> OrderStatusHistory:
-    """Validate and perform status transition, then write a history row."""
+    """
+    Validate and perform status transition, then write a history row.
+    Cancelling an order puts its reserved units back in stock.
+
+    The transition is validated against ``order.status`` as the caller read
+    it and applied with UPDATE ... WHERE id = %s AND status = %s: if the
+    row no longer has that status (a concurrent transition won), nothing is
+    written and StatusConflict is raised. No lock is held beforehand, so
+    callers may talk to Stripe between reading the order and calling this.
+    """
     frm = (order.status or "").lower()
     to = (to_status or "").lower()
     if to not in CANON:
@@ -185,12 +537,101 @@ def set_order_status(order: Order, to_status: str, by_user=None) -> OrderStatusH
     if to not in allowed:
         raise ValueError(f"Transition {frm} → {to} not allowed")
 
-    # Update order
+    # Update order, only if nobody changed it since it was read
+    if not Order.objects.filter(pk=order.pk, status=order.status).update(status=to):
+        raise StatusConflict(f"Order #{order.pk} is no longer {frm}: its status was changed meanwhile")
     order.status = to
-    order.save(update_fields=["status"])
+    if to == "cancelled":
+        release_stock(order)
 
     # History
     hist = OrderStatusHistory.objects.create(
         order=order, from_status=frm, to_status=to, changed_by=by_user
     )
+    sales.status_changed(order, frm, to, hist.created_at)
     return hist
+
+
+BULK_STATUS_LIMIT = 1000
+
+
+@transaction.atomic
+def bulk_set_order_status(order_ids: Iterable[int], to_status: str, by_user=None) -> dict:
+    """
+    Move many orders to ``to_status`` at once. Each order is checked against
+    ALLOWED_TRANSITIONS on its own; the valid ones are moved with one
+    conditional UPDATE per source status (``... AND status = %s``, so an
+    order changed in the meantime is reported, not overwritten) and their
+    history rows are written with one bulk_create.
+
+    Returns {"updated": [ids], "failed": {id: reason}}; a failing order
+    never aborts the rest of the batch.
+    """
+    to = (to_status or "").lower()
+    if to not in CANON:
+        raise ValueError(f"Unknown status: {to}")
+    ids = list(dict.fromkeys(int(pk) for pk in order_ids))
+    if len(ids) > BULK_STATUS_LIMIT:
+        raise ValueError(f"At most {BULK_STATUS_LIMIT} orders per batch.")
+
+    current = {
+        pk: (status or "", total)
+        for pk, status, total in Order.objects.filter(pk__in=ids).values_list("id", "status", "total_amount")
+    }
+    failed: dict[int, str] = {}
+    by_source: dict[str, list[int]] = {}
+    for pk in ids:
+        if pk not in current:
+            failed[pk] = "Order not found"
+            continue
+        raw = current[pk][0]
+        if to not in ALLOWED_TRANSITIONS.get(raw.lower(), set()):
+            failed[pk] = f"Transition {raw.lower()} → {to} not allowed"
+            continue
+        by_source.setdefault(raw, []).append(pk)
+
+    moved: list[tuple[Order, str]] = []
+    with connection.cursor() as cur:
+        for raw, pks in by_source.items():
+            marks = ", ".join(["%s"] * len(pks))
+            cur.execute(
+                f"UPDATE {Order._meta.db_table} SET status = %s "
+                f"WHERE status = %s AND id IN ({marks}) RETURNING id",
+                [to, raw, *pks],
+            )
+            done = {row[0] for row in cur.fetchall()}
+            for pk in pks:
+                if pk in done:
+                    moved.append((Order(pk=pk, status=to, total_amount=current[pk][1]), raw.lower()))
+                else:
+                    failed[pk] = "Status changed meanwhile; reload and retry"
+
+    if to == "cancelled":
+        release_stock_for_orders([order.pk for order, _ in moved])
+    history = OrderStatusHistory.objects.bulk_create(
+        OrderStatusHistory(order_id=order.pk, from_status=frm, to_status=to, changed_by=by_user)
+        for order, frm in moved
+    )
+    sales.statuses_changed([(order, frm, h.created_at) for (order, frm), h in zip(moved, history)], to)
+    return {"updated": [order.pk for order, _ in moved], "failed": failed}
+
+
+def cancel_stale_orders(older_than: timedelta) -> dict:
+    """
+    Cancel pending orders created more than ``older_than`` ago, through
+    bulk_set_order_status (so their reserved stock is released and the
+    sales summary follows), BULK_STATUS_LIMIT orders per transaction.
+    Returns {"cancelled": n, "failed": {id: reason}}.
+    """
+    cutoff = timezone.now() - older_than
+    stale = Order.objects.filter(status="pending", created_at__lt=cutoff).order_by("id")
+    cancelled, failed, last_id = 0, {}, 0
+    while True:
+        ids = list(stale.filter(pk__gt=last_id).values_list("id", flat=True)[:BULK_STATUS_LIMIT])
+        if not ids:
+            break
+        result = bulk_set_order_status(ids, "cancelled")
+        cancelled += len(result["updated"])
+        failed.update(result["failed"])
+        last_id = ids[-1]
+    return {"cancelled": cancelled, "failed": failed}
@@ -7,6 +7,7 @@ app_name = "orders"
 
 urlpatterns = [
     path("checkout/", views.checkout_create, name="checkout_create"),
+    path("mine/", views.my_orders, name="my_orders"),
     path("<int:pk>/", views.order_detail, name="order_detail"),
     path("<int:pk>/checkout/", views.order_checkout, name="order_checkout"),
     path("<int:pk>/pay/", views.pay_mock, name="pay_mock"),
@@ -14,5 +15,7 @@ urlpatterns = [
     path("return/", views.payment_return, name="payment_return"),
     path("stripe/webhook/", stripe_webhook, name="stripe_webhook"),
     path("<int:pk>/status/", views.order_status_update, name="order_status_update"),
+    path("bulk-status/", views.order_bulk_status, name="order_bulk_status"),
+    path("dashboard/", views.sales_dashboard, name="sales_dashboard"),
 ]
 
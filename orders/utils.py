@@ -7,13 +7,13 @@ from .models import AppUser
 from . import services
 
 
-def get_or_create_app_user(dj_user) -> Optional[AppUser]:
+def get_or_create_app_user(dj_user, session=None) -> Optional[AppUser]:
     """
     Back-compat wrapper.
     For an authenticated Django user, upsert/fetch the mapped AppUser row.
     Returns None if the user is anonymous or has no email.
     """
-    return services.ensure_app_user_for_django_user(dj_user)
+    return services.ensure_app_user_for_django_user(dj_user, session)
 
 
 def get_guest_app_user() -> AppUser:
@@ -24,11 +24,11 @@ def get_guest_app_user() -> AppUser:
     return services.get_guest_app_user()
 
 
-def resolve_app_user(dj_user) -> AppUser:
+def resolve_app_user(dj_user, session=None) -> AppUser:
     """
     Convenience helper: return an AppUser for the current request user,
     falling back to the Guest AppUser for anonymous sessions.
     """
     # services._resolve_app_user is internal; call the public pieces explicitly
-    app_user = services.ensure_app_user_for_django_user(dj_user)
+    app_user = services.ensure_app_user_for_django_user(dj_user, session)
     return app_user or services.get_guest_app_user()
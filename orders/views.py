@@ -1,20 +1,29 @@
 # orders/views.py
 from __future__ import annotations
 
+import time
 from decimal import Decimal
 import stripe
 
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.auth.decorators import user_passes_test
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods, require_GET
 
-from .forms import CheckoutDetailsForm, OrderStatusForm
+from catalog.bag import get_bag
+from catalog.carts import get_cart, migrate_cookie_cart
+from catalog.pagination import KeysetPaginator
+
+from .forms import BulkOrderStatusForm, CheckoutDetailsForm, OrderStatusForm
 from .models import Order, Payment
+from .sales import dashboard_data
 from .services import (
-    create_order_from_cart,
+    bulk_set_order_status,
+    checkout_once,
+    find_app_user_for_django_user,
+    order_history_queryset,
     record_payment,
     set_order_status,
 )
@@ -26,36 +35,68 @@ stripe.api_key = getattr(settings, "STRIPE_SECRET_KEY", "") or None
 # -----------------------------
 # Create order from session cart
 # -----------------------------
-@require_http_methods(["GET", "POST"])
+@require_http_methods(["POST"])
 def checkout_create(request):
     """
     Build an Order from the session cart and redirect to its detail page.
     (Cart is NOT cleared here so the user can still edit it.)
+    Resubmitting an unchanged cart goes back to the pending order it created;
+    a changed cart replaces it (see checkout_once). POST only: creating an
+    order reserves stock.
     """
-    cart = request.session.get("cart", {}) or {}
-    normalized = []
-    for sku, qty in cart.items():
-        try:
-            n = int(qty)
-        except (TypeError, ValueError):
-            n = 0
-        if n > 0:
-            normalized.append({"sku": sku, "qty": n})
+    # Orders need a server-side cart (it is cleared after payment).
+    migrate_cookie_cart(request)
+    normalized = get_bag(request).lines()
 
     if not normalized:
         messages.warning(request, "Your bag is empty.")
         return redirect("catalog:product_list")
 
     try:
-        order = create_order_from_cart(request.user, normalized)
+        order, created = checkout_once(
+            request.user, normalized, _checkout_owner(request), session=request.session
+        )
     except Exception as exc:
         messages.error(request, f"Sorry, we couldn't create your order: {exc}")
         return redirect("catalog:product_list")
 
-    messages.success(request, f"Order #{order.pk} created (status: {order.status}).")
+    if created:
+        messages.success(request, f"Order #{order.pk} created (status: {order.status}).")
     return redirect("orders:order_detail", pk=order.pk)
 
 
+def _checkout_owner(request) -> str:
+    """Who the cart fingerprint belongs to: the user, or the guest's session."""
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    if not request.session.session_key:
+        request.session.save()
+    return f"session:{request.session.session_key}"
+
+
+# -----------------------------
+# Order history
+# -----------------------------
+ORDER_HISTORY_PAGE_SIZE = 20
+
+
+@login_required(login_url="account_login")
+def my_orders(request):
+    """
+    The signed-in customer's orders, newest first, keyset paginated. The
+    app_user is only looked up: someone who never checked out has none yet
+    and gets the empty state.
+    """
+    app_user = find_app_user_for_django_user(request.user, request.session)
+    page_obj = None
+    if app_user is not None:
+        paginator = KeysetPaginator(
+            order_history_queryset(app_user), ["-created_at", "-id"], ORDER_HISTORY_PAGE_SIZE
+        )
+        page_obj = paginator.get_page(request.GET.get("cursor"))
+    return render(request, "orders/my_orders.html", {"page_obj": page_obj})
+
+
 # -----------------------------
 # Order detail
 # -----------------------------
@@ -152,6 +193,8 @@ def pay_stripe(request, pk):
             line_items=line_items,
             success_url=success_url,
             cancel_url=cancel_url,
+            # don't let a payment outlive the order's stock reservation for long
+            expires_at=int(time.time()) + settings.STRIPE_CHECKOUT_TTL,
         )
     except Exception as exc:
         messages.error(request, f"Could not start payment: {exc}")
@@ -178,7 +221,9 @@ def payment_return(request):
 
     order = get_object_or_404(Order, pk=order_id)
 
-    # Already paid? Bail early.
+    # Already paid? Bail early. record_payment would get this right anyway
+    # (its conditional UPDATE decides); this only saves a reload of the
+    # return URL the Stripe round-trip.
     if str(order.status).lower() == "paid":
         messages.info(request, f"Order #{order.pk} is already paid.")
         return redirect("orders:order_detail", pk=order.pk)
@@ -203,17 +248,12 @@ def payment_return(request):
         if session.payment_status == "paid" or (
             session.payment_intent and session.payment_intent.status == "succeeded"
         ):
-            record_payment(
-                order=order,
+            _record_success(
+                request,
+                order,
                 provider="stripe",
-                method=Payment.Method.CARD,
-                status=Payment.Status.SUCCESS,
-                amount=Decimal(order.total_amount),
                 provider_ref=session.payment_intent.id if session.payment_intent else session.id,
             )
-            messages.success(request, f"Payment successful. Order #{order.pk} is now paid.")
-            request.session["cart"] = {}
-            request.session.modified = True
         else:
             record_payment(
                 order=order,
@@ -229,26 +269,46 @@ def payment_return(request):
     # Fallback: mock flow
     result = request.GET.get("status")
     ref = request.GET.get("ref") or None
-    status = Payment.Status.SUCCESS if result == "success" else Payment.Status.FAILED
-
-    payment = record_payment(
-        order=order,
-        provider="mock",
-        method=Payment.Method.CARD,
-        status=status,
-        amount=Decimal(order.total_amount),
-        provider_ref=ref,
-    )
 
-    if payment.status == Payment.Status.SUCCESS:
-        messages.success(request, f"Payment successful. Order #{order.pk} is now paid.")
-        request.session["cart"] = {}
-        request.session.modified = True
+    if result == "success":
+        _record_success(request, order, provider="mock", provider_ref=ref)
     else:
+        record_payment(
+            order=order,
+            provider="mock",
+            method=Payment.Method.CARD,
+            status=Payment.Status.FAILED,
+            amount=Decimal(order.total_amount),
+            provider_ref=ref,
+        )
         messages.error(request, "Payment failed or was cancelled.")
     return redirect("orders:order_detail", pk=order.pk)
 
 
+def _record_success(request, order, *, provider, provider_ref):
+    """Record a successful payment and tell the customer how it went."""
+    try:
+        record_payment(
+            order=order,
+            provider=provider,
+            method=Payment.Method.CARD,
+            status=Payment.Status.SUCCESS,
+            amount=Decimal(order.total_amount),
+            provider_ref=provider_ref,
+        )
+    except ValueError:
+        # The payment is saved, but the order can no longer become paid
+        # (cancelled by cancel_stale_orders, by staff, or a lost race).
+        messages.error(
+            request,
+            f"We received your payment, but order #{order.pk} had been cancelled. "
+            "Please contact support and quote the order number.",
+        )
+        return
+    messages.success(request, f"Payment successful. Order #{order.pk} is now paid.")
+    get_cart(request).clear()
+
+
 # -----------------------------
 # Staff: update order status
 # -----------------------------
@@ -274,3 +334,25 @@ def order_status_update(request, pk):
                 messages.error(request, str(e))
 
     return render(request, "orders/order_status_form.html", {"order": order, "form": form})
+
+
+@user_passes_test(_staff, login_url="account_login")
+@require_http_methods(["GET", "POST"])
+def order_bulk_status(request):
+    """Move a batch of orders to one status; orders that cannot move are listed, the rest still move."""
+    form = BulkOrderStatusForm(request.POST or None, initial={"order_ids": request.GET.get("ids", "")})
+    result = None
+    if request.method == "POST" and form.is_valid():
+        to_status = form.cleaned_data["to_status"]
+        result = bulk_set_order_status(form.cleaned_data["order_ids"], to_status, by_user=request.user)
+        if result["updated"]:
+            messages.success(request, f"{len(result['updated'])} order(s) moved to “{to_status}”.")
+        if result["failed"]:
+            messages.warning(request, f"{len(result['failed'])} order(s) could not be updated.")
+    return render(request, "orders/order_bulk_status.html", {"form": form, "result": result})
+
+
+@user_passes_test(_staff, login_url="account_login")
+def sales_dashboard(request):
+    """Revenue, orders per status and top products from the sales summary tables."""
+    return render(request, "orders/sales_dashboard.html", dashboard_data())
@@ -0,0 +1,52 @@
+# tests/conftest.py
+from __future__ import annotations
+
+import itertools
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from catalog.models import Brand, Category, Product
+
+_serial = itertools.count(1)
+
+
+@pytest.fixture(autouse=True)
+def _clear_default_cache():
+    """Each test flushes the database, so ids cached by an earlier test (the guest app_user) are stale."""
+    cache.clear()
+
+
+@pytest.fixture
+def make_products():
+    """
+    make_products(n, **fields) → n new products saved through Product.save()
+    (so the search index, facets and registry see them), in id order.
+    ``names=[...]`` names them (and sets n); other fields override the
+    defaults on every product.
+    """
+    def make(n: int = 1, *, names=None, category=None, brand=None, **fields):
+        names = list(names) if names is not None else [None] * n
+        category = category or Category.objects.get_or_create(
+            slug="test-category", defaults={"name": "Test category"}
+        )[0]
+        brand = brand or Brand.objects.get_or_create(slug="test-brand", defaults={"name": "Test Brand"})[0]
+        products = []
+        for i, name in enumerate(names):
+            serial = next(_serial)
+            values = {
+                "name": name or f"Test product {serial}",
+                "slug": f"test-product-{serial}",
+                "sku": f"TEST-{serial:05d}",
+                "price": Decimal(10 + i),
+                "stock": 100,
+                "is_active": True,
+                "created_at": timezone.now(),
+                **fields,
+            }
+            products.append(Product.objects.create(category=category, brand=brand, **values))
+        return products
+
+    return make
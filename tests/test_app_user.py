@@ -0,0 +1,65 @@
+# tests/test_app_user.py
+from __future__ import annotations
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from orders import services
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _user(username="au_user"):
+    return get_user_model().objects.create_user(
+        username=username, email=f"{username}@example.com", password="secret1234",
+        first_name="Ada", last_name="Lovelace",
+    )
+
+
+def test_guest_id_is_cached(django_assert_num_queries):
+    first = services.get_guest_app_user()
+    assert cache.get(services.GUEST_CACHE_KEY) == first.id
+    with django_assert_num_queries(0):
+        assert services.get_guest_app_user().id == first.id
+
+    cache.delete(services.GUEST_CACHE_KEY)  # expired or evicted: looked up again
+    assert services.get_guest_app_user().id == first.id
+
+
+def test_upsert_only_runs_when_profile_changes(django_assert_num_queries):
+    user = _user()
+    session = SessionBase()
+    with django_assert_num_queries(1):
+        app_user = services.ensure_app_user_for_django_user(user, session)
+
+    # same session, then a fresh session served from the cache
+    with django_assert_num_queries(0):
+        assert services.ensure_app_user_for_django_user(user, session).id == app_user.id
+    with django_assert_num_queries(0):
+        assert services.ensure_app_user_for_django_user(user, SessionBase()).id == app_user.id
+
+    user.last_name = "King"
+    with django_assert_num_queries(1):
+        assert services.ensure_app_user_for_django_user(user, session).id == app_user.id
+    assert session[services.APP_USER_SESSION_KEY]["full_name"] == "Ada King"
+
+
+def test_checkout_does_not_touch_app_user_once_resolved(client, make_products):
+    products = make_products(2)
+    _user("au_checkout")
+    assert client.login(username="au_checkout", password="secret1234")
+
+    for n, product in enumerate(products):
+        session = client.session
+        session["cart"] = {product.sku: 1}
+        session.save()
+        with CaptureQueriesContext(connection) as ctx:
+            r = client.post(reverse("orders:checkout_create"))
+        assert r.status_code in (302, 303)
+        app_user_queries = [q["sql"] for q in ctx.captured_queries if "app_user" in q["sql"]]
+        assert len(app_user_queries) == (1 if n == 0 else 0)
@@ -0,0 +1,79 @@
+# tests/test_bag.py
+from __future__ import annotations
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.bag import SUMMARY_SESSION_KEY, Bag
+from catalog.carts import get_cart
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def bagged(client, make_products):
+    a, b = make_products(2)
+    client.post(reverse("catalog:add_to_bag", args=[a.sku]))
+    client.post(reverse("catalog:add_to_bag", args=[b.sku]))
+    client.post(reverse("catalog:add_to_bag", args=[b.sku]))
+    return a, b
+
+
+def _render_home(client):
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.get(reverse("home:home"))
+    assert r.status_code == 200
+    return [q["sql"] for q in ctx.captured_queries]
+
+
+def test_second_render_reads_the_stamped_summary(client, bagged):
+    a, b = bagged
+    _render_home(client)  # computes and stores the summary
+    stored = client.session[SUMMARY_SESSION_KEY]
+    assert (stored["count"], Decimal(stored["total"])) == (3, a.price + 2 * b.price)
+
+    queries = _render_home(client)
+    assert not [q for q in queries if '"product"' in q]
+    assert not [q for q in queries if q.startswith(("UPDATE", "INSERT"))]  # no session save
+
+
+def test_stamped_summary_costs_no_queries(client, bagged, django_assert_num_queries):
+    _render_home(client)
+    session = client.session
+    assert session[SUMMARY_SESSION_KEY]  # loaded, as SessionMiddleware would have it
+    with django_assert_num_queries(0):
+        summary = Bag(SimpleNamespace(session=session, COOKIES={}, user=None)).summary
+    assert summary["count"] == 3
+    assert not session.modified
+
+
+def test_catalog_write_recomputes_once(client, bagged):
+    a, _b = bagged
+    _render_home(client)
+    a.price = Decimal("50.00")
+    a.save()
+
+    assert [q for q in _render_home(client) if '"product"' in q]
+    assert not [q for q in _render_home(client) if '"product"' in q]
+    assert Decimal(client.session[SUMMARY_SESSION_KEY]["total"]) == Decimal("50.00") + 2 * _b.price
+
+
+@pytest.mark.parametrize("store", ["db", "cache"])
+def test_server_side_stores_keep_the_summary_out_of_the_session(settings, make_products, store):
+    settings.CART_STORE = store
+    a, b = make_products(2)
+    session = SessionStore()
+    get_cart(SimpleNamespace(session=session, COOKIES={}, user=None)).set_many({a.sku: 1, b.sku: 2})
+    session.save()
+
+    session = SessionStore(session.session_key)
+    summary = Bag(SimpleNamespace(session=session, COOKIES={}, user=None)).summary
+    assert summary["count"] == 3
+    assert SUMMARY_SESSION_KEY not in session
+    assert not session.modified
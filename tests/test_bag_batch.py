@@ -0,0 +1,99 @@
+# tests/test_bag_batch.py
+from __future__ import annotations
+
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalog.views import BAG_BATCH_LIMIT
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _batch(client, changes):
+    return client.post(
+        reverse("catalog:update_bag_batch"), data=json.dumps(changes), content_type="application/json"
+    )
+
+
+def _bag(client):
+    return client.get(reverse("catalog:bag_detail")).context["rows"]
+
+
+def test_batch_sets_and_removes_lines(client, make_products):
+    a, b, c = make_products(3)
+    r = _batch(client, {a.sku: 2, b.sku: "3"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["count"] == 5
+    assert {line["sku"]: line["qty"] for line in body["lines"]} == {a.sku: 2, b.sku: 3}
+
+    r = _batch(client, {a.sku: 0, c.sku: 1})
+    assert {line["sku"]: line["qty"] for line in r.json()["lines"]} == {b.sku: 3, c.sku: 1}
+
+
+def test_mixed_batch_is_rejected_whole(client, make_products):
+    ok, sold_out, hidden = make_products(3)
+    sold_out.stock = 0
+    sold_out.save()
+    hidden.is_active = False
+    hidden.save()
+    _batch(client, {ok.sku: 1})
+
+    r = _batch(client, {ok.sku: 4, sold_out.sku: 1, hidden.sku: 1, "NOPE": 1, "X": "two", "Y": True})
+    assert r.status_code == 400
+    assert r.json()["errors"] == {
+        sold_out.sku: "Out of stock.",
+        hidden.sku: "Unknown or unavailable product.",
+        "NOPE": "Unknown or unavailable product.",
+        "X": "Quantity must be a whole number.",
+        "Y": "Quantity must be a whole number.",
+    }
+    assert [(row["sku"], row["qty"]) for row in _bag(client)] == [(ok.sku, 1)]  # nothing applied
+
+
+@pytest.mark.parametrize("body", ["not json", "[1]", "{}"])
+def test_malformed_bodies(client, body):
+    r = client.post(reverse("catalog:update_bag_batch"), data=body, content_type="application/json")
+    assert r.status_code == 400 and "error" in r.json()
+
+
+def test_batch_size_is_capped(client, make_products):
+    (p,) = make_products(1)
+    too_many = {f"SKU-{i}": 1 for i in range(BAG_BATCH_LIMIT)} | {p.sku: 1}
+    r = _batch(client, too_many)
+    assert r.status_code == 400 and str(BAG_BATCH_LIMIT) in r.json()["error"]
+
+    # at the limit the batch is checked line by line instead
+    r = _batch(client, dict(list(too_many.items())[1:]))
+    assert r.status_code == 400 and len(r.json()["errors"]) == BAG_BATCH_LIMIT - 1
+
+
+def test_batch_writes_the_session_once(client, make_products, settings):
+    settings.CART_STORE = "session"
+    products = make_products(5)
+    _batch(client, {products[0].sku: 1})  # session exists from here on
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = _batch(client, {p.sku: 2 for p in products})
+    assert r.status_code == 200
+    writes = [
+        q["sql"] for q in ctx.captured_queries
+        if "django_session" in q["sql"] and q["sql"].startswith(("UPDATE", "INSERT"))
+    ]
+    assert len(writes) == 1
+
+
+def test_db_store_batch_is_one_upsert(client, make_products, settings):
+    settings.CART_STORE = "db"
+    products = make_products(5)
+    _batch(client, {products[0].sku: 1, products[1].sku: 1})
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = _batch(client, {**{p.sku: 2 for p in products[2:]}, products[0].sku: 0})
+    assert r.status_code == 200
+    writes = [q["sql"] for q in ctx.captured_queries if "cart_line" in q["sql"] and not q["sql"].startswith("SELECT")]
+    assert len(writes) == 2  # one upsert for the three lines, one delete for the removal
@@ -0,0 +1,89 @@
+# tests/test_bulk_status.py
+from __future__ import annotations
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from orders.models import Order, OrderStatusHistory
+from orders.services import bulk_set_order_status, create_order_from_cart, record_payment
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def products(make_products):
+    return make_products(2, stock=10_000)
+
+
+def _orders(products, n):
+    return [
+        create_order_from_cart(AnonymousUser(), [{"sku": p.sku, "qty": 1} for p in products[: 1 + i % 2]])
+        for i in range(n)
+    ]
+
+
+def _paid(products, n):
+    orders = _orders(products, n)
+    for order in orders:
+        record_payment(order, provider="mock", method="card", status="successful", amount=order.total_amount)
+    return orders
+
+
+def test_batch_cost_does_not_grow_with_batch_size(products):
+    small, large = _paid(products, 3), _paid(products, 40)
+    with CaptureQueriesContext(connection) as few:
+        bulk_set_order_status([o.pk for o in small], "shipped")
+    with CaptureQueriesContext(connection) as many:
+        result = bulk_set_order_status([o.pk for o in large], "shipped")
+    assert len(result["updated"]) == 40 and not result["failed"]
+    assert len(many) == len(few)
+    assert OrderStatusHistory.objects.filter(order_id__in=result["updated"], to_status="shipped").count() == 40
+
+
+def test_invalid_orders_are_reported_without_aborting_the_batch(products):
+    paid = _paid(products, 2)
+    pending = _orders(products, 1)
+    ids = [paid[0].pk, pending[0].pk, 999_999_999, paid[1].pk]
+
+    result = bulk_set_order_status(ids, "shipped")
+
+    assert result["updated"] == [paid[0].pk, paid[1].pk]
+    assert result["failed"] == {
+        pending[0].pk: "Transition pending → shipped not allowed",
+        999_999_999: "Order not found",
+    }
+    assert Order.objects.get(pk=pending[0].pk).status == "pending"
+
+
+def test_bulk_cancel_releases_stock(products):
+    orders = _orders(products, 4)
+    product = orders[0].items.first().product
+    before = product.stock
+    units = sum(i.quantity for o in orders for i in o.items.filter(product=product))
+
+    bulk_set_order_status([o.pk for o in orders], "cancelled")
+
+    product.refresh_from_db()
+    assert product.stock == before + units
+
+
+def test_staff_form(client, products):
+    orders = _paid(products, 2)
+    get_user_model().objects.create_user(
+        username="bulk_staff", email="bulk@example.com", password="secret1234", is_staff=True
+    )
+    assert client.login(username="bulk_staff", password="secret1234")
+
+    r = client.post(
+        reverse("orders:order_bulk_status"),
+        {"order_ids": f"#{orders[0].pk}, {orders[1].pk}\n", "to_status": "shipped"},
+    )
+    assert r.status_code == 200
+    assert r.context["result"]["updated"] == [orders[0].pk, orders[1].pk]
+
+    r = client.post(reverse("orders:order_bulk_status"), {"order_ids": "12 abc", "to_status": "shipped"})
+    assert "order_ids" in r.context["form"].errors
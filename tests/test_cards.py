@@ -0,0 +1,71 @@
+# tests/test_cards.py
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from catalog import cards
+from catalog.models import Brand, Product
+from catalog.rows import as_rows
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Product ids whose card template was rendered (cache misses)."""
+    seen = []
+    render = cards.render_to_string
+
+    def spy(template, context):
+        seen.append(context["p"].pk)
+        return render(template, context)
+
+    monkeypatch.setattr(cards, "render_to_string", spy)
+    return seen
+
+
+def _render(products):
+    return cards.render_cards(as_rows(Product.objects.filter(pk__in=[p.pk for p in products]).order_by("id")))
+
+
+def test_saving_a_product_only_rerenders_its_card(make_products, rendered):
+    a, b, c = make_products(3)
+    first = _render([a, b, c])
+    assert rendered == [a.pk, b.pk, c.pk]
+
+    rendered.clear()
+    assert _render([a, b, c]) == first
+    assert rendered == []
+
+    b.price = Decimal("99.00")
+    b.save()
+    second = _render([a, b, c])
+    assert rendered == [b.pk]
+    assert (second[0], second[2]) == (first[0], first[2])
+    assert "99.00" in second[1] and "99.00" not in first[1]
+
+
+def test_renaming_a_brand_rerenders_only_its_cards(make_products, rendered):
+    acme = Brand.objects.create(name="Acme", slug="acme")
+    a, b = make_products(2, brand=acme)
+    (c,) = make_products(1)
+    _render([a, b, c])
+
+    rendered.clear()
+    acme.name = "Acme Studio"
+    acme.save()
+    html = _render([a, b, c])
+    assert rendered == [a.pk, b.pk]
+    assert "Acme Studio" in html[0]
+
+
+def test_new_image_manifest_rerenders_every_card(make_products, rendered, monkeypatch):
+    products = make_products(2)
+    _render(products)
+
+    rendered.clear()
+    monkeypatch.setattr(cards, "manifest_version", lambda: "rebuilt")
+    _render(products)
+    assert rendered == [p.pk for p in products]
@@ -0,0 +1,44 @@
+# tests/test_cart_cookie.py
+from __future__ import annotations
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.urls import reverse
+
+from catalog.carts import decode_cookie_cart
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def cookie_carts(settings):
+    settings.CART_ANONYMOUS_COOKIE = True
+    return settings
+
+
+def test_anonymous_bag_lives_in_the_signed_cookie(client, cookie_carts, make_products):
+    a, b = make_products(2)
+    r = client.post(reverse("catalog:add_to_bag", args=[a.sku]))
+    client.post(reverse("catalog:add_to_bag", args=[b.sku]))
+    r = client.post(reverse("catalog:add_to_bag", args=[b.sku]))
+
+    cookie = r.cookies[cookie_carts.CART_COOKIE_NAME]
+    assert decode_cookie_cart(cookie.value) == {a.sku: 1, b.sku: 2}
+    assert cookie["httponly"] and cookie["samesite"] == "Lax"
+    assert "Cookie" in r["Vary"]
+
+    # the cookie the client sends back is read, not the session
+    r = client.get(reverse("catalog:bag_detail"))
+    assert {row["sku"]: row["qty"] for row in r.context["rows"]} == {a.sku: 1, b.sku: 2}
+    assert cookie_carts.SESSION_COOKIE_NAME not in client.cookies
+    assert not Session.objects.exists()
+
+
+def test_tampered_cookie_reads_as_an_empty_bag(client, cookie_carts, make_products):
+    (a,) = make_products(1)
+    client.post(reverse("catalog:add_to_bag", args=[a.sku]))
+    name = cookie_carts.CART_COOKIE_NAME
+    client.cookies[name] = client.cookies[name].value.replace("*1", "*9")
+
+    r = client.get(reverse("catalog:bag_detail"))
+    assert r.context["is_empty"]
@@ -0,0 +1,167 @@
+# tests/test_carts.py
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.sessions.backends.base import SessionBase
+from django.contrib.sessions.backends.db import SessionStore
+from django.core import signing
+from django.core.cache import caches
+from django.core.management import call_command
+from django.utils import timezone
+
+from catalog.carts import (
+    CART_ID_SESSION_KEY,
+    COOKIE_SALT,
+    CacheCartStore,
+    CartStore,
+    DatabaseCartStore,
+    SessionCartStore,
+    decode_cookie_cart,
+    encode_cookie_cart,
+)
+from catalog.models import CartLine
+
+
+def _request(session):
+    return SimpleNamespace(session=session)
+
+
+@pytest.fixture
+def locmem(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        "carts": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "carts"},
+    }
+    settings.CART_CACHE_ALIAS = "carts"
+    yield caches["carts"]
+    caches["carts"].clear()
+
+
+@pytest.mark.parametrize("store_class", [SessionCartStore, CacheCartStore])
+def test_store_add_set_remove_clear(locmem, store_class):
+    session = SessionBase()
+    store = store_class(_request(session))
+    assert store.add("A") == 1
+    assert store.add("A", 2) == 3
+    store.set("B", 4)
+    assert store.items() == {"A": 3, "B": 4}
+
+    # a new request over the same session sees the same cart
+    assert store_class(_request(session)).items() == {"A": 3, "B": 4}
+
+    assert store.remove("A") is True
+    assert store.remove("A") is False
+    store.set("B", 0)
+    assert store.items() == {}
+
+    store.add("C")
+    store.clear()
+    assert store_class(_request(session)).items() == {}
+
+
+@pytest.mark.parametrize("store_class", [SessionCartStore, CacheCartStore])
+def test_store_set_many(locmem, store_class):
+    session = SessionBase()
+    store = store_class(_request(session))
+    store.add("A")
+    store.add("B")
+    store.set_many({"A": 0, "B": 5, "C": 2})
+    assert store_class(_request(session)).items() == {"B": 5, "C": 2}
+
+
+def test_cache_store_reuses_slots_and_clear_drops_every_key(locmem):
+    session = SessionBase()
+    store = CacheCartStore(_request(session))
+    for _ in range(20):
+        store.add("A")
+        store.add("B")
+        store.remove("A")
+        store.set_many({"B": 0})
+    store.add("A")
+    cart_id = session[CART_ID_SESSION_KEY]
+    assert locmem.get(f"cart:{cart_id}:n") == 2
+    assert store.items() == {"A": 1}
+
+    store.add("B", 3)
+    store.clear()
+    suffixes = ["n", "slot:1", "slot:2", "qty:A", "qty:B", "slot_of:A", "slot_of:B"]
+    assert locmem.get_many([f"cart:{cart_id}:{suffix}" for suffix in suffixes]) == {}
+    store.add("B")
+    assert CacheCartStore(_request(session)).items() == {"B": 1}
+
+
+def test_cache_store_concurrent_adds_are_not_lost(locmem):
+    session = SessionBase()
+    CacheCartStore(_request(session)).add("A", 0)  # create the cart id up front
+    threads_n, adds = 8, 50
+
+    def worker(n):
+        store = CacheCartStore(_request(session))
+        for _ in range(adds):
+            store.add("A")
+            store.add(f"T{n}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    items = CacheCartStore(_request(session)).items()
+    assert items.pop("A") == threads_n * adds
+    assert sorted(items.values()) == [adds] * threads_n
+
+
+def test_cookie_cart_round_trip():
+    items = {"1163": 2, "A B/C*!": 1, "ü-sku": 3}
+    value = encode_cookie_cart(items)
+    assert value.startswith("v1!")
+    assert ";" not in value and "," not in value and " " not in value
+    assert decode_cookie_cart(value) == items
+
+
+def test_cookie_cart_rejects_tampered_and_unknown_versions():
+    value = encode_cookie_cart({"1163": 2})
+    assert decode_cookie_cart(value.replace("*2", "*9")) is None
+    assert decode_cookie_cart(signing.TimestampSigner(salt=COOKIE_SALT).sign("v0!1163*2")) is None
+    assert decode_cookie_cart("") is None
+
+
+@pytest.mark.django_db
+def test_db_store_upserts_lines():
+    session = SessionBase()
+    store = DatabaseCartStore(_request(session))
+    assert store.add("A") == 1
+    assert store.add("A", 2) == 3
+    store.set("B", 5)
+    store.set("B", 2)
+    assert DatabaseCartStore(_request(session)).items() == {"A": 3, "B": 2}
+    assert store.remove("B") is True
+    store.clear()
+    assert DatabaseCartStore(_request(session)).items() == {}
+
+
+def test_cart_store_is_abstract():
+    with pytest.raises(TypeError):
+        CartStore(_request(SessionBase()))
+
+
+@pytest.mark.django_db
+def test_purge_drops_lines_of_expired_sessions_only():
+    live = SessionStore()
+    DatabaseCartStore(_request(live)).add("LIVE")
+    live.save()
+    expired = SessionStore()
+    DatabaseCartStore(_request(expired)).add("GONE")
+    expired.set_expiry(-60)
+    expired.save()
+    fresh = SessionBase()  # session not saved yet: kept for the grace period
+    DatabaseCartStore(_request(fresh)).add("NEW")
+
+    CartLine.objects.exclude(sku="NEW").update(updated_at=timezone.now() - timedelta(days=2))
+    call_command("purge_cart_lines")
+    assert set(CartLine.objects.values_list("sku", flat=True)) == {"LIVE", "NEW"}
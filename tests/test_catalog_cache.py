@@ -0,0 +1,34 @@
+# tests/test_catalog_cache.py
+from __future__ import annotations
+
+from django.core.cache import cache
+
+from catalog.cache import VERSION_KEY, bump_catalog_version, catalog_version
+from catalog.checks import check_shared_cache
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379"}}
+
+
+def test_process_local_cache_warns_outside_debug(settings):
+    settings.CACHES, settings.DEBUG = LOCMEM, False
+    [warning] = check_shared_cache(None)
+    assert warning.id == "catalog.W001" and not warning.is_serious()
+
+    settings.DEBUG = True
+    assert check_shared_cache(None) == []
+
+    settings.CACHES, settings.DEBUG = REDIS, False
+    assert check_shared_cache(None) == []
+
+
+def test_a_lost_version_never_comes_back():
+    before = catalog_version()
+    bump_catalog_version()
+    assert catalog_version() == before + 1
+
+    cache.delete(VERSION_KEY)  # evicted
+    bump_catalog_version()
+    assert catalog_version() > before + 1
+    cache.delete(VERSION_KEY)
+    assert catalog_version() > before + 1
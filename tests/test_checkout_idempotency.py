@@ -0,0 +1,109 @@
+# tests/test_checkout_idempotency.py
+from __future__ import annotations
+
+import threading
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.base import SessionBase
+from django.db import connection
+from django.urls import reverse
+
+from catalog.models import Product
+from orders.models import Order
+from orders.services import cart_fingerprint, checkout_once
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def cart(make_products):
+    return [{"sku": p.sku, "qty": 1} for p in make_products(2, stock=1000)]
+
+
+def test_fingerprint_ignores_line_order_but_not_owner_or_quantities():
+    cart = [{"sku": "A", "qty": 1}, {"sku": "B", "qty": 2}]
+    fp = cart_fingerprint("user:1", cart)
+    assert fp == cart_fingerprint("user:1", cart[::-1])
+    assert fp != cart_fingerprint("user:2", cart)
+    assert fp != cart_fingerprint("user:1", [{"sku": "A", "qty": 2}, {"sku": "B", "qty": 2}])
+
+
+def test_repeat_checkout_returns_pending_order(cart):
+    session = SessionBase()
+    first, created = checkout_once(AnonymousUser(), cart, "session:x", session=session)
+    assert created
+    # same session, then a new session for the same owner (claim row)
+    assert checkout_once(AnonymousUser(), cart, "session:x", session=session) == (first, False)
+    assert checkout_once(AnonymousUser(), cart, "session:x", session=SessionBase()) == (first, False)
+
+    # a changed cart, or a cart whose order moved on, is a new order
+    other, created = checkout_once(AnonymousUser(), cart[:1], "session:x", session=session)
+    assert created and other.pk != first.pk
+    Order.objects.filter(pk=first.pk).update(status="cancelled")
+    again, created = checkout_once(AnonymousUser(), cart, "session:x", session=session)
+    assert created and again.pk != first.pk
+
+
+def test_new_order_cancels_the_sessions_previous_one(cart):
+    session = SessionBase()
+    first, _ = checkout_once(AnonymousUser(), cart, "session:y", session=session)
+    second, created = checkout_once(AnonymousUser(), cart[:1], "session:y", session=session)
+
+    assert created
+    assert Order.objects.get(pk=first.pk).status == "cancelled"
+    assert Order.objects.get(pk=second.pk).status == "pending"
+    stock = dict(Product.objects.filter(sku__in=[line["sku"] for line in cart]).values_list("sku", "stock"))
+    assert stock == {cart[0]["sku"]: 999, cart[1]["sku"]: 1000}  # only the second order holds units
+
+
+def test_checkout_is_post_only(client, cart):
+    session = client.session
+    session["cart"] = {line["sku"]: line["qty"] for line in cart}
+    session.save()
+    before = Order.objects.count()
+    assert client.get(reverse("orders:checkout_create")).status_code == 405
+    assert Order.objects.count() == before
+
+
+def test_double_post_creates_one_order(client, cart):
+    session = client.session
+    session["cart"] = {line["sku"]: line["qty"] for line in cart}
+    session.save()
+    before = Order.objects.count()
+
+    first = client.post(reverse("orders:checkout_create"))
+    second = client.post(reverse("orders:checkout_create"))
+    assert first.status_code in (302, 303)
+    assert second.headers["Location"] == first.headers["Location"]
+    assert Order.objects.count() == before + 1
+
+
+def test_concurrent_identical_checkouts_create_one_order(cart):
+    if connection.vendor != "postgresql":
+        pytest.skip("Row locking needs PostgreSQL.")
+    before = Order.objects.count()
+    threads_n = 12
+    results = []
+    barrier = threading.Barrier(threads_n)
+
+    def worker():
+        try:
+            barrier.wait()
+            order, _created = checkout_once(AnonymousUser(), cart, "session:stress", session=SessionBase())
+            results.append(order.pk)
+        except Exception as exc:
+            results.append(repr(exc))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(threads_n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+    assert not any(t.is_alive() for t in threads)
+
+    assert len(results) == threads_n and len(set(results)) == 1
+    assert isinstance(results[0], int)
+    assert Order.objects.count() == before + 1
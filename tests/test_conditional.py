@@ -0,0 +1,70 @@
+# tests/test_conditional.py
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def product(make_products):
+    return make_products(3)[1]
+
+
+def _urls(product):
+    return [
+        reverse("catalog:product_detail", args=[product.slug]),
+        reverse("catalog:product_list"),
+        reverse("catalog:product_list") + "?cat=test-category&sort=price",
+    ]
+
+
+def test_matching_validators_get_304(client, product):
+    for url in _urls(product):
+        first = client.get(url)
+        assert first.status_code == 200, url
+        assert first["ETag"].startswith('W/"')
+
+        again = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert again.status_code == 304, url
+        assert again["ETag"] == first["ETag"]
+
+    detail = client.get(_urls(product)[0])
+    assert client.get(_urls(product)[0], HTTP_IF_MODIFIED_SINCE=detail["Last-Modified"]).status_code == 304
+
+
+def test_listings_have_no_last_modified(client, product):
+    url = _urls(product)[1]
+    first = client.get(url)
+    assert "Last-Modified" not in first
+
+    # a deletion leaves every remaining row's updated_at alone; the ETag still moves
+    product.delete()
+    r = client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert r.status_code == 200 and r["ETag"] != first["ETag"]
+
+
+def test_saving_a_product_changes_the_validators(client, product):
+    etags = {url: client.get(url)["ETag"] for url in _urls(product)}
+
+    product.price = Decimal("42.00")
+    product.save()
+    for url, etag in etags.items():
+        r = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 200, url
+        assert r["ETag"] != etag
+
+
+def test_visitor_pages_are_private_and_have_no_last_modified(client, product):
+    user = get_user_model().objects.create_user(username="shopper", password="secret1234")
+    client.force_login(user)
+    url = _urls(product)[0]
+    client.get(url)  # picks up the CSRF cookie, which is part of the visitor state
+    r = client.get(url)
+    assert "Last-Modified" not in r
+    assert "private" in r["Cache-Control"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 304
@@ -0,0 +1,75 @@
+# tests/test_counts.py
+from __future__ import annotations
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from catalog import views
+from catalog.counts import listing_count
+from catalog.listing import PAGE_SIZE, listing_queryset
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _params(**overrides):
+    return {"q": "", "cat": "", "sort": "", "direction": "", "brand": [], "price": [], "stock": "", **overrides}
+
+
+def _count(**overrides):
+    params = _params(**overrides)
+    return listing_count(listing_queryset(params), params)
+
+
+def test_counts_are_cached_until_the_catalog_changes(make_products, django_assert_num_queries):
+    products = make_products(3)
+    make_products(2, is_active=False)
+    assert _count() == (3, False)
+    with django_assert_num_queries(0):
+        assert _count() == (3, False)
+
+    products[0].is_active = False
+    products[0].save()
+    assert _count() == (2, False)
+
+
+def test_unknown_category_counts_zero(make_products):
+    make_products(2)
+    assert _count(cat="no-such-category") == (0, False)
+    assert _count(cat="test-category") == (2, False)
+
+
+def test_filtered_listings_are_never_estimated(make_products, settings):
+    settings.CATALOG_COUNT_ESTIMATE_THRESHOLD = 1
+    make_products(names=["Blue Shirt", "Red Shirt", "Blue Coat"])
+    assert _count(q="blue") == (2, False)
+
+
+def test_estimates_leave_out_inactive_products(make_products, settings):
+    if connection.vendor != "postgresql":
+        pytest.skip("Planner estimates need PostgreSQL.")
+    settings.CATALOG_COUNT_ESTIMATE_THRESHOLD = 1
+    make_products(40)
+    make_products(40, is_active=False)
+    with connection.cursor() as cur:
+        cur.execute("ANALYZE product")
+
+    for cat in ("", "test-category"):
+        count, estimated = _count(cat=cat)
+        assert estimated
+        assert 30 <= count <= 50, count  # reltuples would say 80
+
+
+@pytest.mark.parametrize("estimate", [5, 100])
+def test_estimated_listings_reach_every_row_in_offset_mode(client, make_products, settings, monkeypatch, estimate):
+    settings.CATALOG_PAGINATION = "offset"
+    products = make_products(PAGE_SIZE + 3)
+    # a planner estimate well below / above the real count
+    monkeypatch.setattr(views, "listing_count", lambda qs, params: (estimate, True))
+
+    seen, url = [], reverse("catalog:product_list")
+    while url:
+        page = client.get(url).context["page_obj"]
+        seen += [p.pk for p in page]
+        url = f"{reverse('catalog:product_list')}?cursor={page.next_cursor}" if page.has_next() else None
+    assert sorted(seen) == sorted(p.pk for p in products)
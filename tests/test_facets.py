@@ -0,0 +1,55 @@
+# tests/test_facets.py
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+
+from catalog.facets import facet_counts, rebuild_facet_counts
+from catalog.models import Brand, Category, FacetCount
+from orders.services import create_order_from_cart, set_order_status
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _snapshot():
+    return sorted(
+        FacetCount.objects.filter(count__gt=0).values_list("category_id", "facet", "value", "count")
+    )
+
+
+def test_incremental_facets_match_rebuild(make_products):
+    rebuild_facet_counts()
+    shirts = Category.objects.create(name="Shirts", slug="shirts")
+    coats = Category.objects.create(name="Coats", slug="coats")
+    acme = Brand.objects.create(name="Acme", slug="acme")
+    other = Brand.objects.create(name="Other", slug="other")
+    a, b, c = make_products(3, category=shirts, brand=acme, price=Decimal("20"))
+    d, e = make_products(2, category=coats, brand=other, price=Decimal("150"), stock=1)
+    make_products(1, category=coats, brand=acme, is_active=False)
+
+    # update: price band, brand, category, active flag, stock
+    a.price = Decimal("75")
+    a.save()
+    b.brand, b.category = other, coats
+    b.save()
+    c.stock = 0
+    c.save()
+    e.is_active = False
+    e.save()
+    # stock crossing zero through a reservation, and back through a cancellation
+    order = create_order_from_cart(AnonymousUser(), [{"sku": d.sku, "qty": 1}])
+    assert ("stock", "out") in {(f, v) for _c, f, v, _n in _snapshot() if _c == coats.pk}
+    set_order_status(order, "cancelled")
+    create_order_from_cart(AnonymousUser(), [{"sku": d.sku, "qty": 1}])
+    # delete
+    make_products(1, category=shirts, brand=acme)[0].delete()
+
+    incremental = _snapshot()
+    rebuild_facet_counts()
+    assert _snapshot() == incremental
+
+    shirt_facets = facet_counts(shirts.pk)
+    assert [(o["value"], o["count"]) for o in shirt_facets["brand"]] == [("acme", 2)]
+    assert [(o["value"], o["count"]) for o in shirt_facets["stock"]] == [("in", 1), ("out", 1)]
@@ -0,0 +1,69 @@
+# tests/test_images.py
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from catalog.images import DERIVED_PREFIX, SOURCE_PREFIX, target_widths
+from catalog.templatetags.catalog_tags import product_image
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def static_dir(tmp_path, settings):
+    settings.BASE_DIR = tmp_path
+    source = tmp_path / "static" / SOURCE_PREFIX
+    source.mkdir(parents=True)
+    Image.new("RGB", (800, 600), "navy").save(source / "SKU-1.jpg", "JPEG")
+    Image.new("RGB", (100, 150), "red").save(source / "sku-2.png", "PNG")
+    return tmp_path / "static"
+
+
+def _build(**options):
+    out = io.StringIO()
+    call_command("build_image_derivatives", workers=1, stdout=out, stderr=io.StringIO(), **options)
+    return out.getvalue()
+
+
+def test_target_widths_never_upscale():
+    assert target_widths(800) == [160, 320, 640, 800]
+    assert target_widths(100) == [100]
+    assert target_widths(3000) == [160, 320, 640, 1024]
+
+
+def test_derivatives_manifest_and_srcset(static_dir):
+    assert _build().startswith("2 built, 0 unchanged, 0 failed")
+
+    manifest = json.loads((static_dir / DERIVED_PREFIX / "manifest.json").read_text())
+    entry = manifest["sku-1"]
+    assert (entry["width"], entry["height"]) == (800, 600)
+    assert sorted(entry["webp"], key=int) == ["160", "320", "640", "800"]
+    for fmt in ("jpeg", "webp"):
+        for width, path in entry[fmt].items():
+            with Image.open(static_dir / path) as im:
+                assert im.format == fmt.upper() and im.width == int(width)
+    assert list(manifest["sku-2"]["jpeg"]) == ["100"]
+
+    html = product_image("SKU-1", "Navy tee", sizes="50vw")
+    assert '<source type="image/webp"' in html
+    assert "sku-1-160.webp 160w" in html and "sku-1-800.jpg 800w" in html
+    assert 'src="/static/catalog/img/derived/sku-1-320.jpg"' in html
+    assert 'width="800" height="600"' in html and 'sizes="50vw"' in html
+
+
+def test_unchanged_originals_are_skipped_and_orphans_removed(static_dir):
+    _build()
+    orphan = static_dir / DERIVED_PREFIX / "gone-160.jpg"
+    orphan.write_bytes(b"")
+    assert _build().startswith("0 built, 2 unchanged")
+    assert not orphan.exists()
+    assert _build(force=True).startswith("2 built")
+
+
+def test_missing_derivatives_fall_back_to_the_original(static_dir):
+    html = product_image("SKU-9", "No image yet")
+    assert html.startswith("<img ") and f"/static/{SOURCE_PREFIX}/sku-9.jpg" in html
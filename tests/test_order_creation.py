@@ -0,0 +1,67 @@
+# tests/test_order_creation.py
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Order, OrderItem
+from orders.services import UnknownSkuError, create_order_from_cart, get_guest_app_user
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+# locking product lookup, stock UPDATE, order INSERT, items bulk INSERT,
+# daily + status summary upserts (the guest app_user id is cached);
+# PostgreSQL adds the summary's advisory lock (orders/sales.py)
+EXPECTED_QUERIES = 6
+
+
+@pytest.fixture
+def make_cart(make_products):
+    def make(n):
+        products = make_products(n, stock=1000)
+        return [{"sku": p.sku, "qty": i % 3 + 1} for i, p in enumerate(products)], products
+
+    return make
+
+
+def _statements(cart):
+    """create_order_from_cart's statements, less BEGIN/COMMIT/SAVEPOINT (logged by some backends)."""
+    with CaptureQueriesContext(connection) as ctx:
+        create_order_from_cart(AnonymousUser(), cart)
+    control = ("BEGIN", "COMMIT", "SAVEPOINT", "RELEASE SAVEPOINT")
+    return [q["sql"] for q in ctx.captured_queries if not q["sql"].startswith(control)]
+
+
+def test_query_count_does_not_grow_with_cart_size(make_cart):
+    small, _ = make_cart(1)
+    large, _ = make_cart(20)
+    get_guest_app_user()
+    expected = EXPECTED_QUERIES + (connection.vendor == "postgresql")
+    assert len(_statements(small)) == expected
+    assert len(_statements(large)) == expected
+
+
+def test_order_total_and_items(make_cart):
+    cart, products = make_cart(3)
+    order = create_order_from_cart(AnonymousUser(), cart)
+
+    expected = sum(Order.q2(Decimal(p.price)) * line["qty"] for p, line in zip(products, cart))
+    assert Order.objects.get(pk=order.pk).total_amount == Order.q2(expected)
+    items = OrderItem.objects.filter(order=order).order_by("product_id")
+    assert [(i.product_id, i.quantity) for i in items] == [
+        (p.id, line["qty"]) for p, line in zip(products, cart)
+    ]
+
+
+def test_unknown_skus_are_reported_together(make_cart):
+    cart, _ = make_cart(1)
+    before = Order.objects.count()
+    with pytest.raises(UnknownSkuError) as exc:
+        create_order_from_cart(AnonymousUser(), cart + [{"sku": "NOPE-2", "qty": 1}, {"sku": "NOPE-1", "qty": 1}])
+    assert exc.value.skus == ["NOPE-1", "NOPE-2"]
+    assert isinstance(exc.value, ValueError)
+    assert Order.objects.count() == before
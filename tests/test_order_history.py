@@ -0,0 +1,89 @@
+# tests/test_order_history.py
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from orders.models import AppUser, Order, OrderItem, Payment
+from orders.services import ensure_app_user_for_django_user
+from orders.views import ORDER_HISTORY_PAGE_SIZE
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _customer(client, username, n_orders, products):
+    user = get_user_model().objects.create_user(
+        username=username, email=f"{username}@example.com", password="secret1234"
+    )
+    app_user = ensure_app_user_for_django_user(user)
+    now = timezone.now()
+    for i in range(n_orders):
+        # pairs of orders share a timestamp: the id tiebreaker must keep pages stable
+        order = Order.objects.create(user=app_user, total_amount=10, created_at=now - timedelta(minutes=i // 2))
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, product=p, quantity=2, price_each=5) for p in products[: 1 + i % len(products)]
+        )
+        if i % 3 == 0:
+            Payment.objects.create(order=order, provider="mock", method="card", status="failed", amount=10)
+            Payment.objects.create(order=order, provider="mock", method="card", status="successful", amount=10)
+    assert client.login(username=username, password="secret1234")
+    client.get(reverse("orders:my_orders"))  # warm the session's app_user mapping
+
+
+def _pages(client):
+    url, pages = reverse("orders:my_orders"), []
+    while url:
+        with CaptureQueriesContext(connection) as ctx:
+            r = client.get(url)
+        assert r.status_code == 200
+        page = r.context["page_obj"]
+        pages.append((len(ctx), list(page)))
+        url = f"{reverse('orders:my_orders')}?cursor={page.next_cursor}" if page.has_next() else None
+    return pages
+
+
+def test_history_pages_cost_the_same_whatever_the_volume(client, make_products):
+    products = make_products(4)
+
+    _customer(client, "hist_small", 2, products)
+    small = _pages(client)
+    client.logout()
+    _customer(client, "hist_large", 2 * ORDER_HISTORY_PAGE_SIZE + 5, products)
+    large = _pages(client)
+
+    assert len(large) == 3
+    assert {n for n, _ in small + large} == {small[0][0]}
+
+    orders = [o for _, page in large for o in page]
+    assert len({o.pk for o in orders}) == 2 * ORDER_HISTORY_PAGE_SIZE + 5
+    assert [(o.created_at, o.pk) for o in orders] == sorted(
+        ((o.created_at, o.pk) for o in orders), reverse=True
+    )
+    for o in orders:
+        assert o.item_count == 2 * OrderItem.objects.filter(order_id=o.pk).count()
+        assert o.payment_status == (
+            "successful" if Payment.objects.filter(order_id=o.pk).exists() else None
+        )
+
+
+def test_history_requires_login(client):
+    r = client.get(reverse("orders:my_orders"))
+    assert r.status_code == 302
+
+
+def test_history_never_creates_an_app_user(client):
+    get_user_model().objects.create_user(username="hist_new", email="hist_new@example.com", password="secret1234")
+    assert client.login(username="hist_new", password="secret1234")
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = client.get(reverse("orders:my_orders"))
+    assert r.status_code == 200 and r.context["page_obj"] is None
+    assert b"You have not placed any orders yet." in r.content
+    assert not [q for q in ctx.captured_queries if q["sql"].startswith("INSERT") and "app_user" in q["sql"]]
+    assert not AppUser.objects.filter(email="hist_new@example.com").exists()
@@ -0,0 +1,100 @@
+# tests/test_pagination.py
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from catalog.models import Product
+from catalog.pagination import NEXT, PREV, KeysetPaginator, decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def products(make_products):
+    # 7 products over 3 prices: every page edge falls inside a run of equal keys
+    products = make_products(7)
+    for i, p in enumerate(products):
+        p.price = Decimal([5, 5, 5, 9, 9, 9, 12][i])
+        p.save(update_fields=["price"])
+    return products
+
+
+def _walk(paginator):
+    """Follow next cursors from the first page; return the pages' ids."""
+    pages, page = [], paginator.get_page(None)
+    for _ in range(Product.objects.count() + 1):  # a cursor that never advances fails, not hangs
+        pages.append([p.pk for p in page])
+        if not page.has_next():
+            return pages, page
+        page = paginator.get_page(page.next_cursor)
+    pytest.fail(f"Paging did not terminate: {pages}")
+
+
+def test_cursor_round_trip():
+    token = encode_cursor(["9.00", 42], NEXT, 3)
+    assert "=" not in token
+    assert decode_cursor(token) == {"v": ["9.00", 42], "d": NEXT, "n": 3}
+
+
+@pytest.mark.parametrize("token", [None, "", "%%%", encode_cursor([1], "x", 1), "bm90IGpzb24"])
+def test_garbled_cursors_fall_back_to_the_first_page(products, token):
+    assert decode_cursor(token) is None
+    page = KeysetPaginator(Product.objects.all(), ["price", "id"], 3).get_page(token)
+    assert (page.number, page.has_previous()) == (1, False)
+
+
+@pytest.mark.parametrize("ordering", [["price", "id"], ["-price", "-id"], ["-price", "id"]])
+def test_forward_pages_cover_every_row_once_in_order(products, ordering):
+    qs = Product.objects.all()
+    pages, last = _walk(KeysetPaginator(qs, ordering, 3))
+    assert [pk for page in pages for pk in page] == list(qs.order_by(*ordering).values_list("pk", flat=True))
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert last.number == 3 and not last.has_next()
+
+
+@pytest.mark.parametrize("ordering", [["price", "id"], ["-price", "id"]])
+def test_backward_pages_mirror_forward_pages(products, ordering):
+    paginator = KeysetPaginator(Product.objects.all(), ordering, 3)
+    pages, last = _walk(paginator)
+
+    page, seen = last, [[p.pk for p in last]]
+    while page.has_previous():
+        page = paginator.get_page(page.previous_cursor)
+        seen.append([p.pk for p in page])
+    assert seen[::-1] == pages
+    assert page.number == 1 and page.previous_cursor == ""
+
+
+def test_short_backward_page_resets_to_the_first(products):
+    paginator = KeysetPaginator(Product.objects.all(), ["price", "id"], 3)
+    second = paginator.get_page(paginator.get_page(None).next_cursor)
+    # a cursor that claims page 5 but has fewer than a page before it
+    edge = second.object_list[0]
+    token = encode_cursor([str(edge.price), edge.pk], PREV, 5)
+    page = paginator.get_page(token)
+    assert page.number == 1 and not page.has_previous() and len(page) == 3
+
+
+def test_datetime_keys_page_without_duplicates(make_products):
+    now = timezone.now()
+    products = make_products(5)
+    for i, p in enumerate(products):
+        # two pairs share a timestamp; microseconds must survive the cursor
+        p.created_at = now - timedelta(seconds=i // 2, microseconds=7)
+        p.save(update_fields=["created_at"])
+    pages, _ = _walk(KeysetPaginator(Product.objects.all(), ["-created_at", "-id"], 2))
+    ids = [pk for page in pages for pk in page]
+    assert ids == list(Product.objects.order_by("-created_at", "-id").values_list("pk", flat=True))
+    assert len(set(ids)) == 5
+
+
+def test_num_pages_needs_a_count():
+    assert KeysetPaginator(Product.objects.all(), ["id"], 10).num_pages is None
+    assert KeysetPaginator(Product.objects.all(), ["id"], 10, count=21).num_pages == 3
+    assert KeysetPaginator(Product.objects.all(), ["id"], 10, count=0).num_pages == 1
+    with pytest.raises(ValueError):
+        KeysetPaginator(Product.objects.all(), ["price"], 10)
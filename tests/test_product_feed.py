@@ -0,0 +1,46 @@
+# tests/test_product_feed.py
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _feed(client, **params):
+    response = client.get(reverse("catalog:product_feed"), params)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    body = b"".join(response.streaming_content).decode()
+    assert body == "" or body.endswith("\n")
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def test_one_json_object_per_line_with_default_fields(client, make_products):
+    products = make_products(3)
+    make_products(1, is_active=False)
+    rows = _feed(client)
+    assert [r["sku"] for r in rows] == [p.sku for p in products]
+    assert list(rows[0]) == ["id", "sku", "name", "slug", "price", "stock", "brand", "category"]
+    assert rows[0]["brand"] == "Test Brand" and rows[0]["category"] == "Test category"
+    assert Decimal(rows[0]["price"]) == products[0].price
+
+
+def test_fields_projection_filters_and_limit(client, make_products):
+    make_products(names=["Blue Shirt", "Red Shirt", "Blue Coat"])
+    rows = _feed(client, fields="name,price,name", q="blue", sort="price", direction="desc")
+    assert [list(r) for r in rows] == [["name", "price"]] * 2
+    assert [r["name"] for r in rows] == ["Blue Coat", "Blue Shirt"]
+
+    assert len(_feed(client, limit=2)) == 2
+    assert _feed(client, cat="no-such-category") == []
+
+
+@pytest.mark.parametrize("params", [{"fields": "sku,description"}, {"limit": "ten"}])
+def test_bad_parameters_are_rejected(client, params):
+    response = client.get(reverse("catalog:product_feed"), params)
+    assert response.status_code == 400
+    assert "error" in response.json()
@@ -0,0 +1,133 @@
+# tests/test_query_plans.py
+"""
+EXPLAIN every product-list query shape against a generated catalog and fail
+if Postgres falls back to a sequential scan of product or a Sort node.
+"""
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from catalog.listing import PAGE_SIZE, listing_ordering, listing_queryset
+from catalog.models import Brand, Category, Product
+from catalog.pagination import KeysetPaginator
+from catalog.registry import registry
+
+N_PRODUCTS = 40_000
+N_CATEGORIES = 8
+N_BRANDS = 50
+
+SHAPES = [
+    {"q": "", "cat": "", "sort": "", "direction": ""},
+    {"q": "", "cat": "", "sort": "price", "direction": ""},
+    {"q": "", "cat": "", "sort": "price", "direction": "desc"},
+    {"q": "", "cat": "", "sort": "name", "direction": ""},
+    {"q": "", "cat": "", "sort": "name", "direction": "desc"},
+    {"q": "", "cat": "plan-cat-3", "sort": "", "direction": ""},
+    {"q": "", "cat": "plan-cat-3", "sort": "price", "direction": ""},
+    {"q": "", "cat": "plan-cat-3", "sort": "price", "direction": "desc"},
+    {"q": "", "cat": "plan-cat-3", "sort": "name", "direction": ""},
+    {"q": "", "cat": "plan-cat-3", "sort": "name", "direction": "desc"},
+]
+
+
+@pytest.fixture(scope="module")
+def large_catalog(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        if connection.vendor != "postgresql":
+            pytest.skip("Query-plan checks need PostgreSQL.")
+
+        cats = Category.objects.bulk_create(
+            Category(name=f"plan-cat-{i}", slug=f"plan-cat-{i}") for i in range(N_CATEGORIES)
+        )
+        brands = Brand.objects.bulk_create(
+            Brand(name=f"Plan Brand {i}", slug=f"plan-brand-{i}") for i in range(N_BRANDS)
+        )
+        now = timezone.now()
+        Product.objects.bulk_create(
+            (
+                Product(
+                    name=f"Plan product {i:06d}",
+                    slug=f"plan-product-{i}",
+                    sku=f"PLAN-{i:06d}",
+                    search_document=f"plan product {i:06d} plan-{i:06d}",
+                    price=Decimal(5 + (i * 37) % 500),
+                    stock=i % 7,
+                    is_active=i % 10 != 0,
+                    created_at=now,
+                    category=cats[i % N_CATEGORIES],
+                    brand=brands[i % N_BRANDS],
+                )
+                for i in range(N_PRODUCTS)
+            ),
+            batch_size=2000,
+        )
+        with connection.cursor() as cur:
+            cur.execute("ANALYZE product; ANALYZE category; ANALYZE brand;")
+        registry.invalidate()  # bulk_create sends no signals
+
+        yield
+
+        Product.objects.filter(sku__startswith="PLAN-").delete()
+        Brand.objects.filter(slug__startswith="plan-brand-").delete()
+        Category.objects.filter(slug__startswith="plan-cat-").delete()
+
+
+def _plan(qs) -> dict:
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cur:
+        cur.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _assert_indexed(qs):
+    plan = _plan(qs)
+    for node in _nodes(plan):
+        kind = node["Node Type"]
+        if kind == "Seq Scan" and node.get("Relation Name") == "product":
+            pytest.fail(f"Sequential scan on product:\n{json.dumps(plan, indent=2)}")
+        if kind in ("Sort", "Incremental Sort"):
+            pytest.fail(f"{kind} node in plan:\n{json.dumps(plan, indent=2)}")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", SHAPES, ids=lambda p: "-".join(v for v in p.values() if v) or "all")
+def test_first_page_uses_index_order(large_catalog, params):
+    qs = listing_queryset(params).order_by(*listing_ordering(params))
+    _assert_indexed(qs[: PAGE_SIZE + 1])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", SHAPES, ids=lambda p: "-".join(v for v in p.values() if v) or "all")
+def test_keyset_seek_page_uses_index_order(large_catalog, params):
+    qs = listing_queryset(params)
+    ordering = listing_ordering(params)
+    paginator = KeysetPaginator(qs, ordering, PAGE_SIZE)
+    middle = qs.order_by(*ordering)[N_PRODUCTS // (4 * N_CATEGORIES)]
+
+    fields = [o.lstrip("-") for o in ordering]
+    values = [getattr(middle, f) for f in fields]
+    seek = qs.filter(paginator._seek(values, forward=True)).order_by(*ordering)
+    _assert_indexed(seek[: PAGE_SIZE + 1])
+
+
+@pytest.mark.django_db
+def test_search_does_not_scan_product(large_catalog):
+    params = {"q": "012345", "cat": "", "sort": "", "direction": ""}
+    qs = listing_queryset(params).order_by(*listing_ordering(params))
+    plan = _plan(qs[: PAGE_SIZE + 1])
+    scans = [n for n in _nodes(plan) if n["Node Type"] == "Seq Scan" and n.get("Relation Name") == "product"]
+    assert not scans, json.dumps(plan, indent=2)
@@ -0,0 +1,46 @@
+# tests/test_registry.py
+from __future__ import annotations
+
+import pytest
+
+from catalog.listing import listing_queryset
+from catalog.models import Brand, Category, Product
+from catalog.registry import registry
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _params(**overrides):
+    return {"q": "", "cat": "", "sort": "", "direction": "", "brand": [], "price": [], "stock": "", **overrides}
+
+
+def test_hits_are_served_from_memory(make_products, django_assert_num_queries):
+    make_products(1)
+    registry.categories()
+    with django_assert_num_queries(0):
+        assert registry.category_id("test-category")
+        assert registry.brand_ids(["test-brand"])
+
+
+def test_rows_written_without_signals_are_found_on_a_miss(make_products, django_assert_num_queries):
+    make_products(1)
+    registry.categories()  # loaded before the bulk writes below
+    Category.objects.bulk_create([Category(name="Bulk", slug="bulk")])
+    Brand.objects.bulk_create([Brand(name="Bulk Brand", slug="bulk-brand")])
+    cat, brand = Category.objects.get(slug="bulk"), Brand.objects.get(slug="bulk-brand")
+    Product.objects.update(category=cat, brand=brand)
+
+    with django_assert_num_queries(3):  # existence check + reload (categories, brands)
+        assert registry.category_id("bulk") == cat.pk
+    with django_assert_num_queries(0):
+        assert registry.brand(brand.pk)["name"] == "Bulk Brand"
+    assert listing_queryset(_params(cat="bulk", brand=["bulk-brand"])).count() == 1
+
+
+def test_unknown_slugs_cost_one_query_and_do_not_reload(django_assert_num_queries):
+    registry.categories()
+    with django_assert_num_queries(1):
+        assert registry.category_id("no-such-category") is None
+    with django_assert_num_queries(1):
+        assert registry.brand_ids(["no-such-brand"]) == []
+    assert not listing_queryset(_params(cat="no-such-category")).exists()
@@ -0,0 +1,39 @@
+# tests/test_result_cache.py
+from catalog.results import ResultCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("catalog.results.time.monotonic", lambda: now[0])
+    cache = ResultCache(max_entries=10, ttl=30)
+    cache.set("q", [1, 2, 3])
+    now[0] += 29
+    assert cache.get("q") == [1, 2, 3]
+    now[0] += 2
+    assert cache.get("q") is None
+    assert len(cache) == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = ResultCache(max_entries=10, ttl=60)
+    cache.get("x")
+    cache.set("x", [])
+    cache.get("x")
+    cache.get("x")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+    cache.clear()
+    assert cache.get("x") is None
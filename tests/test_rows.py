@@ -0,0 +1,46 @@
+# tests/test_rows.py
+from __future__ import annotations
+
+import pytest
+from django.template import Context, Template
+
+from catalog.models import Product
+from catalog.rows import ROW_FIELDS, ProductRow, as_rows, build_short_description
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+DESCRIPTIONS = [
+    None,
+    "",
+    "<p>Soft <b>organic</b> cotton tee with a relaxed fit, dropped shoulders and a rib collar.</p>",
+    "Short one.",
+]
+
+
+def test_rows_match_the_orm_instances(make_products):
+    products = make_products(4)
+    for p, description in zip(products, DESCRIPTIONS):
+        p.description = description
+        p.save()
+
+    qs = Product.objects.order_by("id")
+    rows = list(as_rows(qs))
+    assert all(type(r) is ProductRow for r in rows)
+    assert [tuple(getattr(r, f) for f in ROW_FIELDS) for r in rows] == [
+        tuple(getattr(p, f) for f in ROW_FIELDS) for p in qs
+    ]
+    assert [r.pk for r in rows] == [p.pk for p in qs]
+    assert not hasattr(rows[0], "description") and not hasattr(rows[0], "__dict__")
+
+
+def test_rows_stay_filterable_and_sliceable(make_products):
+    products = make_products(5)
+    qs = as_rows(Product.objects.filter(pk__in=[p.pk for p in products]))
+    page = list(qs.filter(price__gte=11).order_by("-price")[1:3])
+    assert [r.pk for r in page] == [products[3].pk, products[2].pk]
+
+
+@pytest.mark.parametrize("description", DESCRIPTIONS)
+def test_short_description_matches_the_old_template_filter(description):
+    old = Template("{{ d|striptags|truncatewords:10 }}").render(Context({"d": description}, autoescape=False))
+    assert build_short_description(description) == ("" if not description else old)
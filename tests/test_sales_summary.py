@@ -0,0 +1,89 @@
+# tests/test_sales_summary.py
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from orders import sales
+from orders.models import OrderStatusCount, ProductSales, SalesDaily
+from orders.services import create_order_from_cart, record_payment, set_order_status
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def _snapshot():
+    return (
+        sorted(SalesDaily.objects.values_list("day", "orders", "paid_orders", "revenue")),
+        sorted(OrderStatusCount.objects.filter(count__gt=0).values_list("status", "count")),
+        sorted(ProductSales.objects.values_list("product_id", "units", "revenue")),
+    )
+
+
+@pytest.fixture
+def place_orders(make_products):
+    def place(n):
+        products = make_products(4, stock=10_000)
+        return [
+            create_order_from_cart(
+                AnonymousUser(), [{"sku": p.sku, "qty": i % 3 + 1} for p in products[: 1 + i % 4]]
+            )
+            for i in range(n)
+        ]
+
+    return place
+
+
+def test_incremental_summary_matches_rebuild(place_orders):
+    sales.rebuild_sales_summary()
+    orders = place_orders(6)
+    for order in orders[:3]:
+        record_payment(order, provider="mock", method="card", status="successful", amount=order.total_amount)
+    record_payment(orders[3], provider="mock", method="card", status="failed", amount=orders[3].total_amount)
+    set_order_status(orders[0], "shipped")
+    set_order_status(orders[4], "cancelled")
+
+    incremental = _snapshot()
+    sales.rebuild_sales_summary()
+    assert _snapshot() == incremental
+
+    statuses = dict(incremental[1])
+    assert statuses["shipped"] >= 1 and statuses["cancelled"] >= 1
+
+
+def test_payments_count_on_the_day_of_their_history_row(place_orders):
+    (order,) = place_orders(1)
+    yesterday = timezone.now() - timedelta(days=1)
+    day = SalesDaily.objects.filter(day=timezone.localdate(yesterday))
+    before = day.values_list("paid_orders", flat=True).first() or 0
+    sales.status_changed(order, "pending", "paid", yesterday)
+    assert day.get().paid_orders == before + 1
+
+
+def test_dashboard_queries_do_not_depend_on_order_volume(client, place_orders):
+    get_user_model().objects.create_user(
+        username="sales_staff", email="staff@example.com", password="secret1234", is_staff=True
+    )
+    assert client.login(username="sales_staff", password="secret1234")
+
+    def dashboard_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            r = client.get(reverse("orders:sales_dashboard"))
+        assert r.status_code == 200
+        return len(ctx)
+
+    before = dashboard_queries()
+    for order in place_orders(12):
+        record_payment(order, provider="mock", method="card", status="successful", amount=order.total_amount)
+    assert dashboard_queries() == before
+
+
+def test_dashboard_is_staff_only(client):
+    r = client.get(reverse("orders:sales_dashboard"))
+    assert r.status_code == 302
@@ -0,0 +1,80 @@
+# tests/test_search.py
+from __future__ import annotations
+
+import pytest
+from django.db import connection
+
+from catalog.listing import listing_ordering, listing_queryset
+from catalog.models import Brand, Product
+from catalog.search import _search_fallback, search_products, tokenize
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def catalog(make_products):
+    brand = Brand.objects.create(name="Northwind", slug="northwind")
+    return {
+        p.name: p
+        for p in make_products(
+            names=["Denim on Denim Jacket", "Denim Jacket", "Linen Shirt", "Wool Coat"], brand=brand
+        )
+    }
+
+
+def _search(q):
+    params = {"q": q, "cat": "", "sort": "", "direction": "", "brand": [], "price": [], "stock": ""}
+    return [p.name for p in listing_queryset(params).order_by(*listing_ordering(params))]
+
+
+def test_tokenize_lowercases_and_caps_tokens():
+    assert tokenize("  Denim JACKET, slim-fit ") == ["denim", "jacket", "slim", "fit"]
+    assert len(tokenize(" ".join(["w"] * 20))) == 8
+    assert tokenize(" ,. ") == []
+
+
+def test_every_token_must_match_as_a_prefix(catalog):
+    assert set(_search("denim jack")) == {"Denim on Denim Jacket", "Denim Jacket"}
+    assert _search("lin shi") == ["Linen Shirt"]
+    assert _search("northwind") and set(_search("northwind")) == set(catalog)
+    assert _search("velvet") == []
+    assert not search_products(Product.objects.all(), " ,. ").exists()
+
+
+def test_results_are_ranked(catalog):
+    # the denser match ranks first, whichever backend ranks it
+    assert _search("denim") == ["Denim on Denim Jacket", "Denim Jacket"]
+
+
+def test_index_follows_renames_and_deletes(catalog):
+    shirt = catalog["Linen Shirt"]
+    shirt.name = "Linen Overshirt"
+    shirt.save()
+    assert _search("overshirt") == ["Linen Overshirt"]
+
+    shirt.delete()
+    assert _search("linen") == []
+
+
+def test_inactive_products_are_not_found(catalog):
+    Product.objects.filter(pk=catalog["Wool Coat"].pk).update(is_active=False)
+    assert _search("wool") == []
+
+
+def test_typos_match_on_postgres(catalog):
+    if connection.vendor != "postgresql":
+        pytest.skip("Trigram matching needs PostgreSQL.")
+    assert "Denim Jacket" in _search("jaket")
+
+
+def test_sqlite_uses_the_fts_table(catalog):
+    if connection.vendor != "sqlite":
+        pytest.skip("FTS5 path is SQLite only.")
+    sql = str(search_products(Product.objects.all(), "denim").query)
+    assert "product_search MATCH" in sql and "bm25" in sql
+
+
+def test_fallback_matches_every_token_anywhere(catalog):
+    qs = _search_fallback(Product.objects.order_by("id"), ["enim", "jacket"])
+    assert [p.name for p in qs] == ["Denim on Denim Jacket", "Denim Jacket"]
+    assert {p.search_rank for p in qs} == {0}
@@ -0,0 +1,109 @@
+# tests/test_status_races.py
+from __future__ import annotations
+
+import threading
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from orders.models import Order, OrderStatusHistory, Payment
+from orders.services import StatusConflict, create_order_from_cart, record_payment, set_order_status
+from orders.webhook_handler import StripeWH_Handler
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def place_order(make_products):
+    (product,) = make_products(1, stock=10_000)
+    return lambda: create_order_from_cart(AnonymousUser(), [{"sku": product.sku, "qty": 1}])
+
+
+def _success(order, ref):
+    return record_payment(
+        order, provider="mock", method="card", status="successful", amount=order.total_amount, provider_ref=ref
+    )
+
+
+def test_stale_success_returns_the_existing_payment(place_order):
+    order = place_order()
+    first, stale = Order.objects.get(pk=order.pk), Order.objects.get(pk=order.pk)
+    paid = _success(first, "a")
+    assert _success(stale, "b").pk == paid.pk
+    assert Payment.objects.filter(order=order).count() == 1
+    assert OrderStatusHistory.objects.filter(order=order, to_status="paid").count() == 1
+
+
+def test_stale_transition_is_rejected_and_writes_nothing(place_order):
+    order = place_order()
+    stale = Order.objects.get(pk=order.pk)
+    set_order_status(order, "paid")
+    with pytest.raises(StatusConflict):
+        set_order_status(stale, "cancelled")
+    assert Order.objects.get(pk=order.pk).status == "paid"
+    assert not OrderStatusHistory.objects.filter(order=order, to_status="cancelled").exists()
+
+
+def test_success_return_for_a_cancelled_order_keeps_the_payment(client, place_order):
+    order = place_order()
+    set_order_status(order, "cancelled")
+
+    r = client.get(reverse("orders:payment_return"), {"order": order.pk, "status": "success", "ref": "late"})
+    assert r.status_code == 302 and r.url == reverse("orders:order_detail", args=[order.pk])
+    assert Order.objects.get(pk=order.pk).status == "cancelled"
+    assert Payment.objects.filter(order=order, provider_ref="late", status="successful").exists()
+    [message] = get_messages(r.wsgi_request)
+    assert "contact support" in str(message)
+
+
+def test_webhook_and_return_redirect_race_pays_once(place_order):
+    if connection.vendor != "postgresql":
+        pytest.skip("Concurrent writers need PostgreSQL.")
+    rounds = 8
+    orders = [place_order() for _ in range(rounds)]
+    errors = []
+
+    def webhook(order, barrier):
+        try:
+            barrier.wait()
+            event = {"data": {"object": {"id": "cs_test", "payment_intent": f"pi_{order.pk}",
+                                         "metadata": {"order_id": str(order.pk)}}}}
+            StripeWH_Handler(None).handle_checkout_session_completed(event)
+        except Exception as exc:
+            errors.append(repr(exc))
+        finally:
+            connection.close()
+
+    def redirect(order, barrier):
+        try:
+            barrier.wait()
+            r = Client().get(reverse("orders:payment_return"), {
+                "order": order.pk, "provider": "mock", "status": "success", "ref": f"ret_{order.pk}",
+            })
+            assert r.status_code in (302, 303)
+        except Exception as exc:
+            errors.append(repr(exc))
+        finally:
+            connection.close()
+
+    for order in orders:
+        barrier = threading.Barrier(2)
+        threads = [
+            threading.Thread(target=webhook, args=(order, barrier)),
+            threading.Thread(target=redirect, args=(order, barrier)),
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=30)
+        assert not any(t.is_alive() for t in threads)
+
+    assert errors == []
+    for order in orders:
+        assert Order.objects.get(pk=order.pk).status == "paid"
+        assert Payment.objects.filter(order=order, status=Payment.Status.SUCCESS).count() == 1
+        assert OrderStatusHistory.objects.filter(order=order, to_status="paid").count() == 1
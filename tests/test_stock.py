@@ -0,0 +1,105 @@
+# tests/test_stock.py
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+
+from catalog.models import Product
+from orders.models import Order
+from orders.services import OutOfStockError, create_order_from_cart, set_order_status
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture
+def stocked(make_products):
+    return lambda n, stock: make_products(n, stock=stock)
+
+
+def _stock(product):
+    return Product.objects.values_list("stock", flat=True).get(pk=product.pk)
+
+
+def test_order_reserves_and_cancel_releases(stocked):
+    a, b = stocked(2, 5)
+    before = Product.objects.get(pk=a.pk).updated_at
+
+    order = create_order_from_cart(AnonymousUser(), [{"sku": a.sku, "qty": 2}, {"sku": b.sku, "qty": 5}])
+    assert (_stock(a), _stock(b)) == (3, 0)
+    assert Product.objects.get(pk=a.pk).updated_at > before
+
+    assert Order.objects.get(pk=order.pk).stock_reserved
+    set_order_status(order, "cancelled")
+    assert (_stock(a), _stock(b)) == (5, 5)
+
+
+def test_cancelling_an_unreserved_order_releases_nothing(stocked):
+    (a,) = stocked(1, 5)
+    order = create_order_from_cart(AnonymousUser(), [{"sku": a.sku, "qty": 2}])
+    Order.objects.filter(pk=order.pk).update(stock_reserved=False)  # placed before reservations
+    set_order_status(order, "cancelled")
+    assert _stock(a) == 3
+
+
+def test_stale_pending_orders_are_cancelled_and_released(stocked, settings):
+    settings.PENDING_ORDER_TTL = 3600
+    a, b = stocked(2, 5)
+    stale = create_order_from_cart(AnonymousUser(), [{"sku": a.sku, "qty": 2}])
+    paid = create_order_from_cart(AnonymousUser(), [{"sku": a.sku, "qty": 1}])
+    fresh = create_order_from_cart(AnonymousUser(), [{"sku": b.sku, "qty": 4}])
+    set_order_status(paid, "paid")
+    Order.objects.filter(pk__in=[stale.pk, paid.pk]).update(created_at=stale.created_at - timedelta(hours=2))
+
+    call_command("cancel_stale_orders")
+    status = dict(Order.objects.values_list("pk", "status"))
+    assert (status[stale.pk], status[paid.pk], status[fresh.pk]) == ("cancelled", "paid", "pending")
+    assert (_stock(a), _stock(b)) == (4, 1)
+
+
+def test_shortages_are_reported_together_and_nothing_is_reserved(stocked):
+    a, b, c = stocked(3, 1)
+    with pytest.raises(OutOfStockError) as exc:
+        create_order_from_cart(
+            AnonymousUser(),
+            [{"sku": a.sku, "qty": 2}, {"sku": b.sku, "qty": 1}, {"sku": c.sku, "qty": 3}],
+        )
+    assert exc.value.shortages == {a.sku: 1, c.sku: 1}
+    assert [_stock(p) for p in (a, b, c)] == [1, 1, 1]
+
+
+def test_concurrent_checkouts_never_oversell(stocked):
+    if connection.vendor != "postgresql":
+        pytest.skip("Row locking needs PostgreSQL.")
+    stock, threads_n = 7, 24
+    hot, x, y = stocked(3, stock)
+    results = []
+
+    def worker(n):
+        # Every cart holds the hot SKU plus two others in varying order;
+        # the id-ordered locking must keep them from deadlocking.
+        other = [x, y] if n % 2 else [y, x]
+        cart = [{"sku": p.sku, "qty": 1} for p in (other[0], hot, other[1])]
+        try:
+            create_order_from_cart(AnonymousUser(), cart)
+            results.append("ok")
+        except OutOfStockError:
+            results.append("short")
+        except Exception as exc:  # deadlocks, lock timeouts, ...
+            results.append(repr(exc))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=60)
+    assert not any(t.is_alive() for t in threads)
+
+    assert sorted(results) == ["ok"] * stock + ["short"] * (threads_n - stock)
+    assert [_stock(p) for p in (hot, x, y)] == [0, 0, 0]
@@ -0,0 +1,114 @@
+# tests/test_suggest.py
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from catalog.models import Brand
+from catalog.suggest import PrefixIndex, SuggestIndex, product_keys, suggestions
+
+
+@pytest.fixture
+def live_index(make_products):
+    """The process-wide index, loaded over a fresh catalog."""
+    suggestions.invalidate()
+    make_products(names=["Slim Denim Jacket", "Linen Shirt"])
+    suggestions.lookup("x")  # load it
+    yield suggestions
+    suggestions.invalidate()
+
+
+def _names(prefix):
+    return [s["name"] for s in suggestions.lookup(prefix)]
+
+
+def _index():
+    index = PrefixIndex()
+    index.load(
+        [
+            {"id": 1, "name": "Slim Denim Jacket", "sku": "DJ-001", "slug": "slim-denim-jacket"},
+            {"id": 2, "name": "Denim Shirt", "sku": "DS-002", "slug": "denim-shirt"},
+            {"id": 3, "name": "Linen Shirt", "sku": "LS-003", "slug": "linen-shirt"},
+        ],
+        [{"id": 1, "name": "Denholm", "slug": "denholm"}],
+    )
+    return index
+
+
+def test_prefix_matches_names_words_skus_and_brands():
+    index = _index()
+    assert {s["name"] for s in index.lookup("den")} == {"Slim Denim Jacket", "Denim Shirt", "Denholm"}
+    assert [s["slug"] for s in index.lookup("ls-")] == ["linen-shirt"]
+    assert [s["slug"] for s in index.lookup("slim denim j")] == ["slim-denim-jacket"]
+    assert index.lookup("  ") == []
+
+
+def test_results_are_distinct_and_limited():
+    index = _index()
+    # "shirt" is both a word key and part of full-name keys: one hit per product
+    assert [s["slug"] for s in index.lookup("shirt")].count("denim-shirt") == 1
+    assert len(index.lookup("d", limit=2)) == 2
+
+
+def test_put_and_remove_are_incremental():
+    index = _index()
+    size = len(index)
+    index.put(("p", 2), {"type": "product", "name": "Denim Overshirt", "sku": "DS-002", "slug": "denim-shirt"},
+              product_keys("Denim Overshirt", "DS-002"))
+    assert [s["name"] for s in index.lookup("overs")] == ["Denim Overshirt"]
+    assert index.lookup("shirt") == [{"type": "product", "name": "Linen Shirt", "sku": "LS-003", "slug": "linen-shirt"}]
+    assert len(index) == size
+
+    index.remove(("p", 2))
+    assert index.lookup("overs") == []
+    assert index.lookup("ds-") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_endpoint_returns_suggestions_with_urls(client, live_index):
+    Brand.objects.create(name="Denholm", slug="denholm")
+    r = client.get(reverse("catalog:product_suggest"), {"q": "den"})
+    assert r.status_code == 200
+    assert r["Cache-Control"] in ("public, max-age=60", "max-age=60, public")
+    body = r.json()
+    assert body["q"] == "den"
+    by_type = {s["type"]: s for s in body["results"]}
+    assert by_type["product"]["name"] == "Slim Denim Jacket"
+    assert by_type["product"]["url"] == reverse("catalog:product_detail", args=[by_type["product"]["slug"]])
+    assert by_type["brand"]["url"] == reverse("catalog:product_list") + "?brand=denholm"
+
+    assert client.get(reverse("catalog:product_suggest"), {"q": "d", "limit": "x"}).status_code == 400
+    assert len(client.get(reverse("catalog:product_suggest"), {"q": "", "limit": 500}).json()["results"]) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_signals_keep_the_index_current(live_index, make_products):
+    (coat,) = make_products(names=["Wool Coat"])
+    assert _names("wool") == ["Wool Coat"]
+
+    coat.name = "Wool Overcoat"
+    coat.save()
+    assert _names("overc") == ["Wool Overcoat"]
+
+    coat.is_active = False
+    coat.save()
+    assert _names("wool") == []
+
+    coat.delete()
+    assert _names("wool") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_saves_leave_no_suggestions(live_index, make_products):
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            make_products(names=["Velvet Blazer"])
+            raise RuntimeError
+    assert _names("velvet") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_other_processes_reload_after_a_version_bump(live_index, make_products):
+    other = SuggestIndex(recheck=0)  # another worker's index: the signals never reach it
+    assert other.lookup("linen")
+    make_products(names=["Linen Trousers"])  # bumps the shared catalog version
+    assert {s["name"] for s in other.lookup("linen")} == {"Linen Shirt", "Linen Trousers"}